@@ -54,4 +54,17 @@ def build_paginated_url(request, page_number):
     query_params['page'] = page_number
 
     # Construct the new URL with updated query parameters
-    return f"{path}?{query_params.urlencode()}"
\ No newline at end of file
+    return f"{path}?{query_params.urlencode()}"
+
+def build_cursor_url(request, cursor):
+    """
+    Helper function to build a URL with an updated 'cursor' query parameter.
+    """
+    path = request.path  # Get the path part of the URL
+    query_params = request.GET.copy()  # Get a mutable copy of the current query parameters
+
+    # Update the 'cursor' parameter in query_params
+    query_params['cursor'] = cursor
+
+    # Construct the new URL with updated query parameters
+    return f"{path}?{query_params.urlencode()}"
@@ -6,7 +6,7 @@
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework_simplejwt.tokens import RefreshToken, TokenError
-from apps.api.functions import build_paginated_url
+from apps.api.functions import build_paginated_url, build_cursor_url
 
 User = get_user_model()
 
@@ -203,7 +203,7 @@ class IdListInputSerializer(serializers.Serializer):
 class ListResponseSerializer(serializers.Serializer):
     _metadata = serializers.DictField(
         child=serializers.JSONField(),
-        help_text="Pagination metadata including page, page_size, total_pages, total_items, next_page, and previous_page."
+        help_text="Pagination metadata including page_size, total_items, next_page and previous_page, plus page and total_pages for numbered lists."
     )
     result = serializers.ListField(
         child=serializers.DictField(),
@@ -296,4 +296,33 @@ def build__(cls, request, page, paginator, serializer):
             "result": result
         }
 
-        return cls(response_data)
\ No newline at end of file
+        return cls(response_data)
+
+    @classmethod
+    def build_cursor(cls, request, page, serializer):
+        """
+        Build the response data of a cursor paginated list, including metadata and result.
+
+        :param request: DRF request object.
+        :param page: CursorPage instance.
+        :param serializer: Serializer instance for result data.
+        :return: A ListResponseSerializer instance with populated data.
+        """
+
+        paginator = page.paginator
+
+        metadata = {
+            "page_size": paginator.per_page,
+            "total_items": paginator.count,
+            "total_items_estimated": paginator.is_estimate,
+            "current_page": request.get_full_path(),
+            "next_page": build_cursor_url(request, page.next_cursor) if page.has_next() else None,
+            "previous_page": build_cursor_url(request, page.previous_cursor) if page.has_previous() else None,
+        }
+
+        response_data = {
+            "_metadata": metadata,
+            "result": serializer.data
+        }
+
+        return cls(response_data)
@@ -11,6 +11,7 @@
 ##
 
 from apps.user_app.api_views import LoginView,AuthView,UserView,UserListView,CustomTokenRefreshView
+from apps.task_app.api_views import TaskBulkActionView, TaskSubmitView
 
 from rest_framework_simplejwt.views import (
     TokenRefreshView,
@@ -66,13 +67,17 @@
     #
     ##
     
+    ###
+    #   Task
+    ##
+    
+    path('task/bulk', TaskBulkActionView.as_view(), name="task_bulk"), # pause, resume, cancel, restart tasks by id or filter
+    path('task/submit', TaskSubmitView.as_view(), name="task_submit"), # create and launch many tasks
+    
     # todo
     # check all tasks
     # check task
     # start task
-    # stop
-    # resume
-    # pause
     
     
 
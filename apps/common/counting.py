@@ -0,0 +1,226 @@
+###
+# General imports
+##
+
+## Default
+import hashlib
+import json
+from collections import namedtuple
+from urllib.parse import urlencode
+
+## Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+
+# Result of a count, `estimated` telling whether it may be off
+CountResult = namedtuple('CountResult', ['value', 'estimated'])
+
+# Query parameters not filtering the records, left out of cache keys
+PAGINATION_PARAMS = ('page', 'page_size', 'cursor')
+
+
+###
+# Count Strategies
+##
+
+class CountStrategy:
+    """
+    Base class of the strategies counting the records of a paginated list.
+
+    Strategies are stateless, so an endpoint can keep one as a class attribute.
+    """
+
+    def count(self, queryset, params=None):
+        """
+        Counts the records of the queryset.
+
+        Args:
+            queryset (QuerySet): The records to count.
+            params (QueryDict): The query parameters the records were filtered with, if any.
+
+        Returns:
+            CountResult: The count, and whether it is estimated.
+        """
+        raise NotImplementedError
+
+
+class ExactCount(CountStrategy):
+    """
+    Always runs a COUNT(*), for small tables.
+    """
+
+    def count(self, queryset, params=None):
+        return CountResult(queryset.count(), False)
+
+
+class EstimatedCount(CountStrategy):
+    """
+    Reads the PostgreSQL statistics instead of counting.
+
+    - Unfiltered, the table's `reltuples`, otherwise the planner's row estimate for the query.
+    - Exact on databases other than PostgreSQL.
+    """
+
+    def count(self, queryset, params=None):
+        if connections[queryset.db].vendor != 'postgresql':
+            return CountResult(queryset.count(), False)
+
+        if not queryset.query.where:
+            rows = estimate_table_rows(queryset.model, using=queryset.db)
+            if rows is not None:
+                return CountResult(rows, True)
+
+        return CountResult(estimate_query_rows(queryset), True)
+
+
+class CachedCount(CountStrategy):
+    """
+    Runs an exact COUNT(*) once per filter, then serves it from the cache for `timeout` seconds.
+
+    - Keyed by the endpoint name and the normalized filter parameters, so pages of the same
+      list and reorderings of its parameters share the count.
+    - Without parameters, keyed by the SQL of the query.
+    """
+
+    def __init__(self, name, timeout=None):
+        """
+        Args:
+            name (str): Name of the endpoint, so different lists never share a count.
+            timeout (int): Seconds a count is served from the cache, `COUNT_CACHE_TIMEOUT` by default.
+        """
+        self.name = name
+        self.timeout = timeout
+
+    def count(self, queryset, params=None):
+        key = self.get_cache_key(queryset, params)
+
+        value = cache.get(key)
+        if value is None:
+            value = queryset.count()
+            cache.set(key, value, self.timeout if self.timeout is not None else settings.COUNT_CACHE_TIMEOUT)
+            return CountResult(value, False)
+
+        return CountResult(value, True)
+
+    def get_cache_key(self, queryset, params=None):
+        if params is None:
+            filters = str(queryset.query)
+        else:
+            filters = normalize_params(params)
+        return f"count:{self.name}:{hashlib.sha1(filters.encode()).hexdigest()}"
+
+
+class AdaptiveCount(CountStrategy):
+    """
+    Picks a strategy from the size of the table.
+
+    - Exact below `threshold` estimated rows.
+    - Above, estimated from the statistics when unfiltered, and cached when filtered.
+    """
+
+    def __init__(self, name, threshold=None, timeout=None):
+        """
+        Args:
+            name (str): Name of the endpoint, used to key cached counts.
+            threshold (int): Estimated table rows from which counts stop being exact,
+                `COUNT_EXACT_THRESHOLD` by default.
+            timeout (int): Seconds a filtered count is cached, `COUNT_CACHE_TIMEOUT` by default.
+        """
+        self.threshold = threshold
+        self.exact = ExactCount()
+        self.estimated = EstimatedCount()
+        self.cached = CachedCount(name, timeout)
+
+    def count(self, queryset, params=None):
+        if connections[queryset.db].vendor != 'postgresql':
+            return self.exact.count(queryset, params)
+
+        threshold = self.threshold if self.threshold is not None else settings.COUNT_EXACT_THRESHOLD
+        # Tables never analyzed yet are new ones
+        rows = estimate_table_rows(queryset.model, using=queryset.db)
+        if rows is None or rows < threshold:
+            return self.exact.count(queryset, params)
+
+        if not queryset.query.where:
+            return self.estimated.count(queryset, params)
+        return self.cached.count(queryset, params)
+
+
+def get_count_strategy(count):
+    """
+    Returns the strategy for a `count` argument of a paginator.
+
+    Args:
+        count: A CountStrategy, 'exact', 'estimate', or None for no count.
+
+    Returns:
+        CountStrategy: The strategy, None for no count.
+    """
+    if count is None or isinstance(count, CountStrategy):
+        return count
+    if count == 'exact':
+        return ExactCount()
+    if count == 'estimate':
+        return EstimatedCount()
+    raise ValueError(f'Unknown count strategy: {count}')
+
+
+###
+# Estimates
+##
+
+def estimate_table_rows(model, using='default'):
+    """
+    Returns the rows of a model's table according to the PostgreSQL statistics.
+
+    Args:
+        model (Model): The model of the table.
+        using (str): The database alias.
+
+    Returns:
+        int: The estimated rows, None if the table was never analyzed.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+        row = cursor.fetchone()
+
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def estimate_query_rows(queryset):
+    """
+    Returns the rows the PostgreSQL planner estimates for the queryset, without running it.
+
+    Args:
+        queryset (QuerySet): The records to count.
+
+    Returns:
+        int: The estimated rows.
+    """
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def normalize_params(params):
+    """
+    Returns the filter parameters of a request as a canonical query string.
+
+    - Pagination parameters and blank values are left out, keys and values are sorted.
+
+    Args:
+        params (QueryDict): The query parameters.
+
+    Returns:
+        str: The canonical query string.
+    """
+    items = []
+    for key in sorted(params.keys()):
+        if key in PAGINATION_PARAMS:
+            continue
+        values = params.getlist(key) if hasattr(params, 'getlist') else [params[key]]
+        items += [(key, value) for value in sorted(values) if value not in ('', None)]
+    return urlencode(items)
@@ -0,0 +1,255 @@
+###
+# General imports
+##
+
+## Default
+import base64
+import binascii
+import datetime
+import json
+
+## Django
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+## Counting
+from apps.common.counting import get_count_strategy
+
+
+###
+# Cursor Pagination
+##
+
+class InvalidCursor(ValueError):
+    """
+    Raised when a cursor was not issued by the paginator, or for another ordering.
+    """
+
+
+class CursorPaginator:
+    """
+    Keyset paginator, fetching every page with the same `WHERE key < cursor ORDER BY key LIMIT n` query.
+
+    Unlike Django's `Paginator`, it never runs an OFFSET scan nor, unless asked for, a COUNT(*),
+    so any page costs the same. Pages are addressed by opaque cursors encoding the sort keys
+    of the row they start after.
+
+    - The queryset ordering is used as the sort keys, the primary key being added as the last one
+      so the keys are unique. The keys must be model fields that are never null.
+    - Pages can only be walked forward and backward, plus a jump to the first or last page.
+
+    Usage:
+        paginator = CursorPaginator(Task.objects.order_by('-id'), per_page=10)
+        page = paginator.get_page(request.GET.get('cursor'))
+        page.next_cursor  # To pass back as `?cursor=`
+    """
+
+    # Cursor jumping to the last page
+    LAST = 'last'
+
+    def __init__(self, queryset, per_page, count=None, params=None):
+        """
+        Args:
+            queryset (QuerySet): The ordered records to paginate.
+            per_page (int): The number of records per page.
+            count: The CountStrategy computing `count`, 'exact', 'estimate', or None to never count.
+            params (QueryDict): The query parameters the records were filtered with, to key cached counts.
+        """
+        self.queryset = queryset
+        self.per_page = per_page
+        self.count_strategy = get_count_strategy(count)
+        self.params = params
+        self.ordering = self._get_ordering(queryset)
+
+    @cached_property
+    def count_result(self):
+        if self.count_strategy is None:
+            return None
+        return self.count_strategy.count(self.queryset, self.params)
+
+    @property
+    def count(self):
+        """
+        The total number of records, None if not counted.
+        """
+        return self.count_result.value if self.count_result else None
+
+    @property
+    def is_estimate(self):
+        """
+        Whether `count` may be off, i.e. it was estimated or served from the cache.
+        """
+        return bool(self.count_result and self.count_result.estimated)
+
+    def page(self, cursor=None):
+        """
+        Returns the page starting at the cursor.
+
+        Args:
+            cursor (str): A cursor of a previous page, `LAST` for the last page, None for the first page.
+
+        Returns:
+            CursorPage: The page.
+
+        Raises:
+            InvalidCursor: If the cursor is not a valid one.
+        """
+        if not cursor:
+            return self._fetch(None, forward=True, first=True)
+        if cursor == self.LAST:
+            return self._fetch(None, forward=False, first=True)
+
+        values, forward = self.decode_cursor(cursor)
+        return self._fetch(values, forward=forward, first=False)
+
+    def get_page(self, cursor=None):
+        """
+        Returns the page starting at the cursor, or the first page if the cursor is not a valid one.
+        """
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page(None)
+
+    def encode_cursor(self, record, forward):
+        """
+        Returns the opaque cursor of the page starting after (or, backward, before) the record.
+        """
+        payload = {'k': [self._get_value(record, field) for field, _ in self.ordering], 'f': forward}
+        data = json.dumps(payload, default=_encode_value, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """
+        Returns the sort keys and direction of a cursor.
+
+        Raises:
+            InvalidCursor: If the cursor is not a valid one.
+        """
+        try:
+            data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            payload = json.loads(data)
+            values, forward = payload['k'], payload['f']
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError) as e:
+            raise InvalidCursor(f'Invalid cursor: {cursor}') from e
+
+        if not isinstance(values, list) or len(values) != len(self.ordering) or not isinstance(forward, bool):
+            raise InvalidCursor(f'Invalid cursor: {cursor}')
+
+        # Tampered keys would otherwise only fail in the query
+        meta = self.queryset.model._meta
+        try:
+            values = [meta.get_field(field).to_python(value) for (field, _), value in zip(self.ordering, values)]
+        except (ValidationError, ValueError, TypeError) as e:
+            raise InvalidCursor(f'Invalid cursor: {cursor}') from e
+
+        if None in values:
+            raise InvalidCursor(f'Invalid cursor: {cursor}')
+        return values, forward
+
+    def get_queryset(self, values=None, forward=True):
+        """
+        Returns the query a page is fetched with, one record longer than a page.
+
+        Args:
+            values (list): The sort keys the page starts after, as decoded from a cursor, None for the first page.
+            forward (bool): False for the records before the sort keys, or for the last page.
+
+        Returns:
+            QuerySet: The sliced `WHERE key < cursor ORDER BY key LIMIT n + 1` query.
+        """
+        ordering = self.ordering if forward else [(field, not descending) for field, descending in self.ordering]
+
+        queryset = self.queryset.order_by(*[f"{'-' if descending else ''}{field}" for field, descending in ordering])
+        if values is not None:
+            queryset = queryset.filter(self._after(ordering, values))
+        return queryset[:self.per_page + 1]
+
+    ###
+    # Helper Functions
+    ##
+
+    def _fetch(self, values, forward, first):
+        # One more row tells whether there is a page further on
+        records = list(self.get_queryset(values, forward))
+        further = len(records) > self.per_page
+        records = records[:self.per_page]
+
+        if forward:
+            return CursorPage(self, records, has_next=further, has_previous=not first)
+        return CursorPage(self, records[::-1], has_next=not first, has_previous=further)
+
+    def _after(self, ordering, values):
+        # (a, b) after (x, y) is: a > x OR (a = x AND b > y)
+        condition = Q()
+        equal = Q()
+        for (field, descending), value in zip(ordering, values):
+            condition |= equal & Q(**{f"{field}__{'lt' if descending else 'gt'}": value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def _get_ordering(self, queryset):
+        fields = list(queryset.query.order_by or queryset.model._meta.ordering)
+        pk_name = queryset.model._meta.pk.name
+
+        ordering = []
+        for field in fields:
+            if not isinstance(field, str) or '__' in field or field.startswith('?'):
+                raise ValueError(f'Cursor pagination needs plain field names as ordering, not {field}')
+            descending = field.startswith('-')
+            name = field.lstrip('-')
+            ordering.append((pk_name if name == 'pk' else name, descending))
+
+        if pk_name not in [field for field, _ in ordering]:
+            ordering.append((pk_name, ordering[-1][1] if ordering else False))
+        return ordering
+
+    def _get_value(self, record, field):
+        return getattr(record, self.queryset.model._meta.get_field(field).attname)
+
+
+class CursorPage:
+    """
+    A page of a `CursorPaginator`, iterable like a Django `Page`.
+    """
+
+    def __init__(self, paginator, object_list, has_next, has_previous):
+        self.paginator = paginator
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[-1], forward=True) if self.has_next() else None
+
+    @property
+    def previous_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[0], forward=False) if self.has_previous() else None
+
+
+def _encode_value(value):
+    # Full precision, unlike DjangoJSONEncoder which truncates times to milliseconds
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
@@ -0,0 +1,84 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import TestCase
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.user_app.models import User
+
+
+##
+#   Functions
+#
+
+from apps.common.counting import AdaptiveCount, CachedCount, normalize_params
+from apps.common.pagination import CursorPaginator
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Count Strategies
+#
+##
+
+class CountStrategyTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.bulk_create([User(name=f'user {index}', email=f'count{index}@example.com') for index in range(4)])
+        self.queryset = User.objects.filter(email__startswith='count').order_by('-id')
+
+    def test_cached_count_keyed_by_normalized_params(self):
+        """Test that a cached count is shared by the pages and reorderings of the same filters, and not by others."""
+
+        print_prologue()
+
+        strategy = CachedCount('users')
+        self.assertEqual(
+            normalize_params(QueryDict('status=b&cursor=xyz&type=a&status=a&page_size=10&name=')),
+            'status=a&status=b&type=a',
+        )
+
+        first = strategy.count(self.queryset, QueryDict('type=a&status=b'))
+        self.assertEqual(first, (4, False))
+
+        # Served from the cache, even though a record was added meanwhile
+        User.objects.create_user(email='count9@example.com', password='password123')
+        with self.assertNumQueries(0):
+            self.assertEqual(strategy.count(self.queryset, QueryDict('status=b&type=a&cursor=xyz')), (4, True))
+
+        self.assertEqual(strategy.count(self.queryset, QueryDict('type=b')), (5, False))
+        self.assertEqual(CachedCount('others').count(self.queryset, QueryDict('type=a&status=b')), (5, False))
+
+        print("\n")
+
+    def test_paginator_uses_strategy(self):
+        """Test that a paginator counts with its strategy, and only when the count is read."""
+
+        print_prologue()
+
+        # Exact without PostgreSQL statistics
+        paginator = CursorPaginator(self.queryset, per_page=2, count=AdaptiveCount('users'), params=QueryDict())
+        with self.assertNumQueries(1):
+            paginator.page()
+        with self.assertNumQueries(1):
+            self.assertEqual((paginator.count, paginator.is_estimate), (4, False))
+
+        print("\n")
@@ -0,0 +1,106 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.test import TestCase
+
+##
+#   Extras
+#
+
+import base64
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.user_app.models import User
+
+
+##
+#   Functions
+#
+
+from apps.common.pagination import CursorPaginator, InvalidCursor
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Cursor Pagination
+#
+##
+
+class CursorPaginationTestCase(TestCase):
+    def setUp(self):
+        User.objects.bulk_create([
+            User(name=name, email=f'cursor{index}@example.com')
+            for index, name in enumerate(['b', 'a', 'c', 'a', 'b', 'a', 'c'])
+        ])
+        self.queryset = User.objects.filter(email__startswith='cursor').order_by('name', '-id')
+        self.expected = list(self.queryset.values_list('id', flat=True))
+
+    def test_walk_forward_and_backward(self):
+        """Test that following the cursors walks every record once, in order, both ways."""
+
+        print_prologue()
+
+        paginator = CursorPaginator(self.queryset, per_page=3)
+
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            # Every page is a single LIMIT query, without OFFSET nor COUNT
+            with self.assertNumQueries(1):
+                pages.append(paginator.page(pages[-1].next_cursor))
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([user.id for page in pages for user in page], self.expected)
+        self.assertFalse(pages[0].has_previous())
+
+        last = paginator.page(CursorPaginator.LAST)
+        self.assertEqual([user.id for user in last], self.expected[-3:])
+
+        previous = paginator.page(pages[-1].previous_cursor)
+        self.assertEqual([user.id for user in previous], self.expected[3:6])
+        self.assertTrue(previous.has_next() and previous.has_previous())
+
+        print("\n")
+
+    def test_counts_and_invalid_cursors(self):
+        """Test that counting is optional, and that invalid cursors are refused or fall back to the first page."""
+
+        print_prologue()
+
+        self.assertIsNone(CursorPaginator(self.queryset, per_page=3).count)
+        self.assertEqual(CursorPaginator(self.queryset, per_page=3, count='estimate').count, 7)
+
+        paginator = CursorPaginator(self.queryset, per_page=3)
+        with self.assertRaises(InvalidCursor):
+            paginator.page('not-a-cursor')
+        self.assertEqual([user.id for user in paginator.get_page('not-a-cursor')], self.expected[:3])
+
+        print("\n")
+
+    def test_tampered_cursors_are_invalid(self):
+        """Test that cursors whose keys do not fit the ordering fields are refused, not sent to the database."""
+
+        print_prologue()
+
+        paginator = CursorPaginator(self.queryset, per_page=3)
+        for payload in ('{"k":["a","abc"],"f":true}', '{"k":["a",null],"f":true}', '{"k":["a",[1]],"f":false}'):
+            cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+            with self.subTest(payload=payload), self.assertRaises(InvalidCursor):
+                paginator.page(cursor)
+
+        print("\n")
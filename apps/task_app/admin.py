@@ -8,7 +8,10 @@
 ### App-specific imports
 
 ## Models
-from apps.task_app.models import Task, Job, TimeCondition  # Add this import
+from apps.task_app.models import Task, Job, TimeCondition, MaxRecordsCondition, ThroughputCondition
+
+## Transitions
+from apps.task_app import transitions
 
 # Register your models here.
 
@@ -18,31 +21,72 @@ class TaskAdmin(admin.ModelAdmin):
     Admin configuration for the Task model.
 
     - Displays task type, status, and timing information.
-    - Provides an action to duplicate selected tasks.
+    - Provides actions to duplicate, pause, resume, cancel and restart selected tasks.
+    - Actions apply to the whole selection at once, with set-based queries.
 
     Attributes:
         list_display (tuple): Fields to display in the list view.
+        list_filter (tuple): Fields to filter by in the list view.
         actions (list): List of custom actions for TaskAdmin.
     """
-    list_display = ('type', 'status', 'started_at', 'finished_at')
-    actions = ['duplicate_tasks']
+    list_display = ('type', 'status', 'queue', 'priority', 'started_at', 'finished_at')
+    list_filter = ('status', 'type', 'queue', 'priority')
+    actions = ['duplicate_tasks', 'pause_tasks', 'resume_tasks', 'cancel_tasks', 'restart_tasks']
 
     def duplicate_tasks(self, request, queryset):
         """
         Duplicates selected Task instances.
 
-        - For each task in the queryset, sets the primary key to None,
-          saving it as a new instance.
+        - Creates and launches every copy in one batch, see `transitions.submit_tasks`.
           
         Args:
             request (HttpRequest): The current request object.
             queryset (QuerySet): The selected tasks to duplicate.
         """
+        copies = []
         for task in queryset:
             task.pk = None  # Set primary key to None to create a new instance
-            task.save()
+            task.status = Task.Status.STARTING
+            task.finished_at = None
+            task.stopped_at = None
+            copies.append(task)
+
+        transitions.submit_tasks(copies)
+        self.message_user(request, f'{len(copies)} tasks duplicated.')
     duplicate_tasks.short_description = 'Duplicate selected tasks'
 
+    def pause_tasks(self, request, queryset):
+        """
+        Pauses the selected running tasks.
+        """
+        tasks = transitions.pause_tasks(queryset.values_list('id', flat=True))
+        self.message_user(request, f'{len(tasks)} tasks paused.')
+    pause_tasks.short_description = 'Pause selected tasks'
+
+    def resume_tasks(self, request, queryset):
+        """
+        Resumes the selected paused or stopped tasks.
+        """
+        tasks = transitions.resume_tasks(queryset.values_list('id', flat=True))
+        self.message_user(request, f'{len(tasks)} tasks resumed.')
+    resume_tasks.short_description = 'Resume selected tasks'
+
+    def cancel_tasks(self, request, queryset):
+        """
+        Cancels the selected tasks that have not ended yet.
+        """
+        tasks = transitions.cancel_tasks(queryset.values_list('id', flat=True))
+        self.message_user(request, f'{len(tasks)} tasks canceled.')
+    cancel_tasks.short_description = 'Cancel selected tasks'
+
+    def restart_tasks(self, request, queryset):
+        """
+        Restarts the selected tasks from their first step.
+        """
+        tasks = transitions.restart_tasks(queryset.values_list('id', flat=True))
+        self.message_user(request, f'{len(tasks)} tasks restarted.')
+    restart_tasks.short_description = 'Restart selected tasks'
+
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
@@ -51,25 +95,42 @@ class JobAdmin(admin.ModelAdmin):
 
     - Displays the last run time and allows filtering by it.
     - Sets last_run as a read-only field.
+    - Shows the launches waiting for a concurrency slot, read-only.
+    - Loads the conditions of the listed jobs in a constant number of queries.
 
     Attributes:
         list_display (tuple): Fields to display in the list view.
         list_filter (tuple): Fields to filter by in the list view.
         readonly_fields (tuple): Fields to set as read-only.
     """
-    list_display = ('name', 'type', 'enabled', 'continue_mode', 'starting_condition', 'stopping_condition', 'log_path')
+    list_display = ('name', 'type', 'enabled', 'continue_mode', 'queue', 'priority', 'max_concurrency', 'queued_launches', 'running_count', 'total_tasks', 'last_task_status', 'last_run_at', 'starting_condition', 'stopping_condition', 'log_path')
     search_fields = ('name', 'type','enabled')
-    list_filter = ('continue_mode', 'type')
-    readonly_fields = ('starting_condition', 'stopping_condition')
+    list_filter = ('continue_mode', 'type', 'queue', 'priority', 'overflow_policy')
+    readonly_fields = ('starting_condition', 'stopping_condition', 'queued_launches', 'running_count', 'total_tasks', 'last_task_status', 'last_run_at')
     fieldsets = (
         (None, {
             'fields': ('name', 'type', 'continue_mode', 'log_path')
         }),
+        ('Routing', {
+            'fields': ('queue', 'priority')
+        }),
+        ('Admission', {
+            'fields': ('max_concurrency', 'overflow_policy', 'queued_launches')
+        }),
+        ('Logs', {
+            'fields': ('log_retention_days',)
+        }),
         ('Conditions', {
             'fields': ('starting_condition', 'stopping_condition')
         }),
+        ('Counters', {
+            'fields': ('running_count', 'total_tasks', 'last_task_status', 'last_run_at')
+        }),
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_conditions()
+
 
 
 @admin.register(TimeCondition)
@@ -77,14 +138,34 @@ class TimeConditionAdmin(admin.ModelAdmin):
     """
     Admin configuration for the TimeCondition model.
 
-    - Displays crontab and periodic task information.
+    - Displays crontab and next fire time information.
     - Allows searching by crontab schedule.
 
     Attributes:
         list_display (tuple): Fields to display in the list view.
         search_fields (tuple): Fields to search by in the list view.
     """
-    list_display = ('id', 'crontab', 'periodic_task')
+    list_display = ('id', 'crontab', 'next_run_at')
     search_fields = ('crontab__minute', 'crontab__hour', 'crontab__day_of_week', 'crontab__day_of_month', 'crontab__month_of_year')
 
 
+@admin.register(MaxRecordsCondition)
+class MaxRecordsConditionAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the MaxRecordsCondition model.
+
+    Attributes:
+        list_display (tuple): Fields to display in the list view.
+    """
+    list_display = ('id', 'max_records')
+
+
+@admin.register(ThroughputCondition)
+class ThroughputConditionAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the ThroughputCondition model.
+
+    Attributes:
+        list_display (tuple): Fields to display in the list view.
+    """
+    list_display = ('id', 'min_throughput', 'window')
@@ -0,0 +1,192 @@
+###
+# General imports
+##
+
+## Default
+import logging
+from contextlib import contextmanager
+
+## Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, models, transaction
+from django.db.models import Count, F
+
+## Models
+from apps.task_app.models import Task, Job
+
+# Set up main logger
+main_logger = logging.getLogger('django')
+
+# Statuses holding a concurrency slot
+ACTIVE_STATUSES = [Task.Status.STARTING, Task.Status.RUNNING]
+
+# Postgres advisory lock serializing the launches checked against the global limit
+ADMISSION_LOCK_ID = 0x7A5C
+
+# Cache key counting the launches of a job by decision
+ADMISSION_METRIC_KEY = 'task_app:admission:{}:{}'
+
+
+class AdmissionDecision(models.TextChoices):
+    ADMITTED = 'ADMITTED', 'Admitted'
+    QUEUED = 'QUEUED', 'Queued'
+    SKIPPED = 'SKIPPED', 'Skipped'
+    COALESCED = 'COALESCED', 'Coalesced'
+
+
+###
+# Admission Control
+##
+
+@contextmanager
+def admit_job_launch(job):
+    """
+    Decides whether a job may launch a task now, holding the job's row lock meanwhile.
+
+    - The tasks of the job currently STARTING or RUNNING are the slots in use, the
+      launch is admitted while they are fewer than `Job.max_concurrency`, and while
+      all jobs together use fewer than `TASK_MAX_CONCURRENCY` slots.
+    - Otherwise the job's overflow policy applies: QUEUE counts the launch in
+      `Job.queued_launches`, COALESCE does the same but keeps at most one, SKIP drops it.
+    - The job row stays locked until the block exits, so the task must be created
+      (or resumed) inside it, concurrent launches of the job are serialized. With a
+      global limit, an advisory lock serializes the launches of all jobs as well.
+
+    Args:
+        job (Job): The job being launched.
+
+    Yields:
+        str: The `AdmissionDecision`.
+
+    Usage:
+        with admit_job_launch(job) as decision:
+            if decision == AdmissionDecision.ADMITTED:
+                Task.objects.create(type=job.type, job=job)
+    """
+    with transaction.atomic():
+        locked = Job.objects.select_for_update().only('id', 'max_concurrency', 'overflow_policy', 'queued_launches').get(id=job.id)
+
+        decision = _decide(locked)
+        _record(job.id, decision)
+
+        if decision != AdmissionDecision.ADMITTED:
+            main_logger.info(f'Job {job.id} launch {decision.label.lower()}, concurrency limit reached')
+
+        yield decision
+
+
+def release_job_slot(job_id):
+    """
+    Hands a slot freed by a task of the job to a queued launch, if any.
+
+    - The job's own queued launches come first.
+    - With a global limit, the slot also counted against `TASK_MAX_CONCURRENCY`, which may
+      hold back the launches of other jobs, even jobs without any task of their own: the
+      oldest such job gets the slot otherwise.
+
+    Args:
+        job_id (int): ID of the job whose task stopped holding a slot.
+
+    Returns:
+        bool: Whether a queued launch was sent.
+    """
+    from apps.task_app.tasks import _launch_job
+
+    released_job_id = _release_queued_launch([job_id])
+    if released_job_id is None and settings.TASK_MAX_CONCURRENCY:
+        released_job_id = _release_queued_launch(
+            Job.objects.filter(queued_launches__gt=0).exclude(id=job_id).order_by('id').values_list('id', flat=True)
+        )
+
+    if released_job_id is not None:
+        transaction.on_commit(lambda: _launch_job.delay(released_job_id))
+
+    return released_job_id is not None
+
+
+def get_admission_stats(job_ids=None):
+    """
+    Returns the admission metrics of the jobs with a concurrency limit.
+
+    Args:
+        job_ids (list): Restricts the metrics to these jobs, None for all limited jobs.
+
+    Returns:
+        dict: Slots in use, queue depth and launches counted by decision (admitted, queued,
+            skipped, coalesced), keyed by job ID.
+    """
+    jobs = Job.objects.exclude(max_concurrency=None)
+    if job_ids is not None:
+        jobs = jobs.filter(id__in=job_ids)
+
+    jobs = list(jobs.values('id', 'max_concurrency', 'overflow_policy', 'queued_launches'))
+
+    active = dict(
+        Task.objects.filter(job_id__in=[job['id'] for job in jobs], status__in=ACTIVE_STATUSES)
+        .values_list('job_id')
+        .annotate(count=Count('id'))
+    )
+
+    keys = [ADMISSION_METRIC_KEY.format(job['id'], decision) for job in jobs for decision in AdmissionDecision.values]
+    counters = cache.get_many(keys)
+
+    return {
+        job['id']: {
+            'max_concurrency': job['max_concurrency'],
+            'overflow_policy': job['overflow_policy'],
+            'active': active.get(job['id'], 0),
+            'queue_depth': job['queued_launches'],
+            **{
+                decision.lower(): counters.get(ADMISSION_METRIC_KEY.format(job['id'], decision), 0)
+                for decision in AdmissionDecision.values
+            },
+        }
+        for job in jobs
+    }
+
+
+###
+# Helper Functions
+##
+
+def _decide(job):
+    job_full = (
+        job.max_concurrency is not None
+        and Task.objects.filter(job_id=job.id, status__in=ACTIVE_STATUSES).count() >= job.max_concurrency
+    )
+    global_full = False
+    if settings.TASK_MAX_CONCURRENCY:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [ADMISSION_LOCK_ID])
+        global_full = Task.objects.filter(job__isnull=False, status__in=ACTIVE_STATUSES).count() >= settings.TASK_MAX_CONCURRENCY
+
+    if not job_full and not global_full:
+        return AdmissionDecision.ADMITTED
+
+    if job.overflow_policy == Job.OverflowPolicy.SKIP:
+        return AdmissionDecision.SKIPPED
+
+    if job.overflow_policy == Job.OverflowPolicy.COALESCE and job.queued_launches:
+        return AdmissionDecision.COALESCED
+
+    Job.objects.filter(id=job.id).update(queued_launches=F('queued_launches') + 1)
+    return AdmissionDecision.QUEUED
+
+
+def _release_queued_launch(job_ids):
+    for job_id in job_ids:
+        # A single conditional UPDATE, so each queued launch is only handed out once
+        if Job.objects.filter(id=job_id, queued_launches__gt=0).update(queued_launches=F('queued_launches') - 1):
+            return job_id
+    return None
+
+
+def _record(job_id, decision):
+    key = ADMISSION_METRIC_KEY.format(job_id, decision)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted in between, the metric restarts from one
+        cache.set(key, 1, None)
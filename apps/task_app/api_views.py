@@ -0,0 +1,165 @@
+###
+#       General imports
+##
+
+
+##
+#   Django Rest Framework
+#
+
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+
+##
+#   Api Swagger
+#
+
+from drf_yasg.utils import swagger_auto_schema
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Serializers
+#
+
+from apps.task_app.serializers import TaskBulkActionSerializer, TaskBulkActionResponseSerializer, TaskSubmitSerializer, TaskSubmitResponseSerializer
+from apps.api.serializers import ErrorResponseSerializer
+
+
+##
+#   Functions
+#
+
+from apps.task_app.transitions import BULK_OPERATIONS, submit_tasks
+
+
+##
+#   Contants
+#
+
+from apps.api.constants import ERROR_TYPES
+
+
+###
+#
+#   Task App
+#
+##
+
+###
+#   Task
+##
+
+class TaskBulkActionView(APIView):
+    """
+    View applying an action to many tasks at once.
+
+    - POST: Pauses, cancels, resumes or restarts the tasks given by ID or by filter.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        tags=['Task'],
+        operation_id="task_bulk_action",
+        operation_summary="Apply an action to many tasks",
+        operation_description=(
+            "Applies the action to the tasks given by `ids`, or to every task matching `filters`. "
+            "Tasks whose status does not allow the action are left untouched."
+        ),
+        request_body=TaskBulkActionSerializer,
+        responses={
+            200: TaskBulkActionResponseSerializer,
+            400: ErrorResponseSerializer,
+            403: ErrorResponseSerializer,
+        }
+    )
+    def post(self, request):
+        """
+        Handle POST request for a bulk task action.
+
+        - Every transition is a set-based UPDATE, and the Celery tasks of the moved tasks are
+          interrupted or launched in batches, so thousands of tasks are handled in one request.
+
+        Args:
+            request: HTTP request object containing the action and the tasks.
+
+        Returns:
+            Response: HTTP response with the IDs of the tasks moved, or an error.
+        """
+
+        # Validate serializer
+        serializer = TaskBulkActionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(ErrorResponseSerializer.from_serializer_errors(serializer).data, status=status.HTTP_400_BAD_REQUEST)
+
+        action = serializer.validated_data['action']
+
+        # Same permissions as the single task views
+        if not request.user.has_perm(f"task_app.can_{action}_task"):
+            return Response(
+                ErrorResponseSerializer.from_params(type=ERROR_TYPES.LOGICAL.value, message=f"You are not allowed to {action} tasks.").data,
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        tasks = BULK_OPERATIONS[action](serializer.get_task_ids())
+
+        return Response(TaskBulkActionResponseSerializer.build_(action, tasks).data, status=status.HTTP_200_OK)
+
+
+class TaskSubmitView(APIView):
+    """
+    View creating many tasks at once.
+
+    - POST: Creates and launches the given tasks in one transaction.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        tags=['Task'],
+        operation_id="task_submit",
+        operation_summary="Create many tasks",
+        operation_description=(
+            "Creates the given tasks with batched inserts and launches them in one batch, "
+            "once the transaction commits."
+        ),
+        request_body=TaskSubmitSerializer,
+        responses={
+            201: TaskSubmitResponseSerializer,
+            400: ErrorResponseSerializer,
+            403: ErrorResponseSerializer,
+        }
+    )
+    def post(self, request):
+        """
+        Handle POST request for a bulk task submission.
+
+        Args:
+            request: HTTP request object containing the tasks to create.
+
+        Returns:
+            Response: HTTP response with the IDs of the tasks created, or an error.
+        """
+
+        if not request.user.has_perm("task_app.can_create_task"):
+            return Response(
+                ErrorResponseSerializer.from_params(type=ERROR_TYPES.LOGICAL.value, message="You are not allowed to create tasks.").data,
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        # Validate serializer
+        serializer = TaskSubmitSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(ErrorResponseSerializer.from_serializer_errors(serializer).data, status=status.HTTP_400_BAD_REQUEST)
+
+        tasks = submit_tasks(serializer.build_tasks())
+
+        return Response(TaskSubmitResponseSerializer.build_(tasks).data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,283 @@
+###
+# General imports
+##
+
+## Default
+import os
+import signal
+import time
+import threading
+import weakref
+
+## Django
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+
+# Checkpoints currently open in this process, used to force a flush on shutdown
+_active_checkpoints = weakref.WeakSet()
+
+# Re-delivers a termination signal received while checkpoints were open, None until one is
+_terminate = None
+_terminate_timer = None
+
+
+###
+# Exceptions
+##
+
+class TaskTerminated(BaseException):
+    """
+    Raised at the next step of a run once its process was asked to terminate, so the run
+    unwinds and flushes its checkpoint outside of the signal handler.
+    """
+    pass
+
+
+###
+# Checkpoint
+##
+
+class TaskCheckpoint:
+    """
+    Buffers the `step` progress of a running task in memory and persists it in batches.
+
+    Instead of a full `Task.save()` on every step, progress is written with a single
+    `QuerySet.update()` once `interval` seconds or `steps` steps have elapsed since the
+    last flush, whichever comes first. Leaving the context (finish, failure or pause)
+    always flushes, so a resumed task continues from the last step reached.
+
+    Flushes only apply while the task is still on the run the checkpoint was opened for
+    (`Task.run_id`), so a run winding down after a restart never overwrites the new run's step.
+
+    Attributes:
+        task (Task): The task whose progress is being tracked.
+        step (int): The latest step reached, possibly not yet persisted.
+        interval (float): Maximum seconds between two flushes.
+        steps (int): Maximum steps between two flushes.
+
+    Usage:
+        with TaskCheckpoint(task) as checkpoint:
+            for step in range(start, end):
+                ...
+                checkpoint.advance(step)
+    """
+
+    def __init__(self, task, step=None, interval=None, steps=None):
+        self.task = task
+        self.step = task.step if step is None else step
+        self.interval = settings.TASK_CHECKPOINT_INTERVAL if interval is None else interval
+        self.steps = settings.TASK_CHECKPOINT_STEPS if steps is None else steps
+
+        self._flushed_step = task.step
+        self._flushed_at = time.monotonic()
+
+    def __enter__(self):
+        _active_checkpoints.add(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.flush()
+        finally:
+            _active_checkpoints.discard(self)
+
+        # The last checkpoint flushed, the process can now terminate as it was asked to
+        if _terminate is not None and not _active_checkpoints:
+            _terminate()
+        return False
+
+    @property
+    def is_due(self):
+        """
+        Whether enough steps or time have elapsed since the last flush.
+        """
+        return (
+            abs(self.step - self._flushed_step) >= self.steps
+            or time.monotonic() - self._flushed_at >= self.interval
+        )
+
+    def advance(self, step):
+        """
+        Records the step reached, flushing it to the database if a checkpoint is due.
+
+        Args:
+            step (int): The step the task has reached.
+
+        Raises:
+            TaskTerminated: If the process was asked to terminate.
+        """
+        self.step = step
+        if _terminate is not None:
+            raise TaskTerminated()
+        if self.is_due:
+            self.flush()
+
+    def flush(self, **fields):
+        """
+        Persists the buffered step, along with any extra fields, in one UPDATE.
+
+        - Skips the query when there is nothing new to write.
+        - Bypasses `save()`, so neither `auto_now` fields nor `post_save` receivers fire.
+
+        Args:
+            fields (dict): Additional Task fields to update in the same statement (e.g. status).
+
+        Returns:
+            int: The number of rows updated.
+        """
+        if self.step == self._flushed_step and not fields:
+            self._flushed_at = time.monotonic()
+            return 0
+
+        fields["step"] = self.step
+        fields.setdefault("updated_at", timezone.now())
+        updated = self.get_queryset().update(**fields)
+
+        for name, value in fields.items():
+            setattr(self.task, name, value)
+
+        self._flushed_step = self.step
+        self._flushed_at = time.monotonic()
+
+        if updated:
+            self.publish()
+
+        return updated
+
+    def get_queryset(self):
+        """
+        Returns the row the checkpoint writes to, as long as it is on the same run.
+        """
+        return type(self.task).objects.filter(id=self.task.id, run_id=self.task.run_id)
+
+    def publish(self):
+        """
+        Publishes the flushed step to the dashboards.
+        """
+        from apps.task_app.dashboard import publish_progress
+
+        publish_progress(self.task, self.step)
+
+
+class ChunkCheckpoint(TaskCheckpoint):
+    """
+    Checkpoint of a single `TaskChunk` of a task split across workers.
+
+    The chunk's own `step` is what a resumed chunk continues from, while the parent
+    task's `step` is the shared aggregate: every flush adds the steps processed since
+    the previous one with an `F()` expression, so concurrent chunks never overwrite
+    each other's progress.
+
+    Attributes:
+        task (TaskChunk): The chunk whose progress is being tracked.
+    """
+
+    def flush(self, **fields):
+        processed = self.step - self._flushed_step
+
+        updated = super().flush(**fields)
+
+        # A chunk deleted meanwhile (task restarted) must not count towards the new run
+        if processed and updated:
+            parent = self.task.task
+            type(parent).objects.filter(id=parent.id, run_id=parent.run_id).update(
+                step=F('step') + processed,
+                updated_at=timezone.now(),
+            )
+            self.publish_parent(parent)
+
+        return updated
+
+    def get_queryset(self):
+        # Chunks are recreated by a restart, their own row scopes them to their run
+        return type(self.task).objects.filter(id=self.task.id)
+
+    def publish(self):
+        # The chunk's own step means nothing to the dashboards, see `publish_parent`
+        pass
+
+    def publish_parent(self, parent):
+        """
+        Publishes the aggregate step of the parent task, as written by every chunk.
+        """
+        from apps.task_app.dashboard import publish_progress
+
+        step = type(parent).objects.filter(id=parent.id).values_list('step', flat=True).first()
+        if step is not None:
+            publish_progress(parent, step)
+
+
+###
+# Helper Functions
+##
+
+def flush_all_checkpoints():
+    """
+    Flushes every checkpoint open in the current process.
+
+    Called on worker shutdown, so buffered progress is not lost between two periodic flushes.
+    """
+    for checkpoint in list(_active_checkpoints):
+        try:
+            checkpoint.flush()
+        except Exception:
+            # A failing flush must never prevent the others or the shutdown itself
+            pass
+
+
+def install_terminate_handler(signum=signal.SIGTERM):
+    """
+    Installs a signal handler that lets the open checkpoints flush before the process exits.
+
+    `revoke(terminate=True)` sends SIGTERM to the worker child running the task. Running
+    queries from the handler itself could interrupt one in flight on the same connection, so
+    it only flags the termination: the run raises `TaskTerminated` at its next step, its
+    checkpoint flushes on the way out, and the signal is then re-delivered with the previous
+    disposition, so the process still terminates exactly as before. A run that reaches no
+    step within `TASK_TERMINATE_GRACE` seconds is terminated without flushing.
+
+    Args:
+        signum (int): The signal to intercept. Defaults to SIGTERM.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+
+    previous = signal.getsignal(signum)
+
+    def deliver():
+        if callable(previous):
+            previous(signum, None)
+            return
+
+        signal.signal(signum, previous if previous is not None else signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+    def handler(received, frame):
+        # Nothing to flush, or the grace period is over: terminate right away
+        if not _active_checkpoints or _terminate is not None:
+            deliver()
+            return
+
+        request_terminate(deliver, signum)
+
+    signal.signal(signum, handler)
+
+
+def request_terminate(deliver, signum=signal.SIGTERM):
+    """
+    Flags the process for termination, once its open checkpoints are flushed.
+
+    Args:
+        deliver (callable): Terminates the process, called by the last checkpoint closed.
+        signum (int): The signal sent again after `TASK_TERMINATE_GRACE` seconds, for the
+            handler to terminate the process if no checkpoint closed meanwhile.
+    """
+    global _terminate, _terminate_timer
+
+    _terminate = deliver
+
+    _terminate_timer = threading.Timer(settings.TASK_TERMINATE_GRACE, os.kill, (os.getpid(), signum))
+    _terminate_timer.daemon = True
+    _terminate_timer.start()
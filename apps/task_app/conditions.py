@@ -0,0 +1,146 @@
+###
+# General imports
+##
+
+## Default
+import time
+
+### App-specific imports
+
+## Control
+from apps.task_app.control import TaskInterrupted
+
+
+###
+# Exceptions
+##
+
+class ConditionReached(TaskInterrupted):
+    """
+    Raised between two steps when the running task met its job's stopping condition.
+
+    Unlike an interrupt requested from outside, nobody moved the task yet, the runner
+    does it itself once its progress is flushed.
+
+    Attributes:
+        status (str): The status the task stops in (PAUSED in continue mode, STOPPED otherwise).
+        reason (str): What was reached, for logging purposes.
+    """
+
+    def __init__(self, status, reason):
+        super().__init__(status)
+        self.reason = reason
+
+
+###
+# Evaluators
+##
+
+class ConditionEvaluator:
+    """
+    In-memory evaluation of a stopping condition, fed by the running task after each step.
+
+    Evaluators only look at counters kept in memory, so checking a condition never
+    costs a query, whatever the number of steps.
+
+    Attributes:
+        status (str): The status the task stops in once the condition is met.
+    """
+
+    def __init__(self, status):
+        self.status = status
+
+    def start(self, step):
+        """
+        Called once before the first step of the run.
+        """
+        pass
+
+    def check(self, step):
+        """
+        Called after every step, raises `ConditionReached` once the condition is met.
+        """
+        raise NotImplementedError
+
+
+class MaxRecordsEvaluator(ConditionEvaluator):
+    """
+    Stops the run once it has processed `max_records` steps.
+    """
+
+    def __init__(self, status, max_records):
+        super().__init__(status)
+        self.max_records = max_records
+        self._limit = None
+
+    def start(self, step):
+        self._limit = step + self.max_records
+
+    def check(self, step):
+        if step >= self._limit:
+            raise ConditionReached(self.status, f'{self.max_records} records processed')
+
+
+class ThroughputEvaluator(ConditionEvaluator):
+    """
+    Stops the run once its throughput over a window of `window` seconds drops below
+    `min_throughput` steps per second.
+
+    - Windows are consecutive, each one starting where the previous ended, so only the
+      start of the current window is kept.
+    """
+
+    def __init__(self, status, min_throughput, window):
+        super().__init__(status)
+        self.min_throughput = min_throughput
+        self.window = window
+        self._window_started_at = None
+        self._window_step = None
+
+    def start(self, step):
+        self._window_started_at = time.monotonic()
+        self._window_step = step
+
+    def check(self, step):
+        elapsed = time.monotonic() - self._window_started_at
+        if elapsed < self.window:
+            return
+
+        throughput = (step - self._window_step) / elapsed
+        if throughput < self.min_throughput:
+            raise ConditionReached(self.status, f'throughput dropped to {throughput:.2f} steps/s')
+
+        self._window_started_at += elapsed
+        self._window_step = step
+
+
+###
+# Helper Functions
+##
+
+def get_stopping_evaluator(job):
+    """
+    Returns the evaluator of a job's stopping condition, for a run of one of its tasks.
+
+    - Only conditions evaluated by the task itself have one; time conditions are fired
+      by the scheduler instead.
+    - Resolves the condition once per run, a single query.
+
+    Args:
+        job (Job): The job of the task, None for a task without job.
+
+    Returns:
+        ConditionEvaluator: The evaluator, None when there is nothing to evaluate.
+    """
+    from apps.task_app.models import Task
+
+    if job is None or job.stopping_condition_type_id is None:
+        return None
+
+    condition = job.stopping_condition
+    if condition is None:
+        return None
+
+    # Same outcome as a time condition stopping the job
+    status = Task.Status.PAUSED if job.continue_mode else Task.Status.STOPPED
+    return condition.get_evaluator(status)
@@ -0,0 +1,115 @@
+###
+# General imports
+##
+
+## Default
+import time
+
+## Django
+from django.conf import settings
+from django.core.cache import cache
+
+
+# Cache key holding the interrupt requested for a Celery task
+INTERRUPT_KEY = 'task_app:interrupt:{}'
+
+# Value stored once the running Celery task has stopped on its own
+ACKNOWLEDGED = 'ACKNOWLEDGED'
+
+
+###
+# Exceptions
+##
+
+class TaskInterrupted(Exception):
+    """
+    Raised between two steps when the running task was asked to stop.
+
+    Attributes:
+        status (str): The status requested for the task (e.g. PAUSED, CANCELED).
+    """
+
+    def __init__(self, status):
+        super().__init__(f'Task interrupted ({status})')
+        self.status = status
+
+
+###
+# Control Channel
+##
+
+class TaskControl:
+    """
+    Cooperative control flag polled by a running Celery task between steps.
+
+    The flag is keyed by Celery task ID, so a relaunched task (new Celery ID) is never
+    affected by an interrupt aimed at a previous run. Polling is throttled to one cache
+    read every `poll_interval` seconds, regardless of how fast the steps are.
+
+    Attributes:
+        celery_task_id (str): ID of the Celery task being controlled, None when running
+            outside a worker (debug mode), in which case the control is disabled.
+        poll_interval (float): Minimum seconds between two polls.
+    """
+
+    def __init__(self, celery_task_id, poll_interval=None):
+        self.celery_task_id = celery_task_id
+        self.poll_interval = settings.TASK_CONTROL_POLL_INTERVAL if poll_interval is None else poll_interval
+        self._polled_at = time.monotonic()
+
+    def check(self):
+        """
+        Raises `TaskInterrupted` if an interrupt has been requested since the last poll.
+        """
+        if not self.celery_task_id:
+            return
+
+        if time.monotonic() - self._polled_at < self.poll_interval:
+            return
+
+        self._polled_at = time.monotonic()
+
+        status = cache.get(INTERRUPT_KEY.format(self.celery_task_id))
+        if status and status != ACKNOWLEDGED:
+            raise TaskInterrupted(status)
+
+    def acknowledge(self):
+        """
+        Marks the interrupt as handled, so the revoke fallback leaves this task alone.
+        """
+        if self.celery_task_id:
+            cache.set(INTERRUPT_KEY.format(self.celery_task_id), ACKNOWLEDGED, settings.TASK_CONTROL_KEY_TIMEOUT)
+
+
+###
+# Helper Functions
+##
+
+def request_interrupt(celery_task_ids, status):
+    """
+    Asks the given Celery tasks to stop at their next step.
+
+    Args:
+        celery_task_ids (list): IDs of the Celery tasks to interrupt.
+        status (str): The status requested for the task, for logging purposes.
+    """
+    cache.set_many(
+        {INTERRUPT_KEY.format(celery_task_id): status for celery_task_id in celery_task_ids},
+        settings.TASK_CONTROL_KEY_TIMEOUT,
+    )
+
+
+def get_unacknowledged(celery_task_ids):
+    """
+    Returns the Celery tasks that have not acknowledged their interrupt.
+
+    Args:
+        celery_task_ids (list): IDs of the interrupted Celery tasks.
+
+    Returns:
+        list: The IDs that did not stop on their own.
+    """
+    keys = {INTERRUPT_KEY.format(celery_task_id): celery_task_id for celery_task_id in celery_task_ids}
+    values = cache.get_many(keys.keys())
+
+    return [celery_task_id for key, celery_task_id in keys.items() if values.get(key) != ACKNOWLEDGED]
@@ -0,0 +1,178 @@
+###
+# General imports
+##
+
+## Default
+from collections import defaultdict
+
+## Django
+from django.db import models
+from django.db.models import Case, Count, Exists, F, Max, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+## Models
+from apps.task_app.models import Task, Job
+
+## Admission
+from apps.task_app.admission import ACTIVE_STATUSES
+
+
+###
+# Job Counters
+##
+
+def record_transitions(moves, status, fields):
+    """
+    Updates the counters of the jobs whose tasks were just moved, in one UPDATE.
+
+    - Must run in the transaction of the transition, so the counters commit (or roll
+      back) along with the statuses they describe.
+    - `last_task_status` only follows the job's latest task.
+
+    Args:
+        moves (list): The `(task, was_active)` pairs moved, `was_active` telling whether the
+            task was STARTING or RUNNING before.
+        status (str): The status the tasks were moved to.
+        fields (dict): The other Task fields written by the transition.
+    """
+    is_active = status in ACTIVE_STATUSES
+
+    deltas = defaultdict(int)
+    latest = {}
+    for task, was_active in moves:
+        if task.job_id is not None:
+            deltas[task.job_id] += int(is_active) - int(was_active)
+            latest[task.job_id] = max(task.id, latest.get(task.job_id, task.id))
+
+    if not deltas:
+        return
+
+    updates = {
+        # Unless a newer task of the job exists
+        'last_task_status': Case(
+            *[
+                When(Q(id=job_id) & ~Exists(Task.objects.filter(job_id=job_id, id__gt=task_id)), then=Value(status))
+                for job_id, task_id in latest.items()
+            ],
+            default=F('last_task_status'),
+            output_field=models.CharField(),
+        ),
+    }
+    if any(deltas.values()):
+        updates['running_count'] = F('running_count') + _per_job(deltas)
+    if status == Task.Status.FINISHED:
+        updates['last_run_at'] = fields.get('finished_at') or timezone.now()
+
+    Job.objects.filter(id__in=deltas).update(**updates)
+
+
+def record_created(tasks):
+    """
+    Counts newly created tasks in their jobs' counters, in one UPDATE.
+
+    Args:
+        tasks (list): The created tasks.
+    """
+    created = defaultdict(int)
+    active = defaultdict(int)
+    latest = {}
+    for task in tasks:
+        if task.job_id is None:
+            continue
+        created[task.job_id] += 1
+        active[task.job_id] += task.status in ACTIVE_STATUSES
+        if task.job_id not in latest or task.id > latest[task.job_id].id:
+            latest[task.job_id] = task
+
+    if not created:
+        return
+
+    Job.objects.filter(id__in=created).update(
+        total_tasks=F('total_tasks') + _per_job(created),
+        running_count=F('running_count') + _per_job(active),
+        last_task_status=Case(
+            *[When(id=job_id, then=Value(task.status)) for job_id, task in latest.items()],
+            output_field=models.CharField(),
+        ),
+    )
+
+
+def record_deleted(task):
+    """
+    Removes a deleted task from its job's counters.
+
+    Args:
+        task (Task): The deleted task.
+    """
+    if task.job_id is None:
+        return
+
+    Job.objects.filter(id=task.job_id).update(
+        total_tasks=F('total_tasks') - 1,
+        running_count=F('running_count') - int(task.status in ACTIVE_STATUSES),
+    )
+
+
+def repair_job_counters(job_ids=None):
+    """
+    Recomputes the counters of jobs from their tasks, e.g. to backfill them or fix a drift.
+
+    - A single UPDATE with correlated subqueries, so it never loads the tasks.
+
+    Args:
+        job_ids (list): The jobs to repair, None for all of them.
+
+    Returns:
+        int: The number of jobs repaired.
+    """
+    jobs = Job.objects.all()
+    if job_ids is not None:
+        jobs = jobs.filter(id__in=job_ids)
+
+    return jobs.update(**get_counter_values(Task))
+
+
+def get_counter_values(task_model):
+    """
+    Returns the expressions computing the counters of a job from its tasks, to pass to `update()`.
+
+    Args:
+        task_model (Model): The Task model, the historical one when called from a migration.
+
+    Returns:
+        dict: The counter expressions, by Job field.
+    """
+    tasks = task_model.objects.filter(job=OuterRef('pk')).order_by().values('job')
+
+    return {
+        'total_tasks': Coalesce(
+            Subquery(tasks.annotate(count=Count('id')).values('count'), output_field=models.IntegerField()),
+            0,
+        ),
+        'running_count': Coalesce(
+            Subquery(
+                tasks.annotate(count=Count('id', filter=Q(status__in=ACTIVE_STATUSES))).values('count'),
+                output_field=models.IntegerField(),
+            ),
+            0,
+        ),
+        'last_run_at': Subquery(
+            tasks.annotate(last=Max('finished_at', filter=Q(status=Task.Status.FINISHED))).values('last'),
+        ),
+        'last_task_status': Subquery(
+            task_model.objects.filter(job=OuterRef('pk')).order_by('-id').values('status')[:1],
+        ),
+    }
+
+
+###
+# Helper Functions
+##
+
+def _per_job(values):
+    return Case(
+        *[When(id=job_id, then=Value(value)) for job_id, value in values.items() if value],
+        default=Value(0),
+        output_field=models.IntegerField(),
+    )
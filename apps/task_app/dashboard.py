@@ -0,0 +1,105 @@
+###
+# General imports
+##
+
+## Default
+import logging
+from collections import defaultdict
+
+## Channels
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+## Models
+from apps.task_app.models import Job
+
+
+logger = logging.getLogger(__name__)
+
+# Groups the deltas are published to: a job and its tasks, and each task without a job
+JOB_GROUP = 'dashboard_job_{}'
+TASK_GROUP = 'dashboard_task_{}'
+
+# Fields sent in the deltas
+TASK_FIELDS = ('status', 'step', 'finished_at', 'stopped_at')
+JOB_FIELDS = ('running_count', 'total_tasks', 'last_task_status', 'last_run_at')
+
+
+###
+# Publishing
+##
+
+def publish_task_deltas(tasks, fields=TASK_FIELDS, deleted=False):
+    """
+    Publishes the state of tasks, and of their jobs, to the dashboard groups.
+
+    - One message per job, whatever the number of its tasks, with the job's counters
+      read in a single query for all jobs.
+    - Messages are `{'type': 'dashboard_deltas', 'job': <id or None>, 'tasks': {...}, 'jobs': {...}}`,
+      the consumers keeping the ids their clients subscribed to.
+
+    Args:
+        tasks (list): The tasks, as updated.
+        fields (tuple): The Task fields sent.
+        deleted (bool): Whether the tasks were deleted, sent as `{'deleted': True}`.
+    """
+    by_job = defaultdict(dict)
+    for task in tasks:
+        by_job[task.job_id][str(task.id)] = {'deleted': True} if deleted else get_delta(task, fields)
+
+    job_ids = [job_id for job_id in by_job if job_id is not None]
+    jobs = {job.id: get_delta(job, JOB_FIELDS) for job in Job.objects.filter(id__in=job_ids).only('id', *JOB_FIELDS)}
+
+    for job_id, task_deltas in by_job.items():
+        if job_id is None:
+            for task_id, delta in task_deltas.items():
+                _send(TASK_GROUP.format(task_id), None, {task_id: delta}, {})
+        else:
+            job = {str(job_id): jobs[job_id]} if job_id in jobs else {}
+            _send(JOB_GROUP.format(job_id), job_id, task_deltas, job)
+
+
+def publish_progress(task, step):
+    """
+    Publishes the step a task reached, e.g. on a checkpoint flush.
+
+    Args:
+        task (Task): The task.
+        step (int): The step reached.
+    """
+    if task.job_id is None:
+        _send(TASK_GROUP.format(task.id), None, {str(task.id): {'step': step}}, {})
+    else:
+        _send(JOB_GROUP.format(task.job_id), task.job_id, {str(task.id): {'step': step}}, {})
+
+
+def get_delta(instance, fields):
+    """
+    Returns fields of an instance as a JSON serializable dictionary.
+    """
+    delta = {}
+    for name in fields:
+        value = getattr(instance, name)
+        delta[name] = value.isoformat() if hasattr(value, 'isoformat') else value
+    return delta
+
+
+###
+# Helper Functions
+##
+
+def _send(group, job_id, tasks, jobs):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+
+    try:
+        async_to_sync(channel_layer.group_send)(group, {
+            'type': 'dashboard_deltas',
+            'job': job_id,
+            'tasks': tasks,
+            'jobs': jobs,
+        })
+    except Exception as e:
+        # Live updates are best effort, they never fail the operation that triggered them
+        logger.warning(f"Dropped dashboard deltas for {group}: {e}")
@@ -33,7 +33,7 @@
 
 ##
 #   Models
-from apps.task_app.models import Task, Job, ContentType, TimeCondition
+from apps.task_app.models import Task, Job, ContentType, TimeCondition, MaxRecordsCondition, ThroughputCondition
 from apps.user_app.models import User
 
 
@@ -46,6 +46,9 @@
 DAY_OF_MONTH_CHOICES = [('*', '*')] + [(str(i), str(i)) for i in range(1, 32)]
 MONTH_OF_YEAR_CHOICES = [('*', '*')] + [(str(i), str(i)) for i in range(1, 13)]
 
+# Conditions a job can stop on, the count and throughput ones are evaluated by the running task
+STOPPING_CONDITION_MODELS = ['timecondition', 'maxrecordscondition', 'throughputcondition']
+
 
 class TimeConditionForm(forms.ModelForm):
     
@@ -112,6 +115,9 @@ def save(self, commit=True):
         
 
 
+        # Reschedule from the new crontab
+        if instance.crontab_id != crontab.id:
+            instance.next_run_at = None
         instance.crontab = crontab
 
         if commit:
@@ -119,13 +125,38 @@ def save(self, commit=True):
         return instance
 
 
+class MaxRecordsConditionForm(forms.ModelForm):
+    class Meta:
+        model = MaxRecordsCondition
+        fields = ['max_records']
+        widgets = {
+            'max_records': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Enter the steps processed per run'}),
+        }
+
+
+class ThroughputConditionForm(forms.ModelForm):
+    class Meta:
+        model = ThroughputCondition
+        fields = ['min_throughput', 'window']
+        help_texts = {
+            'min_throughput': 'Minimum steps per second',
+            'window': 'Seconds over which the throughput is measured',
+        }
+        widgets = {
+            'min_throughput': forms.NumberInput(attrs={'class': 'form-control', 'step': 'any'}),
+            'window': forms.NumberInput(attrs={'class': 'form-control'}),
+        }
+
+
 class TaskForm(forms.ModelForm):
     class Meta:
         model = Task
-        fields = ['type',  'debug_mode']
+        fields = ['type',  'debug_mode', 'queue', 'priority']
         widgets = {
             'type': forms.Select(attrs={'class': 'form-select form-select-lg'}),
             'debug_mode': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+            'queue': forms.Select(attrs={'class': 'form-select form-select-lg'}),
+            'priority': forms.Select(attrs={'class': 'form-select form-select-lg'}),
         }
     
     def __init__(self, *args, **kwargs):
@@ -145,11 +176,13 @@ class TaskEditForm(forms.ModelForm):
 
     class Meta:
         model = Task
-        fields = ['log_path', 'job', 'debug_mode', 'step']
+        fields = ['log_path', 'job', 'debug_mode', 'step', 'queue', 'priority']
         widgets = {
             'log_path': forms.TextInput(attrs={'class': 'form-control'}),
             'debug_mode': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
             'step': forms.NumberInput(attrs={'class': 'form-control'}),
+            'queue': forms.Select(attrs={'class': 'form-select form-select-lg'}),
+            'priority': forms.Select(attrs={'class': 'form-select form-select-lg'}),
         }
 
     
@@ -210,13 +243,17 @@ def save(self, commit=True):
             if self.errors:
                 return old_instance
             
+        # The status is only changed through its transition, not by the save itself
+        status = instance.status
+        instance.status = old_instance.status
+
         # Commit the changes
         if commit:
             instance.save()
         
         # Change the status if it has changed, to reflect the new status
-        if self.instance.status != old_instance.status:
-            self.instance.change_status(self.instance.status)
+        if status != old_instance.status:
+            self.instance.change_status(status)
             
         return instance
 
@@ -237,7 +274,7 @@ class JobForm(forms.ModelForm):
     
     stopping_condition_type = forms.ModelChoiceField(
         queryset = ContentType.objects.filter(
-            Q(app_label='task_app', model='timecondition')
+            Q(app_label='task_app', model__in=STOPPING_CONDITION_MODELS)
         ),
         required=False,
         label='Stopping Condition Type',
@@ -249,12 +286,17 @@ class JobForm(forms.ModelForm):
 
     class Meta:
         model = Job
-        fields = ['name', 'type',  'starting_condition_type', 'stopping_condition_type','continue_mode']
+        fields = ['name', 'type',  'starting_condition_type', 'stopping_condition_type','continue_mode', 'queue', 'priority', 'max_concurrency', 'overflow_policy', 'log_retention_days']
         widgets = {
             'name': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Enter the name of the job'}),
             'type': forms.Select(attrs={'class': 'form-select form-select-lg'}),
             'parent_task': forms.Select(attrs={'class': 'form-select form-select-lg'}),
             'continue_mode': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+            'queue': forms.Select(attrs={'class': 'form-select form-select-lg'}),
+            'priority': forms.Select(attrs={'class': 'form-select form-select-lg'}),
+            'max_concurrency': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Enter the maximum concurrent tasks'}),
+            'overflow_policy': forms.Select(attrs={'class': 'form-select form-select-lg'}),
+            'log_retention_days': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Enter the days logs are kept'}),
         }
         
 
@@ -268,7 +310,7 @@ def __init__(self, *args, **kwargs):
             Q(app_label='task_app', model='timecondition')
         )
         self.fields['stopping_condition_type'].queryset = ContentType.objects.filter(
-            Q(app_label='task_app', model='timecondition') 
+            Q(app_label='task_app', model__in=STOPPING_CONDITION_MODELS) 
         )
     
     def save(self,starting_condition_form = None,stopping_condition_form = None, created_by = None, *args, **kwargs):
@@ -286,7 +328,13 @@ def save(self,starting_condition_form = None,stopping_condition_form = None, cre
         if stopping_condition_form:
             job.stopping_condition = stopping_condition_form.save()
         
-        # Call the original save method
-        job.save()
+        # Call the original save method, an update leaving the counters to their UPDATEs
+        if job._state.adding:
+            job.save()
+        else:
+            job.save(update_fields=[
+                field.name for field in job._meta.concrete_fields
+                if not field.primary_key and field.name not in Job.COUNTER_FIELDS
+            ])
     
         return job
\ No newline at end of file
@@ -19,23 +19,47 @@
 
 
 
+from apps.task_app.log_files import SegmentedFileHandler
+from apps.task_app.log_channels import ChannelLayerLogHandler
+
+# Suffix of log directories waiting to be removed
+DELETED_LOG_DIR_SUFFIX = '.deleted-'
+
+
 """ Main Datbase """
 
 
     
     
-def delete_task_logs(task):
-    
-    if task.log_path:
+def delete_task_logs(*tasks):
+    """
+    Deletes the log directories of tasks, in the background.
+
+    - The directories are renamed right away (cheap), so a relaunched task logs into a new one,
+      and removed by a Celery task once the transaction commits.
+    - Renamed directories left behind (e.g. rolled back transaction) are removed by the log purge.
+    """
+    from django.db import transaction
+    from apps.task_app.tasks import _delete_log_dirs
+
+    trashed = []
+    for task in tasks:
+        if not task.log_path:
+            continue
+
         directory_path = path.dirname(task.log_path)
-        
         if path.exists(directory_path):
-            shutil.rmtree(directory_path)
+            trash_path = f'{directory_path}{DELETED_LOG_DIR_SUFFIX}{uuid.uuid4().hex}'
+            rename(directory_path, trash_path)
+            trashed.append(trash_path)
+
+    if trashed:
+        transaction.on_commit(lambda: _delete_log_dirs.delay(trashed))
 
     
     
     
-def configure_logging(log_folder):
+def configure_logging(log_folder, group=None):
     # Create the log folder if it doesn't exist
     makedirs(log_folder, exist_ok=True)
     
@@ -47,15 +71,17 @@ def configure_logging(log_folder):
     # Get the logger instance
     logger = logging.getLogger(__name__)
     
-    # Clear existing handlers to prevent duplication
+    # Clear existing handlers to prevent duplication, publishing the lines still buffered
     if logger.hasHandlers():
+        for handler in logger.handlers:
+            handler.close()
         logger.handlers.clear()
     
-    # Create different handlers for different log levels
-    info_handler = logging.FileHandler(info_log_filename)
+    # Create different handlers for different log levels, rolling over into compressed segments
+    info_handler = SegmentedFileHandler(info_log_filename)
     info_handler.setLevel(logging.INFO)
 
-    error_handler = logging.FileHandler(error_log_filename)
+    error_handler = SegmentedFileHandler(error_log_filename)
     error_handler.setLevel(logging.ERROR)
 
     # Define the logging format and add it to handlers
@@ -69,6 +95,12 @@ def configure_logging(log_folder):
     # Add handlers to the logger
     logger.addHandler(info_handler)
     logger.addHandler(error_handler)
+
+    # Publish the info log to the WebSocket group, after the file handler so lines carry their offsets
+    if group:
+        channel_handler = ChannelLayerLogHandler(group, file_handler=info_handler, level=logging.INFO)
+        channel_handler.setFormatter(formatter)
+        logger.addHandler(channel_handler)
     
     return logger, info_log_filename
 
@@ -77,7 +109,7 @@ def configure_job_logging(job):
     log_folder = settings.JOBS_LOG_DIR / str( job.id)
     
     # Configure the logging
-    logger, log_info_path = configure_logging(log_folder)
+    logger, log_info_path = configure_logging(log_folder, group=f"job_{job.id}")
 
     return logger, log_info_path
 
@@ -89,6 +121,6 @@ def configure_task_logging(task):
     log_folder = settings.TASKS_LOG_DIR / str( task.id)
     
     # Configure the logging
-    logger, log_info_path = configure_logging(log_folder)
+    logger, log_info_path = configure_logging(log_folder, group=f"task_{task.id}")
 
     return logger, log_info_path
@@ -0,0 +1,122 @@
+###
+# General imports
+##
+
+## Default
+import logging
+import threading
+
+## Django
+from django.conf import settings
+
+## Channels
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+
+logger = logging.getLogger(__name__)
+
+
+###
+# Log Publishing
+##
+
+class ChannelLayerLogHandler(logging.Handler):
+    """
+    Publishes the lines of a log to a channel-layer group, for the log consumers of every node to relay.
+
+    - Paired with the SegmentedFileHandler writing the log, each line carries the byte offset
+      of the log it ends at, as the lines read from the file do.
+    - Lines are batched, published `LOG_PUBLISH_INTERVAL` seconds after the first one was
+      buffered, or as soon as `LOG_PUBLISH_BATCH_BYTES` are.
+    - A batch the channel layer refuses is dropped, never failing the task.
+
+    Messages are `{'type': 'log_lines', 'lines': [[line, offset], ...]}`.
+    """
+
+    def __init__(self, group, file_handler=None, level=logging.NOTSET):
+        """
+        Args:
+            group (str): The channel-layer group, e.g. `task_<id>` or `job_<id>`.
+            file_handler (SegmentedFileHandler): The handler writing the same records to the log file.
+            level (int): The level of the records published.
+        """
+        super().__init__(level)
+        self.group = group
+        self.file_handler = file_handler
+        self.buffer = []
+        self.size = 0
+        self.timer = None
+
+    def emit(self, record):
+        try:
+            text = self.format(record) + '\n'
+        except Exception:
+            self.handleError(record)
+            return
+
+        end = self.file_handler.offset if self.file_handler is not None else None
+        self.buffer += _split_lines(text, end)
+        self.size += len(text)
+
+        if self.size >= settings.LOG_PUBLISH_BATCH_BYTES:
+            self.flush()
+        elif self.timer is None:
+            self.timer = threading.Timer(settings.LOG_PUBLISH_INTERVAL, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            lines, self.buffer, self.size = self.buffer, [], 0
+        finally:
+            self.release()
+
+        if lines:
+            publish_log_lines(self.group, lines)
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+def publish_log_lines(group, lines):
+    """
+    Sends lines of a log to a channel-layer group.
+
+    Args:
+        group (str): The channel-layer group.
+        lines (list): The `(line, offset)` pairs.
+    """
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+
+    try:
+        async_to_sync(channel_layer.group_send)(group, {
+            'type': 'log_lines',
+            'lines': [[line, offset] for line, offset in lines],
+        })
+    except Exception as e:
+        logger.warning(f"Dropped {len(lines)} log lines for {group}: {e}")
+
+
+###
+# Helper Functions
+##
+
+def _split_lines(text, end):
+    # A record may span several lines (e.g. tracebacks), each ending at its own offset
+    lines = text.splitlines(keepends=True)
+    if end is None:
+        return [(line, None) for line in lines]
+
+    pairs = []
+    for line in reversed(lines):
+        pairs.insert(0, (line, end))
+        end -= len(line.encode())
+    return pairs
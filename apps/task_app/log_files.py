@@ -0,0 +1,439 @@
+###
+# General imports
+##
+
+## Default
+import gzip
+import os
+import re
+import shutil
+import struct
+import time
+from collections import namedtuple
+from logging.handlers import RotatingFileHandler
+
+## Django
+from django.conf import settings
+
+
+# Text of a byte range of a log, `start` and `end` being byte offsets
+LogChunk = namedtuple('LogChunk', ['text', 'start', 'end'])
+
+# A file holding the bytes [start, end) of a log, the live file or a rolled segment
+Segment = namedtuple('Segment', ['start', 'end', 'path'])
+
+# Bytes read per seek when looking for the last lines
+BLOCK_SIZE = 8 * 1024
+
+# Rolled segments are named after the log and the offset they start at, e.g. info__01_01_2025.log.000000010485760.gz
+SEGMENT_OFFSET_DIGITS = 15
+
+
+###
+# Log Writing
+##
+
+class SegmentedFileHandler(RotatingFileHandler):
+    """
+    File handler rolling the log over into a gzip compressed segment once it reaches `max_bytes`.
+
+    - Segments are named after the byte offset of the log they start at, so offsets stay
+      stable when older segments are purged, and readers can follow the log across them.
+    - Several processes may write the same log (chunked tasks), a process reopens the
+      log when another one rolled it over.
+
+    Attributes:
+        offset (int): The offset of the log the last record written ends at.
+    """
+
+    def __init__(self, filename, max_bytes=None, **kwargs):
+        self.live_start = 0
+        super().__init__(filename, maxBytes=max_bytes or settings.LOG_MAX_BYTES, **kwargs)
+
+    @property
+    def offset(self):
+        if self.stream is None:
+            return None
+        return self.live_start + self.stream.tell()
+
+    def _open(self):
+        stream = super()._open()
+        self.live_start = get_live_start(self.baseFilename)
+        return stream
+
+    def emit(self, record):
+        self._reopen_if_rolled()
+        super().emit(record)
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if os.path.isfile(self.baseFilename) and os.path.getsize(self.baseFilename):
+            rolled = f'{self.baseFilename}.{get_live_start(self.baseFilename):0{SEGMENT_OFFSET_DIGITS}d}'
+            os.rename(self.baseFilename, rolled)
+            compress_segment(rolled)
+
+        if not self.delay:
+            self.stream = self._open()
+
+    def _reopen_if_rolled(self):
+        if self.stream is None:
+            return
+        try:
+            rolled = os.stat(self.baseFilename).st_ino != os.fstat(self.stream.fileno()).st_ino
+        except FileNotFoundError:
+            rolled = True
+        if rolled:
+            self.stream.close()
+            self.stream = self._open()
+
+
+def compress_segment(path):
+    """
+    Compresses a rolled segment with gzip, readers never seeing a partial `.gz` file.
+
+    Args:
+        path (str): The uncompressed segment, removed once compressed.
+
+    Returns:
+        str: The compressed segment.
+    """
+    compressed = f'{path}.gz'
+    with open(path, 'rb') as source, gzip.open(f'{compressed}.tmp', 'wb') as target:
+        shutil.copyfileobj(source, target)
+    os.replace(f'{compressed}.tmp', compressed)
+    os.remove(path)
+    return compressed
+
+
+###
+# Segments
+##
+
+def list_segments(path):
+    """
+    Returns the files a log is made of, oldest first, the live file last.
+
+    Args:
+        path (str): The live log file.
+
+    Returns:
+        list: The Segments, with the byte offsets of the log they hold.
+    """
+    directory, name = os.path.split(path)
+    pattern = re.compile(rf'^{re.escape(name)}\.(\d{{{SEGMENT_OFFSET_DIGITS}}})(\.gz)?$')
+
+    segments = []
+    if os.path.isdir(directory):
+        for entry in os.listdir(directory):
+            match = pattern.match(entry)
+            if match:
+                segment_path = os.path.join(directory, entry)
+                start = int(match.group(1))
+                segments.append(Segment(start, start + _get_segment_size(segment_path), segment_path))
+    segments.sort()
+
+    if os.path.isfile(path):
+        start = segments[-1].end if segments else 0
+        segments.append(Segment(start, start + os.path.getsize(path), path))
+    return segments
+
+
+def get_live_start(path):
+    """
+    Returns the byte offset of the log the live file starts at, i.e. the end of the last rolled segment.
+    """
+    rolled = [segment for segment in list_segments(path) if segment.path != path]
+    return rolled[-1].end if rolled else 0
+
+
+###
+# Log Reading
+##
+
+def read_tail(path, lines=None):
+    """
+    Returns the last complete lines of a log, reading its last file backwards from the end.
+
+    - Only reads the blocks holding these lines, whatever the size of the log.
+    - A line still being written is left out, `end` being where the WebSocket stream continues.
+    - Right after a rollover the live file may hold fewer lines, earlier ones being loaded
+      from the segments with `read_range`. Once the live file was compressed (idle log),
+      the lines are read from the last segment.
+
+    Args:
+        path (str): The live log file.
+        lines (int): The number of lines, `LOG_TAIL_LINES` by default.
+
+    Returns:
+        LogChunk: The lines, None if the log does not exist.
+    """
+    lines = lines or settings.LOG_TAIL_LINES
+    if not path:
+        return None
+
+    segments = list_segments(path)
+    if not segments:
+        return None
+    segment = segments[-1]
+
+    with _open_segment(segment.path) as log_file:
+        data = b''
+        position = segment.end - segment.start
+        # One more newline than lines, to know where the first line starts
+        while position > 0 and data.count(b'\n') <= lines:
+            step = min(BLOCK_SIZE, position)
+            position -= step
+            log_file.seek(position)
+            data = log_file.read(step) + data
+
+    # Leave out the line still being written
+    end = position + data.rfind(b'\n') + 1
+    data = data[:end - position]
+
+    # Keep the last lines, i.e. after the (lines + 1)th newline from the end
+    newline = len(data) - 1
+    for _ in range(lines):
+        newline = data.rfind(b'\n', 0, newline)
+        if newline < 0:
+            break
+    start = position + newline + 1
+
+    return LogChunk(data[start - position:].decode(errors='replace'), segment.start + start, segment.start + end)
+
+
+def read_range(path, before, max_bytes=None):
+    """
+    Returns the complete lines of a log ending at a byte offset, e.g. to load earlier lines.
+
+    - Reads from the segment holding the offset, compressed or not, so earlier lines are
+      found across rollovers. Lines never span two segments.
+    - Once there is nothing earlier (start of the log, or purged segments), `start` is 0.
+
+    Args:
+        path (str): The live log file.
+        before (int): The offset the lines end at, i.e. the `start` of the lines already shown.
+        max_bytes (int): The maximum bytes read, `LOG_RANGE_BYTES` by default.
+
+    Returns:
+        LogChunk: The lines, None if the log does not exist.
+    """
+    max_bytes = max_bytes or settings.LOG_RANGE_BYTES
+    if not path:
+        return None
+
+    segments = list_segments(path)
+    if not segments:
+        return None
+
+    before = min(max(before, 0), segments[-1].end)
+    segment = next((segment for segment in segments if segment.start < before <= segment.end), None)
+    if segment is None:
+        return LogChunk('', 0, before)
+
+    end = before
+    start = max(end - max_bytes, segment.start)
+    with _open_segment(segment.path) as log_file:
+        log_file.seek(start - segment.start)
+        data = log_file.read(end - start)
+
+    # Start at a line boundary, unless a single line fills the whole range
+    if start > segment.start:
+        newline = data.find(b'\n')
+        if 0 <= newline < len(data) - 1:
+            data = data[newline + 1:]
+            start += newline + 1
+
+    return LogChunk(data.decode(errors='replace'), start, end)
+
+
+def read_lines_after(path, offset, max_bytes=None):
+    """
+    Returns the complete lines written to a log after a byte offset, across rollovers.
+
+    Args:
+        path (str): The live log file.
+        offset (int): The offset of the log the lines start at.
+        max_bytes (int): The maximum bytes replayed, only the last lines being returned past it.
+
+    Returns:
+        list: The `(line, offset)` pairs, `offset` being the byte offset of the log the line ends at.
+    """
+    partial = False
+    if max_bytes is not None:
+        segments = list_segments(path)
+        end = segments[-1].end if segments else 0
+        if end - offset > max_bytes:
+            offset = end - max_bytes
+            partial = True
+
+    follower = LogFollower(path, offset)
+    try:
+        lines = []
+        while True:
+            read = follower.read_lines()
+            if not read:
+                # The first line may start before the offset
+                return lines[1:] if partial else lines
+            lines += read
+    finally:
+        follower.close()
+
+
+class LogFollower:
+    """
+    Follows the complete lines appended to a log from a byte offset, across rollovers.
+
+    Usage:
+        follower = LogFollower(task.log_path, offset)
+        for line, offset in follower.read_lines():
+            ...
+        follower.close()
+
+    Attributes:
+        offset (int): The offset of the log the lines returned so far end at.
+    """
+
+    def __init__(self, path, offset=None):
+        """
+        Args:
+            path (str): The live log file.
+            offset (int): The offset of the log to follow from, None or out of the live file for its end.
+        """
+        self.path = path
+        self.log_file = open(path, 'rb')
+        self.base = get_live_start(path)
+        self.pending = []
+
+        size = self.log_file.seek(0, os.SEEK_END)
+        if offset is not None and self.base <= offset <= self.base + size:
+            self.log_file.seek(offset - self.base)
+        elif offset is not None and 0 <= offset < self.base:
+            # Rolled over since the offset was read, start with the rolled lines
+            self.pending = self._read_segments(offset)
+            self.log_file.seek(0)
+
+        self.offset = offset if self.pending else self.base + self.log_file.tell()
+
+    def read_lines(self):
+        """
+        Returns the complete lines appended since the last call.
+
+        Returns:
+            list: The `(line, offset)` pairs, `offset` being the byte offset of the log the line ends at.
+        """
+        lines, self.pending = self.pending + self._read_complete_lines(), []
+
+        # Rolled over: finish the rolled file, then continue at the start of the new one
+        if not lines and self._rolled():
+            lines = self._read_complete_lines()
+            end = self.base + self.log_file.seek(0, os.SEEK_END)
+            self.log_file.close()
+            self.log_file = open(self.path, 'rb')
+            self.base = get_live_start(self.path)
+
+            # Rolled over more than once since the last read
+            if end < self.base:
+                lines += self._read_segments(end)
+            lines += self._read_complete_lines()
+
+        if lines:
+            self.offset = lines[-1][1]
+        return lines
+
+    def close(self):
+        self.log_file.close()
+
+    def _read_complete_lines(self):
+        lines = []
+        while True:
+            position = self.log_file.tell()
+            line = self.log_file.readline()
+            if not line.endswith(b'\n'):
+                # Wait for the line being written to be complete
+                self.log_file.seek(position)
+                return lines
+            lines.append((line.decode(errors='replace'), self.base + self.log_file.tell()))
+
+    def _read_segments(self, offset):
+        lines = []
+        for segment in list_segments(self.path):
+            if segment.path == self.path or segment.end <= offset:
+                continue
+            with _open_segment(segment.path) as log_file:
+                log_file.seek(max(offset - segment.start, 0))
+                position = segment.start + log_file.tell()
+                for line in log_file:
+                    position += len(line)
+                    lines.append((line.decode(errors='replace'), position))
+        return lines
+
+    def _rolled(self):
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self.log_file.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+
+###
+# Retention
+##
+
+def purge_log_dir(directory, cutoff, keep=()):
+    """
+    Applies the retention policy to a log directory.
+
+    - Removes the files not written since `cutoff`.
+    - Compresses the other logs no longer written (e.g. the logs of previous days), as
+      the first segment of their log.
+    - Removes the directory once empty.
+
+    Args:
+        directory (str): The log directory.
+        cutoff (float): Timestamp before which files are removed.
+        keep (list): Live log files never compressed.
+
+    Returns:
+        int: The number of files removed.
+    """
+    keep = {os.path.abspath(path) for path in keep if path}
+    idle = time.time() - settings.LOG_IDLE_SECONDS
+    removed = 0
+
+    for entry in os.listdir(directory):
+        path = os.path.abspath(os.path.join(directory, entry))
+        if not os.path.isfile(path):
+            continue
+
+        modified = os.path.getmtime(path)
+        if modified < cutoff:
+            os.remove(path)
+            removed += 1
+        elif path.endswith('.log') and path not in keep and modified < idle:
+            rolled = f'{path}.{get_live_start(path):0{SEGMENT_OFFSET_DIGITS}d}'
+            os.rename(path, rolled)
+            compress_segment(rolled)
+
+    if not os.listdir(directory):
+        os.rmdir(directory)
+    return removed
+
+
+###
+# Helper Functions
+##
+
+def _open_segment(path):
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+
+def _get_segment_size(path):
+    if not path.endswith('.gz'):
+        return os.path.getsize(path)
+
+    # gzip trailer: uncompressed size modulo 2^32, segments being much smaller
+    with open(path, 'rb') as segment:
+        segment.seek(-4, os.SEEK_END)
+        return struct.unpack('<I', segment.read(4))[0]
@@ -0,0 +1,115 @@
+###
+# General imports
+##
+
+## Default
+import os
+import shutil
+from datetime import timedelta
+
+## Django
+from django.conf import settings
+from django.utils import timezone
+
+## Models
+from apps.task_app.models import Task, Job
+
+## Admission
+from apps.task_app.admission import ACTIVE_STATUSES
+
+## Logs
+from apps.task_app.functions import DELETED_LOG_DIR_SUFFIX
+from apps.task_app.log_files import purge_log_dir
+
+
+# Task log directories looked up per query
+BATCH_SIZE = 1000
+
+
+###
+# Log Retention
+##
+
+def purge_logs(now=None):
+    """
+    Applies the log retention policy to every job and task log directory.
+
+    - A directory keeps the files written in the last `log_retention_days` of its job,
+      `LOG_RETENTION_DAYS` for tasks without a job and for deleted jobs.
+    - Logs no longer written are compressed, see `purge_log_dir`.
+    - Directories of deleted tasks, and those renamed by `delete_task_logs`, are removed.
+
+    Args:
+        now (datetime): Reference time, now by default.
+
+    Returns:
+        int: The number of files and directories removed.
+    """
+    now = now or timezone.now()
+    removed = 0
+
+    # Jobs
+    jobs = {job_id: (log_path, retention) for job_id, log_path, retention in Job.objects.values_list('id', 'log_path', 'log_retention_days')}
+    for name in _list_dirs(settings.JOBS_LOG_DIR):
+        log_path, retention = jobs.get(_parse_id(name), (None, None))
+        removed += purge_log_dir(os.path.join(settings.JOBS_LOG_DIR, name), _get_cutoff(now, retention), keep=[log_path])
+
+    # Tasks
+    names = []
+    for name in _list_dirs(settings.TASKS_LOG_DIR):
+        if DELETED_LOG_DIR_SUFFIX in name:
+            shutil.rmtree(os.path.join(settings.TASKS_LOG_DIR, name), ignore_errors=True)
+            removed += 1
+        elif _parse_id(name) is not None:
+            names.append(name)
+
+    for offset in range(0, len(names), BATCH_SIZE):
+        batch = names[offset:offset + BATCH_SIZE]
+        tasks = {
+            task_id: (log_path, status, retention)
+            for task_id, log_path, status, retention in Task.objects.filter(id__in=[_parse_id(name) for name in batch])
+            .values_list('id', 'log_path', 'status', 'job__log_retention_days')
+        }
+
+        for name in batch:
+            directory = os.path.join(settings.TASKS_LOG_DIR, name)
+            if _parse_id(name) not in tasks:
+                shutil.rmtree(directory, ignore_errors=True)
+                removed += 1
+                continue
+
+            log_path, status, retention = tasks[_parse_id(name)]
+            keep = [log_path] if status in ACTIVE_STATUSES else []
+            removed += purge_log_dir(directory, _get_cutoff(now, retention), keep=keep)
+
+    return removed
+
+
+def delete_log_dirs(paths):
+    """
+    Removes log directories, e.g. those renamed by `delete_task_logs`.
+
+    Args:
+        paths (list): The directories.
+    """
+    for directory in paths:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+###
+# Helper Functions
+##
+
+def _get_cutoff(now, retention_days):
+    days = retention_days if retention_days is not None else settings.LOG_RETENTION_DAYS
+    return (now - timedelta(days=days)).timestamp()
+
+
+def _list_dirs(directory):
+    if not os.path.isdir(directory):
+        return []
+    return [entry.name for entry in os.scandir(directory) if entry.is_dir()]
+
+
+def _parse_id(name):
+    return int(name) if name.isdigit() else None
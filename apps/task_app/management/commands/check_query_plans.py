@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.task_app.query_plans import LIST_QUERIES, explain_queries, find_seq_scans, get_large_tables
+
+
+class Command(BaseCommand):
+    """
+    Django management command running EXPLAIN on the registered Task and Job list queries.
+
+    Fails if a query reads a large table with a sequential scan, i.e. is missing an index.
+
+    Usage:
+      - To check every list query against the tables of 10000+ rows:
+        python manage.py check_query_plans
+
+      - To check on a small database (e.g. in CI), with sequential scans disabled in the planner:
+        python manage.py check_query_plans --no-seqscan
+
+      - To print the plans of some queries:
+        python manage.py check_query_plans --queries task_table job_tasks -v 2
+    """
+
+    help = 'Fail if a Task or Job list query plans a sequential scan on a large table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', nargs='+', choices=sorted(LIST_QUERIES), help='Queries to check, all by default')
+        parser.add_argument('--min-rows', type=int, default=10000, help='Estimated rows from which a table is large')
+        parser.add_argument('--no-seqscan', action='store_true', help='Disable sequential scans in the planner and check every table')
+
+    def handle(self, *args, **kwargs):
+        if connection.vendor != 'postgresql':
+            raise CommandError(f'Query plans are only checked on PostgreSQL, not {connection.vendor}')
+
+        seqscan = not kwargs['no_seqscan']
+        tables = get_large_tables(kwargs['min_rows']) if seqscan else None
+
+        failures = []
+        for name, plan in explain_queries(kwargs['queries'], seqscan=seqscan).items():
+            if kwargs['verbosity'] >= 2:
+                self.stdout.write(f'{name}:\n{plan}\n')
+
+            scanned = find_seq_scans(plan, tables)
+            if scanned:
+                failures.append(f"{name}: sequential scan on {', '.join(scanned)}")
+            else:
+                self.stdout.write(f'{name}: OK')
+
+        if failures:
+            raise CommandError('\n'.join(failures))
+
+        self.stdout.write(self.style.SUCCESS('All query plans use indexes'))
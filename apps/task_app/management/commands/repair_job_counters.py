@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from apps.task_app.models import Job
+from apps.task_app.counters import repair_job_counters
+
+
+class Command(BaseCommand):
+    """
+    Django management command recomputing the denormalized counters of jobs from their tasks.
+
+    Used to backfill the counters once, and to fix any drift later on (e.g. tasks
+    moved between jobs by hand).
+
+    Usage:
+      - To repair every job, in batches:
+        python manage.py repair_job_counters
+
+      - To repair some jobs only:
+        python manage.py repair_job_counters --ids 1 2 3
+    """
+
+    help = 'Recompute the last run and task counters of jobs from their tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ids', type=int, nargs='+', help='IDs of the jobs to repair, all jobs by default')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Jobs repaired per UPDATE statement')
+
+    def handle(self, *args, **kwargs):
+        job_ids = kwargs['ids'] or list(Job.objects.order_by('id').values_list('id', flat=True))
+        batch_size = kwargs['batch_size']
+
+        repaired = 0
+        for offset in range(0, len(job_ids), batch_size):
+            repaired += repair_job_counters(job_ids[offset:offset + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f'{repaired} jobs repaired'))
@@ -0,0 +1,37 @@
+# Generated by Django 5.0 on 2026-10-17 18:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_app', '0024_remove_task_sql_file'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('index', models.PositiveIntegerField()),
+                ('start', models.IntegerField()),
+                ('end', models.IntegerField()),
+                ('step', models.IntegerField()),
+                ('status', models.CharField(choices=[('STARTING', 'Starting'), ('PAUSED', 'Paused'), ('RUNNING', 'Running'), ('CANCELED', 'Canceled'), ('STOPPED', 'Stopped'), ('FAILED', 'Failed'), ('FINISHED', 'Finished')], default='STARTING', max_length=10)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('celery_task_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='task_app.task')),
+            ],
+            options={
+                'ordering': ['index'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='taskchunk',
+            constraint=models.UniqueConstraint(fields=('task', 'index'), name='unique_task_chunk_index'),
+        ),
+    ]
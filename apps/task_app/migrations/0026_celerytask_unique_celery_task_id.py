@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-17 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_app', '0025_taskchunk'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='celerytask',
+            name='celery_task_id',
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+    ]
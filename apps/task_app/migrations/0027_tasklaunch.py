@@ -0,0 +1,29 @@
+# Generated by Django 5.0 on 2026-10-17 18:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_app', '0026_celerytask_unique_celery_task_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskLaunch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('celery_task_id', models.CharField(max_length=255, unique=True)),
+                ('continue_mode', models.BooleanField(default=False)),
+                ('dispatched_at', models.DateTimeField(blank=True, null=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='launches', to='task_app.task')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('dispatched_at', None)), fields=['created_at'], name='task_launch_pending_idx')],
+            },
+        ),
+    ]
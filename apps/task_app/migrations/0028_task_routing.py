@@ -0,0 +1,43 @@
+# Generated by Django 5.0 on 2026-10-17 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_app', '0027_tasklaunch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='priority',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(0, 'High'), (3, 'Normal'), (6, 'Low')], null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='queue',
+            field=models.CharField(blank=True, choices=[('tasks_short', 'Short tasks'), ('tasks_long', 'Long tasks')], max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='priority',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(0, 'High'), (3, 'Normal'), (6, 'Low')], null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='queue',
+            field=models.CharField(blank=True, choices=[('tasks_short', 'Short tasks'), ('tasks_long', 'Long tasks')], max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='tasklaunch',
+            name='priority',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='tasklaunch',
+            name='queue',
+            field=models.CharField(blank=True, max_length=32, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0 on 2026-10-17 18:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_app', '0028_task_routing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='max_concurrency',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='overflow_policy',
+            field=models.CharField(choices=[('QUEUE', 'Queue the launch until a task ends'), ('SKIP', 'Skip the launch'), ('COALESCE', 'Keep at most one queued launch')], default='SKIP', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='queued_launches',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0 on 2026-10-17 19:01
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def delete_condition_periodic_tasks(apps, schema_editor):
+    # The conditions are fired by the time condition dispatcher from now on
+    TimeCondition = apps.get_model('task_app', 'TimeCondition')
+    PeriodicTask = apps.get_model('django_celery_beat', 'PeriodicTask')
+    PeriodicTasks = apps.get_model('django_celery_beat', 'PeriodicTasks')
+
+    periodic_task_ids = list(TimeCondition.objects.exclude(periodic_task=None).values_list('periodic_task_id', flat=True))
+    TimeCondition.objects.update(periodic_task=None)
+    PeriodicTask.objects.filter(id__in=periodic_task_ids).delete()
+
+    # Let Beat know its schedule changed
+    PeriodicTasks.objects.update_or_create(ident=1, defaults={'last_update': timezone.now()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('django_celery_beat', '0019_alter_periodictasks_options'),
+        ('task_app', '0029_job_admission'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_condition_periodic_tasks, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='timecondition',
+            name='periodic_task',
+        ),
+        migrations.AddField(
+            model_name='timecondition',
+            name='next_run_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['starting_condition_type', 'starting_condition_id'], name='job_starting_condition_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['stopping_condition_type', 'stopping_condition_id'], name='job_stopping_condition_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timecondition',
+            index=models.Index(fields=['next_run_at'], name='time_condition_next_run_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0 on 2026-10-17 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_app', '0030_time_condition_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaxRecordsCondition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('max_records', models.PositiveIntegerField()),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ThroughputCondition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('min_throughput', models.FloatField()),
+                ('window', models.PositiveIntegerField(default=60)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0 on 2026-10-17 19:08
+
+from django.db import migrations, models
+
+
+def backfill_job_counters(apps, schema_editor):
+    # Same computation as `counters.repair_job_counters`, on the historical models
+    from apps.task_app.counters import get_counter_values
+
+    Job = apps.get_model('task_app', 'Job')
+    Task = apps.get_model('task_app', 'Task')
+    Job.objects.update(**get_counter_values(Task))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_app', '0031_count_and_throughput_conditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='last_run_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='last_task_status',
+            field=models.CharField(blank=True, max_length=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='running_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='total_tasks',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_job_counters, migrations.RunPython.noop),
+    ]
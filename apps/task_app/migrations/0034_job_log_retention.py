@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-17 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_app', '0033_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='log_retention_days',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
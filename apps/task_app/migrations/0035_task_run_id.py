@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-17 19:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task_app', '0034_job_log_retention'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='run_id',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
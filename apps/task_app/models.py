@@ -2,21 +2,18 @@
 # General imports
 ##
 
-## Default
-import json
-
 ## Django
 from django.db import models
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.prefetch import GenericPrefetch
 
 ## Celery
-from celery.result import AsyncResult
 from celery.app.control import Control
 
 ## Django Celery Beat
-from django_celery_beat.models import CrontabSchedule, PeriodicTask, IntervalSchedule
+from django_celery_beat.models import CrontabSchedule
 
 ### App-specific imports
 
@@ -29,6 +26,9 @@
 from apps.task_app.functions import delete_task_logs
 from config.celery import app
 
+## Conditions
+from apps.task_app.conditions import MaxRecordsEvaluator, ThroughputEvaluator
+
 ### Models
 
 class BaseTask(BaseModel):
@@ -37,6 +37,8 @@ class BaseTask(BaseModel):
 
     Attributes:
         type (str): The type of task, chosen from 'EMPTY', 'SMALL', 'MEDIUM', or 'LARGE'.
+        queue (str): Celery queue the task is sent to, None to route it by type.
+        priority (int): Priority within the queue, None to use the type's priority.
     """
 
     class TaskType(models.TextChoices):
@@ -46,12 +48,24 @@ class TaskType(models.TextChoices):
         LARGE = 'LARGE', 'Large'
         FAILURE = 'FAILURE', 'Failure'
     
+    class Queue(models.TextChoices):
+        SHORT = 'tasks_short', 'Short tasks'
+        LONG = 'tasks_long', 'Long tasks'
+
+    class Priority(models.IntegerChoices):
+        # Redis transport: lower values are consumed first
+        HIGH = 0, 'High'
+        NORMAL = 3, 'Normal'
+        LOW = 6, 'Low'
+    
     type = models.CharField(
         max_length=12,
         choices=TaskType.choices,
         default=None,
         null=True
     )
+    queue = models.CharField(max_length=32, choices=Queue.choices, null=True, blank=True)
+    priority = models.PositiveSmallIntegerField(choices=Priority.choices, null=True, blank=True)
 
     class Meta:
         abstract = True
@@ -68,23 +82,131 @@ class Condition(models.Model):
     class Meta:
         abstract = True 
 
+    def get_evaluator(self, status):
+        """
+        Returns the in-memory evaluator used by a running task to check this condition.
+
+        Args:
+            status (str): The status the task stops in once the condition is met.
+
+        Returns:
+            ConditionEvaluator: The evaluator, None for conditions not evaluated by the task.
+        """
+        return None
+
 
 class TimeCondition(Condition):
     """
     Condition based on a time schedule, using `CrontabSchedule` for scheduling.
 
+    - Only the next fire time is stored, the time conditions of all jobs are fired by a
+      single dispatcher, see `scheduler.dispatch_due_conditions`.
+
     Attributes:
         crontab (ForeignKey): Foreign key to a `CrontabSchedule` instance.
+        next_run_at (DateTime): The next time the condition fires.
     """
     crontab = models.ForeignKey(
         CrontabSchedule,
         on_delete=models.CASCADE,
     )
-    periodic_task = models.OneToOneField(PeriodicTask, on_delete=models.CASCADE, null=True, blank=True)
+    next_run_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['next_run_at'], name='time_condition_next_run_idx'),
+        ]
     
     def __str__(self):
         return f"{self.id} - Crontab: {self.crontab}"
 
+    def save(self, *args, **kwargs):
+        """
+        Save the condition, scheduling its next fire time if it has none.
+        """
+        from apps.task_app.scheduler import next_fire_time
+
+        if self.next_run_at is None:
+            self.next_run_at = next_fire_time(self.crontab)
+
+        super().save(*args, **kwargs)
+
+
+
+class MaxRecordsCondition(Condition):
+    """
+    Stopping condition met once a run has processed a number of steps (records).
+
+    - Evaluated in memory by the running task, after each step.
+
+    Attributes:
+        max_records (int): Steps processed by a single run before it stops.
+    """
+    max_records = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.id} - Max Records: {self.max_records}"
+
+    def get_evaluator(self, status):
+        return MaxRecordsEvaluator(status, self.max_records)
+
+
+class ThroughputCondition(Condition):
+    """
+    Stopping condition met once a run's throughput drops below a minimum.
+
+    - Evaluated in memory by the running task, once per window.
+
+    Attributes:
+        min_throughput (float): Minimum steps per second.
+        window (int): Seconds over which the throughput is measured.
+    """
+    min_throughput = models.FloatField()
+    window = models.PositiveIntegerField(default=60)
+
+    def __str__(self):
+        return f"{self.id} - Min Throughput: {self.min_throughput} steps/s over {self.window}s"
+
+    def get_evaluator(self, status):
+        return ThroughputEvaluator(status, self.min_throughput, self.window)
+
+
+# Condition types a job can start or stop on
+CONDITION_MODELS = [TimeCondition, MaxRecordsCondition, ThroughputCondition]
+
+
+def get_condition_content_types():
+    """
+    Returns the content types of every condition type, keyed by model.
+
+    - Loaded with a single query the first time, then served from the ContentType cache,
+      which every later condition lookup in the process reuses.
+    """
+    return ContentType.objects.get_for_models(*CONDITION_MODELS)
+
+
+class JobQuerySet(models.QuerySet):
+
+    def with_conditions(self):
+        """
+        Loads the jobs' creator and conditions along with them, in a constant number of queries.
+
+        - Starting and stopping conditions are prefetched per condition type, whatever
+          the number of jobs; time conditions come with their crontab.
+        """
+        get_condition_content_types()
+
+        def condition_querysets():
+            return [
+                TimeCondition.objects.select_related('crontab'),
+                MaxRecordsCondition.objects.all(),
+                ThroughputCondition.objects.all(),
+            ]
+
+        return self.select_related('created_by').prefetch_related(
+            GenericPrefetch('starting_condition', condition_querysets()),
+            GenericPrefetch('stopping_condition', condition_querysets()),
+        )
 
 
 class Job(BaseTask):
@@ -102,7 +224,26 @@ class Job(BaseTask):
         stopping_condition (GenericForeignKey): Condition to stop the job.
         debug_mode (bool): Whether the job is in debug mode.
         last_run (DateTime): Last run time of the job.
+        max_concurrency (int): Maximum tasks of the job starting or running at once, None for no limit.
+        overflow_policy (str): What to do with a launch once the limit is reached.
+        queued_launches (int): Launches waiting for a slot, under the QUEUE and COALESCE policies.
+        log_retention_days (int): Days the job's and its tasks' logs are kept, None for `LOG_RETENTION_DAYS`.
+        last_run_at (DateTime): When the job's last finished task finished.
+        last_task_status (str): Status of the job's latest task.
+        running_count (int): Tasks of the job STARTING or RUNNING.
+        total_tasks (int): Tasks of the job.
+
+    The last four are kept up to date by the task transitions, see `counters`.
     """
+
+    # Fields only changed by set-based UPDATEs (counters, admission), never saved back from an instance
+    COUNTER_FIELDS = ('queued_launches', 'last_run_at', 'last_task_status', 'running_count', 'total_tasks')
+
+    class OverflowPolicy(models.TextChoices):
+        QUEUE = 'QUEUE', 'Queue the launch until a task ends'
+        SKIP = 'SKIP', 'Skip the launch'
+        COALESCE = 'COALESCE', 'Keep at most one queued launch'
+
     name = models.CharField(max_length=255, verbose_name="Job Name", unique=True)
     log_path = models.CharField(max_length=255)
     
@@ -118,14 +259,26 @@ class Job(BaseTask):
     
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='jobs')
     enabled = models.BooleanField(default=True)
+
+    max_concurrency = models.PositiveIntegerField(null=True, blank=True)
+    overflow_policy = models.CharField(max_length=10, choices=OverflowPolicy.choices, default=OverflowPolicy.SKIP)
+    queued_launches = models.PositiveIntegerField(default=0)
+
+    log_retention_days = models.PositiveIntegerField(null=True, blank=True)
+
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_task_status = models.CharField(max_length=10, null=True, blank=True)
+    running_count = models.IntegerField(default=0)
+    total_tasks = models.IntegerField(default=0)
+
+    objects = JobQuerySet.as_manager()
     
     @property
     def last_run(self):
         """
         Returns the last finished date of the tasks associated with this job.
         """
-        last_task = self.tasks.filter(status=Task.Status.FINISHED).order_by('-finished_at').first()
-        return last_task.finished_at if last_task else None
+        return self.last_run_at
 
     class Meta:
         permissions = [
@@ -138,49 +291,17 @@ class Meta:
             ("can_resume_job", "Can resume Job"),
             ("can_delete_job", "Can delete Job"),
         ]
+        indexes = [
+            # Jobs fired by a batch of due conditions are found through these
+            models.Index(fields=['starting_condition_type', 'starting_condition_id'], name='job_starting_condition_idx'),
+            models.Index(fields=['stopping_condition_type', 'stopping_condition_id'], name='job_stopping_condition_idx'),
+            # Job table, newest first, filtered by type
+            models.Index(fields=['type', '-id'], name='job_type_id_idx'),
+        ]
     
-    def save(self, *args, **kwargs):
-        """
-        Save the job and create/update the associated periodic task.
-        """
-        
-        # We need to pre-save the job to get the ID
-        super().save(*args, **kwargs)
-        
-        # Create/Update Starting condition
-        
-        # When Starting condition is a TimeCondition
-        if self.starting_condition and isinstance(self.starting_condition, TimeCondition):
-            if not self.starting_condition.periodic_task:
-                self.starting_condition.periodic_task = PeriodicTask.objects.create(
-                    crontab=self.starting_condition.crontab,
-                    name=f"Job Starting Condition: {self.name}",
-                    task='apps.task_app.tasks._launch_job',
-                    args=json.dumps([self.id]),
-                    enabled=self.enabled,
-                )
-                self.starting_condition.save()
-        
-        # Create/Update Stopping condition
-        
-        # When Stopping condition is a TimeCondition
-        if self.stopping_condition and isinstance(self.stopping_condition, TimeCondition):
-            if not self.stopping_condition.periodic_task:
-                self.stopping_condition.periodic_task = PeriodicTask.objects.create(
-                    crontab=self.stopping_condition.crontab,
-                    name=f"Job Stopping Condition: {self.name}",
-                    task='apps.task_app.tasks._stop_job_task',
-                    args=json.dumps([self.id]),
-                    enabled=self.enabled,
-                )
-                
-            self.stopping_condition.save()
-
-        super().save(*args, **kwargs)
-
     def delete(self, *args, **kwargs):
         """
-        Deletes the job and its associated periodic task and conditions if they exist.
+        Deletes the job and its associated conditions if they exist.
         """
 
         if self.stopping_condition:
@@ -192,24 +313,17 @@ def delete(self, *args, **kwargs):
 
     def pause(self):
         """
-        Pauses the periodic task and the task associated with this job.
+        Pauses the job, its conditions are no longer fired.
         """
-
         self.enabled = False
-        if self.starting_condition and isinstance(self.starting_condition, TimeCondition):
-            self.starting_condition.periodic_task.enabled = False
-            self.starting_condition.periodic_task.save()
-        self.save()
+        self.save(update_fields=['enabled', 'updated_at'])
 
     def resume(self):
         """
-        Resumes the periodic task associated with this job.
+        Resumes the job, its conditions are fired again from their next fire time.
         """
         self.enabled = True
-        if self.starting_condition and isinstance(self.starting_condition, TimeCondition):
-            self.starting_condition.periodic_task.enabled = True
-            self.starting_condition.periodic_task.save()
-        self.save()
+        self.save(update_fields=['enabled', 'updated_at'])
 
 
 
@@ -229,6 +343,9 @@ class Task(BaseTask):
         job (ForeignKey): The job associated with this task.
         debug_mode (bool): Whether the task is in debug mode.
         status (str): Status of the task, e.g., STARTING, RUNNING, CANCELED.
+        run_id (str): Celery task ID of the current run, the writes of a run (checkpoints, final
+            status) only apply while it is the current one, so a restarted task is not overwritten
+            by its previous run winding down.
     """
     started_at = models.DateTimeField(auto_now=True)
     finished_at = models.DateTimeField(null=True,blank=True)
@@ -238,6 +355,7 @@ class Task(BaseTask):
     job = models.ForeignKey(Job, on_delete=models.CASCADE, blank=True, null=True, related_name='tasks')
     debug_mode = models.BooleanField(default=False)
     step = models.IntegerField(default=1)
+    run_id = models.CharField(max_length=255, null=True, blank=True)
     
     class Status(models.TextChoices):
         STARTING = 'STARTING', 'Starting'
@@ -268,6 +386,20 @@ class Meta:
             ("can_cancel_task", "Can cancel Task"),
             ("can_delete_task", "Can delete Task"),
         ]
+        indexes = [
+            # Task table, newest first, filtered by status or type
+            models.Index(fields=['status', '-id'], name='task_status_id_idx'),
+            models.Index(fields=['type', '-id'], name='task_type_id_idx'),
+            # Task table date range filters
+            models.Index(fields=['status', 'finished_at'], name='task_status_finished_idx'),
+            models.Index(fields=['started_at'], name='task_started_idx'),
+            models.Index(fields=['finished_at'], name='task_finished_idx', condition=models.Q(finished_at__isnull=False)),
+            # Job's current task and job detail tasks
+            models.Index(fields=['job', '-created_at'], name='task_job_created_idx'),
+            models.Index(fields=['job', '-started_at'], name='task_job_started_idx'),
+            # Admission counts, only STARTING and RUNNING tasks
+            models.Index(fields=['job'], name='task_active_job_idx', condition=models.Q(status__in=['STARTING', 'RUNNING'])),
+        ]
     
     def __str__(self):
         return f"Task: {self.id} - {self.type}"
@@ -276,20 +408,18 @@ def launch(self, continue_mode= False):
         """
         Launches the task by setting its status and initiating a Celery task.
         """
+        from apps.task_app.transitions import transition_task
+
+        transition_task(self, Task.Status.STARTING)
+        self._launch_celery_task(continue_mode)
         
-        self.status = Task.Status.STARTING
-        self.save()
-        
-        if self.debug_mode:
-            _launch_task(self.id, continue_mode)
-        else:
-            celery_id = CeleryTask.objects.create(
-                task=self, 
-                celery_task_id=_launch_task.delay(self.id, continue_mode).id
-            )
-            celery_id.save()
-            
-        
+    def _launch_celery_task(self, continue_mode=False):
+        """
+        Runs the task inline in debug mode, or sends it to a Celery worker.
+        """
+        from apps.task_app.transitions import launch_tasks
+
+        launch_tasks([self], continue_mode)
         
     def purge(self):
         """
@@ -301,53 +431,48 @@ def restart(self):
         """
         Restarts the task by resetting and relaunching it.
         """
+        from apps.task_app.transitions import transition_task
+
         if self.status == Task.Status.RUNNING:
-            self.kill_current_celery_task()
+            self.kill_current_celery_task(Task.Status.STARTING)
         
-        # reset milestones
-        self.step = 1
-        self.started_at = timezone.now()
-        self.finished_at = None
-        self.save()
+        # reset milestones, ending the previous run's writes
+        transition_task(
+            self,
+            Task.Status.STARTING,
+            step=1,
+            started_at=timezone.now(),
+            finished_at=None,
+            run_id=None,
+        )
         self.purge()
-        self.launch()
+        self._launch_celery_task()
                 
     def cancel(self):
         """
         Cancels the task by revoking the Celery task and updating the status.
         """
-        # stop celery task
-        self.kill_current_celery_task()
-        
-        self.status = Task.Status.CANCELED
-        self.finished_at = timezone.now()
-        self.save()
+        from apps.task_app.transitions import transition_task
+
+        transition_task(self, Task.Status.CANCELED, interrupt=True, finished_at=timezone.now())
 
     
     def pause(self):
-        if self.status == Task.Status.RUNNING:
-            # stop celery task
-            self.kill_current_celery_task()
-            self.stopped_at = timezone.now()
-            self.status = Task.Status.PAUSED
-            self.save()
+        from apps.task_app.transitions import transition_task
+
+        transition_task(self, Task.Status.PAUSED, interrupt=True, stopped_at=timezone.now())
 
         
     def resume(self):
-        
-        if self.status == Task.Status.PAUSED or self.status == Task.Status.STOPPED:
+        from apps.task_app.transitions import transition_task
 
-            self.resumed_at = timezone.now()
-            self.save()
-            self.launch(continue_mode=True)
+        if transition_task(self, Task.Status.STARTING, sources=[Task.Status.PAUSED, Task.Status.STOPPED]):
+            self._launch_celery_task(continue_mode=True)
             
     def stop(self):
-        if self.status == Task.Status.RUNNING:
-            # stop celery task
-            self.kill_current_celery_task()
-            self.stopped_at = timezone.now()
-            self.status = Task.Status.STOPPED
-            self.save()
+        from apps.task_app.transitions import transition_task
+
+        transition_task(self, Task.Status.STOPPED, interrupt=True, stopped_at=timezone.now())
 
     
     def change_status(self, status):
@@ -367,33 +492,101 @@ def change_status(self, status):
         
     
     def finish(self):
-        self.finished_at = timezone.now()
-        self.status = Task.Status.FINISHED
-        self.kill_current_celery_task()
-        self.save()
+        from apps.task_app.transitions import transition_task
+
+        transition_task(self, Task.Status.FINISHED, interrupt=True, finished_at=timezone.now())
     
     def fail(self):
-        self.finished_at = timezone.now()
-        self.status = Task.Status.FAILED
-        self.kill_current_celery_task()
-        self.save()
+        from apps.task_app.transitions import transition_task
+
+        transition_task(self, Task.Status.FAILED, interrupt=True, finished_at=timezone.now())
         
-    def kill_current_celery_task(self):
+    def kill_current_celery_task(self, status=None):
         """
-        Kills the task by revoking the Celery task
+        Stops the Celery task, along with any unfinished chunk when the task is split
+        across workers, see `transitions.interrupt_tasks`.
+
+        Args:
+            status (str): The status the task is moving to, for logging purposes.
         """
-        # stop celery task
-        result = AsyncResult(self.celery_tasks.last().celery_task_id, app=app)
-        result.revoke(terminate=True)
+        from apps.task_app.transitions import interrupt_tasks
+
+        interrupt_tasks([self.id], status or self.status)
         
     
+class TaskChunk(BaseModel):
+    """
+    A range of steps of a task split across several Celery workers.
+
+    Attributes:
+        task (ForeignKey): The task the chunk belongs to.
+        index (int): Position of the chunk within the task.
+        start (int): First step of the chunk.
+        end (int): Step at which the chunk is complete (exclusive).
+        step (int): The step reached, a resumed chunk continues from here.
+        status (str): Status of the chunk, using the Task statuses.
+        finished_at (DateTime): The time when the chunk was finished.
+        celery_task_id (str): ID of the Celery task running the chunk.
+    """
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='chunks')
+    index = models.PositiveIntegerField()
+    start = models.IntegerField()
+    end = models.IntegerField()
+    step = models.IntegerField()
+    status = models.CharField(
+        max_length=10,
+        choices=Task.Status.choices,
+        default=Task.Status.STARTING,
+    )
+    finished_at = models.DateTimeField(null=True, blank=True)
+    celery_task_id = models.CharField(max_length=255, null=True, blank=True)
+    
+    class Meta:
+        ordering = ['index']
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'index'], name='unique_task_chunk_index'),
+        ]
+    
+    def __str__(self):
+        return f"Task Chunk: {self.task_id} - {self.index} [{self.start}, {self.end})"
     
+
+class TaskLaunch(BaseModel):
+    """
+    Outbox of task launches, written in the same transaction as the task itself.
+
+    The Celery message is only published by the dispatcher once the row is committed,
+    see `apps.task_app.outbox`.
+
+    Attributes:
+        task (ForeignKey): The task to launch.
+        celery_task_id (str): ID assigned upfront to the Celery task.
+        continue_mode (bool): Whether the task resumes from its current step.
+        queue (str): Celery queue the task is routed to.
+        priority (int): Priority of the message within the queue.
+        dispatched_at (DateTime): The time the message was published, None while pending.
+    """
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='launches')
+    celery_task_id = models.CharField(max_length=255, unique=True)
+    continue_mode = models.BooleanField(default=False)
+    queue = models.CharField(max_length=32, null=True, blank=True)
+    priority = models.PositiveSmallIntegerField(null=True, blank=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], condition=models.Q(dispatched_at=None), name='task_launch_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"Task Launch: {self.task_id} - {self.celery_task_id}"
+
             
 class CeleryTask(models.Model):
     """
     Celery task ID model.
     """
-    celery_task_id = models.CharField(max_length=255, null=True, blank=True)
+    celery_task_id = models.CharField(max_length=255, null=True, blank=True, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
     task = models.ForeignKey(Task, on_delete=models.CASCADE, blank=True, null=True, related_name='celery_tasks')
     
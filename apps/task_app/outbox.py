@@ -0,0 +1,170 @@
+###
+# General imports
+##
+
+## Default
+import logging
+from datetime import timedelta
+
+## Django
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+## Celery
+from celery.utils import uuid
+from config.celery import app
+
+## Models
+from apps.task_app.models import CeleryTask, TaskLaunch
+
+## Tasks
+from apps.task_app.tasks import _launch_task
+
+## Task IDs
+from apps.task_app.task_ids import task_headers
+
+## Routing
+from apps.task_app.routing import resolve_routes
+
+# Set up main logger
+main_logger = logging.getLogger('django')
+
+
+###
+# Outbox
+##
+
+def enqueue_launches(tasks, continue_mode=False):
+    """
+    Records the launch of the given tasks in the outbox, within the current transaction.
+
+    - The Celery IDs are assigned upfront, the matching `CeleryTask` rows are written
+      alongside, so the mapping exists before any message is published.
+    - The queue and priority of every task are resolved once here, see `routing`.
+    - Once the transaction commits, the launches are dispatched right away, unless
+      `TASK_OUTBOX_DISPATCH_ON_COMMIT` is disabled, in which case the sweeper publishes
+      them at its own rate.
+
+    Args:
+        tasks (list): The tasks to launch.
+        continue_mode (bool): Whether the tasks resume from their current step.
+
+    Returns:
+        list: The TaskLaunch rows created.
+    """
+    routes = resolve_routes(tasks)
+
+    launches = TaskLaunch.objects.bulk_create(
+        [
+            TaskLaunch(
+                task=task,
+                celery_task_id=uuid(),
+                continue_mode=continue_mode,
+                queue=routes[task.id][0],
+                priority=routes[task.id][1],
+            )
+            for task in tasks
+        ],
+        batch_size=settings.TASK_OUTBOX_BATCH_SIZE,
+    )
+    CeleryTask.objects.bulk_create(
+        [CeleryTask(task_id=launch.task_id, celery_task_id=launch.celery_task_id) for launch in launches],
+        batch_size=settings.TASK_OUTBOX_BATCH_SIZE,
+    )
+
+    if launches and settings.TASK_OUTBOX_DISPATCH_ON_COMMIT:
+        launch_ids = [launch.id for launch in launches]
+        transaction.on_commit(lambda: _dispatch_on_commit(launch_ids))
+
+    return launches
+
+
+def dispatch_launches(launch_ids=None, limit=None):
+    """
+    Publishes pending launches, oldest first, in batches of `TASK_OUTBOX_BATCH_SIZE`.
+
+    - Each batch is locked with `SELECT ... FOR UPDATE SKIP LOCKED`, published through one
+      broker connection and marked as dispatched in the same transaction, so concurrent
+      dispatchers never publish the same launch twice.
+    - If publishing fails, the batch is rolled back and left for the sweeper.
+
+    Args:
+        launch_ids (list): Restricts the dispatch to these launches, None for any pending one.
+        limit (int): Maximum launches to publish, None for no limit.
+
+    Returns:
+        int: The number of launches published.
+    """
+    batch_size = settings.TASK_OUTBOX_BATCH_SIZE
+    dispatched = 0
+
+    while limit is None or dispatched < limit:
+        size = batch_size if limit is None else min(batch_size, limit - dispatched)
+
+        with transaction.atomic():
+            pending = TaskLaunch.objects.select_for_update(skip_locked=True).filter(dispatched_at=None)
+            if launch_ids is not None:
+                pending = pending.filter(id__in=launch_ids[:size])
+                launch_ids = launch_ids[size:]
+
+            launches = list(pending.order_by('created_at')[:size])
+            if launches:
+                _publish(launches)
+                TaskLaunch.objects.filter(id__in=[launch.id for launch in launches]).update(dispatched_at=timezone.now())
+
+        dispatched += len(launches)
+
+        if launch_ids is not None and not launch_ids:
+            break
+        if launch_ids is None and len(launches) < size:
+            break
+
+    return dispatched
+
+
+def sweep_launches():
+    """
+    Publishes the launches left pending, and forgets the old dispatched ones.
+
+    - Throttled to `TASK_OUTBOX_MAX_RATE` launches per second over the sweep interval.
+
+    Returns:
+        int: The number of launches published.
+    """
+    max_rate = settings.TASK_OUTBOX_MAX_RATE
+    limit = max_rate * settings.TASK_OUTBOX_SWEEP_INTERVAL if max_rate else None
+
+    dispatched = dispatch_launches(limit=limit)
+
+    TaskLaunch.objects.filter(
+        dispatched_at__lt=timezone.now() - timedelta(seconds=settings.TASK_OUTBOX_RETENTION)
+    ).delete()
+
+    return dispatched
+
+
+###
+# Helper Functions
+##
+
+def _dispatch_on_commit(launch_ids):
+    try:
+        dispatch_launches(launch_ids)
+    except Exception as e:
+        # The launches stay pending, the sweeper retries them
+        main_logger.error(f'Could not dispatch {len(launch_ids)} task launches: {e}')
+
+
+def _publish(launches):
+    with app.producer_or_acquire() as producer:
+        for launch in launches:
+            # The Task ID travels in the message headers, so the worker never has to look it up
+            _launch_task.apply_async(
+                (launch.task_id, launch.continue_mode),
+                task_id=launch.celery_task_id,
+                headers=task_headers(launch.task_id),
+                queue=launch.queue,
+                priority=launch.priority,
+                producer=producer,
+            )
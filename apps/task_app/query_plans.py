@@ -0,0 +1,162 @@
+###
+# General imports
+##
+
+## Default
+import re
+
+## Django
+from django.db import connection, transaction
+from django.utils import timezone
+
+## Models
+from apps.task_app.models import Task, Job
+
+## Filters
+from apps.task_app.filters import TaskFilter, JobFilter
+
+## Pagination
+from apps.common.pagination import CursorPaginator
+
+
+# Page of records fetched by the list views
+PAGE_SIZE = 10
+
+# Postgres text plans, e.g. "->  Parallel Seq Scan on task_app_task  (cost=..."
+SEQ_SCAN_PATTERN = re.compile(r'Seq Scan on (\w+)')
+
+# Registered list queries, by name
+LIST_QUERIES = {}
+
+
+def register_query(name):
+    """
+    Decorator registering a function building one of the list/filter querysets whose plan is checked.
+
+    Args:
+        name (str): Name of the query, as reported by `check_query_plans`.
+    """
+    def decorator(build):
+        LIST_QUERIES[name] = build
+        return build
+    return decorator
+
+
+###
+# List Queries
+##
+
+@register_query('task_table')
+def _task_table():
+    return _next_page(Task.objects.all().order_by('-id'), _sample_id(Task))
+
+
+@register_query('task_table_by_status')
+def _task_table_by_status():
+    return _next_page(TaskFilter({'status': Task.Status.RUNNING}, queryset=Task.objects.all().order_by('-id')).qs, _sample_id(Task))
+
+
+@register_query('task_table_by_type')
+def _task_table_by_type():
+    return _next_page(TaskFilter({'type': Task.TaskType.SMALL}, queryset=Task.objects.all().order_by('-id')).qs, _sample_id(Task))
+
+
+@register_query('task_table_finished_this_week')
+def _task_table_finished_this_week():
+    return _next_page(TaskFilter({'finished_at': 'week'}, queryset=Task.objects.all().order_by('-id')).qs, _sample_id(Task))
+
+
+@register_query('job_table_by_type')
+def _job_table_by_type():
+    return _next_page(JobFilter({'type': Task.TaskType.SMALL}, queryset=Job.objects.all().order_by('-id')).qs, _sample_id(Job))
+
+
+@register_query('job_tasks')
+def _job_tasks():
+    return _next_page(Task.objects.filter(job_id=_sample_id(Job)).order_by('-started_at'), timezone.now(), _sample_id(Task))
+
+
+@register_query('job_current_task')
+def _job_current_task():
+    return Task.objects.filter(job_id=_sample_id(Job)).order_by('-created_at')[:1]
+
+
+@register_query('job_active_tasks')
+def _job_active_tasks():
+    return Task.objects.filter(job_id=_sample_id(Job), status__in=[Task.Status.STARTING, Task.Status.RUNNING])
+
+
+###
+# Plans
+##
+
+def explain_queries(names=None, seqscan=True):
+    """
+    Returns the Postgres plan of the registered list queries.
+
+    Args:
+        names (list): The queries to explain, all of them by default.
+        seqscan (bool): False to disable sequential scans in the planner, so on a small
+            database the plan still shows whether an index could serve the query.
+
+    Returns:
+        dict: The text plan of each query, by name.
+
+    Raises:
+        KeyError: If a name is not a registered query.
+    """
+    plans = {}
+    with transaction.atomic():
+        if not seqscan:
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+        for name in names or LIST_QUERIES:
+            plans[name] = LIST_QUERIES[name]().explain()
+
+    return plans
+
+
+def find_seq_scans(plan, tables=None):
+    """
+    Returns the tables read with a sequential scan in a Postgres text plan.
+
+    Args:
+        plan (str): The plan, as returned by `QuerySet.explain()`.
+        tables (set): Only report these tables, all of them by default.
+
+    Returns:
+        list: The scanned table names, in plan order.
+    """
+    scanned = SEQ_SCAN_PATTERN.findall(plan)
+    return [table for table in scanned if tables is None or table in tables]
+
+
+def get_large_tables(min_rows):
+    """
+    Returns the tables the planner estimates to hold at least `min_rows` rows.
+
+    - Uses the `pg_class` statistics, so it never counts the tables.
+
+    Args:
+        min_rows (int): The estimated row count from which a table is large.
+
+    Returns:
+        set: The large table names.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relname FROM pg_class WHERE relkind = 'r' AND reltuples >= %s", [min_rows])
+        return {row[0] for row in cursor.fetchall()}
+
+
+###
+# Helper Functions
+##
+
+def _sample_id(model):
+    return model.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def _next_page(queryset, *values):
+    # A page past the first one, as the list views fetch it from a cursor: WHERE key < cursor ORDER BY key LIMIT n + 1
+    return CursorPaginator(queryset, PAGE_SIZE).get_queryset(list(values))
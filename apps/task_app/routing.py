@@ -0,0 +1,85 @@
+###
+# General imports
+##
+
+## Django
+from django.conf import settings
+
+## Models
+from apps.task_app.models import Task, Job
+
+## Runners
+from apps.task_app.runners import ResourceClass, get_runner
+
+
+# Queue used for the task types without an explicit route, by resource class
+RESOURCE_CLASS_QUEUES = {
+    ResourceClass.SHORT: Task.Queue.SHORT,
+    ResourceClass.LONG: Task.Queue.LONG,
+}
+
+
+###
+# Routing
+##
+
+def get_type_route(task_type):
+    """
+    Returns the default route of a task type.
+
+    - `settings.TASK_TYPE_ROUTES` may set the queue and priority of a type.
+    - Otherwise, the queue follows the resource class of the type's runner, so long
+      workloads never hold the workers of the short ones.
+
+    Args:
+        task_type (str): The `Task.TaskType` value.
+
+    Returns:
+        tuple: The queue name and the priority.
+    """
+    route = settings.TASK_TYPE_ROUTES.get(task_type, {})
+
+    queue = route.get('queue')
+    if queue is None:
+        queue = RESOURCE_CLASS_QUEUES.get(get_runner(task_type).resource_class, Task.Queue.SHORT)
+
+    return queue, route.get('priority', Task.Priority.NORMAL)
+
+
+def resolve_route(task, job=None):
+    """
+    Returns the route of a task: its own override, then its job's, then its type's.
+
+    Args:
+        task (Task): The task to route.
+        job (Job): The task's job, if already loaded.
+
+    Returns:
+        tuple: The queue name and the priority.
+    """
+    queue, priority = get_type_route(task.type)
+
+    if job is not None:
+        queue = job.queue if job.queue is not None else queue
+        priority = job.priority if job.priority is not None else priority
+
+    return (
+        task.queue if task.queue is not None else queue,
+        task.priority if task.priority is not None else priority,
+    )
+
+
+def resolve_routes(tasks):
+    """
+    Routes many tasks at once, loading their jobs' overrides in a single query.
+
+    Args:
+        tasks (list): The tasks to route.
+
+    Returns:
+        dict: The queue name and priority of each task, keyed by task ID.
+    """
+    job_ids = {task.job_id for task in tasks if task.job_id is not None}
+    jobs = Job.objects.only('id', 'queue', 'priority').in_bulk(job_ids) if job_ids else {}
+
+    return {task.id: resolve_route(task, jobs.get(task.job_id)) for task in tasks}
@@ -0,0 +1,477 @@
+###
+# General imports
+##
+
+## Default
+import time
+import logging
+import threading
+from importlib import import_module
+from importlib.metadata import entry_points
+
+## Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django.utils import timezone
+
+### App-specific imports
+
+## Checkpoints
+from apps.task_app.checkpoint import TaskCheckpoint, ChunkCheckpoint
+
+## Control
+from apps.task_app.control import TaskControl, TaskInterrupted
+
+## Conditions
+from apps.task_app.conditions import ConditionReached
+
+# Set up main logger
+main_logger = logging.getLogger('django')
+
+# Entry point group third-party packages can use to ship their own runners
+RUNNER_ENTRY_POINT_GROUP = 'task_app.runners'
+
+# Cache key of a runner counter, by task type and counter
+RUNNER_STATS_KEY = 'task_app:runner_stats:{}:{}'
+
+
+###
+# Registry
+##
+
+_registry = {}
+_loaded = False
+_load_lock = threading.Lock()
+
+
+def register_runner(task_type):
+    """
+    Class decorator registering a `TaskRunner` for the given task type.
+
+    Args:
+        task_type (str): The `Task.TaskType` value handled by the runner.
+
+    Returns:
+        callable: The decorator, which returns the class unchanged.
+
+    Usage:
+        @register_runner(Task.TaskType.LARGE)
+        class MyRunner(TaskRunner):
+            ...
+    """
+    def decorator(runner_class):
+        runner_class.type = task_type
+        _registry[task_type] = runner_class()
+        return runner_class
+
+    return decorator
+
+
+def load_runners():
+    """
+    Resolves every registered runner once per process.
+
+    - Imports the modules listed in `settings.TASK_RUNNER_MODULES`, which register
+      their runners on import.
+    - Loads the `task_app.runners` entry points, each pointing either to a module
+      or to a `TaskRunner` subclass.
+
+    Called at worker start; later calls are no-ops.
+    """
+    global _loaded
+
+    if _loaded:
+        return
+
+    with _load_lock:
+        if _loaded:
+            return
+
+        for module in getattr(settings, 'TASK_RUNNER_MODULES', []):
+            import_module(module)
+
+        for entry_point in entry_points(group=RUNNER_ENTRY_POINT_GROUP):
+            try:
+                loaded = entry_point.load()
+            except Exception as e:
+                main_logger.error(f'Could not load task runner {entry_point.name}: {e}')
+                continue
+
+            if isinstance(loaded, type) and issubclass(loaded, TaskRunner):
+                register_runner(loaded.type or entry_point.name)(loaded)
+
+        _loaded = True
+
+
+def get_runner(task_type):
+    """
+    Returns the runner registered for a task type.
+
+    Args:
+        task_type (str): The `Task.TaskType` value to look up.
+
+    Returns:
+        TaskRunner: The runner instance.
+
+    Raises:
+        LookupError: If no runner is registered for the type.
+    """
+    load_runners()
+
+    try:
+        return _registry[task_type]
+    except KeyError:
+        raise LookupError(f'No task runner registered for type {task_type}')
+
+
+def get_runner_stats():
+    """
+    Returns the throughput counters of every registered runner, across all worker processes.
+
+    Returns:
+        dict: Counters keyed by task type.
+    """
+    load_runners()
+    return {task_type: runner.stats.as_dict() for task_type, runner in _registry.items()}
+
+
+###
+# Runners
+##
+
+class ResourceClass(models.TextChoices):
+    SHORT = 'SHORT', 'Short'
+    LONG = 'LONG', 'Long'
+
+
+class RunnerStats:
+    """
+    Throughput counters of a runner, shared by every worker process.
+
+    - Kept in the cache (Redis) and incremented atomically, since runs execute in the prefork
+      children while the `runner_stats` inspect command is answered by the worker's main process.
+    - Seconds are counted in milliseconds, the cache only incrementing integers.
+
+    Attributes:
+        runner_type (str): The task type of the runner, used in the cache keys.
+    """
+    FIELDS = ('started', 'finished', 'failed', 'steps', 'milliseconds')
+
+    def __init__(self, runner_type):
+        self.runner_type = runner_type
+
+    def start(self):
+        self._incr('started')
+
+    def record(self, steps, seconds, failed=False):
+        self._incr('steps', steps)
+        self._incr('milliseconds', round(seconds * 1000))
+        self._incr('failed' if failed else 'finished')
+
+    def get_counters(self):
+        """
+        Returns the counters as stored, zero for the ones never incremented.
+        """
+        counters = cache.get_many([self._key(field) for field in self.FIELDS])
+        return {field: counters.get(self._key(field), 0) for field in self.FIELDS}
+
+    def reset(self):
+        cache.delete_many([self._key(field) for field in self.FIELDS])
+
+    @property
+    def steps(self):
+        return cache.get(self._key('steps'), 0)
+
+    def as_dict(self):
+        counters = self.get_counters()
+        seconds = counters.pop('milliseconds') / 1000
+        return {
+            **counters,
+            'seconds': round(seconds, 3),
+            # Steps processed per second of running time
+            'throughput': round(counters['steps'] / seconds, 3) if seconds else 0.0,
+        }
+
+    def _key(self, field):
+        return RUNNER_STATS_KEY.format(self.runner_type, field)
+
+    def _incr(self, field, value=1):
+        if not value:
+            return
+
+        key = self._key(field)
+        try:
+            cache.add(key, 0, None)
+            try:
+                cache.incr(key, value)
+            except ValueError:
+                # Evicted in between, the counter restarts from this value
+                cache.set(key, value, None)
+        except Exception as e:
+            # Counters are best effort, they never fail the run they measure
+            main_logger.warning(f"Dropped runner counter {key}: {e}")
+
+
+class TaskRunner:
+    """
+    Base class for the workloads executed by a `Task`.
+
+    A runner processes a task step by step, from its current `step` up to the value
+    returned by `get_total_steps`, so it plugs into the existing pause/resume lifecycle.
+
+    Attributes:
+        type (str): The `Task.TaskType` handled, set by `register_runner`.
+        resource_class (str): The kind of resources the workload needs.
+        chunk_size (int): Steps per chunk when the task can be split across workers,
+            None to always run it in a single worker.
+        checkpoint_class (type): The checkpoint used to persist progress.
+        checkpoint_interval (float): Seconds between checkpoints, None for the default.
+        checkpoint_steps (int): Steps between checkpoints, None for the default.
+        stats (RunnerStats): Throughput counters for this runner.
+    """
+    type = None
+    resource_class = ResourceClass.SHORT
+    chunk_size = None
+
+    checkpoint_class = TaskCheckpoint
+    checkpoint_interval = None
+    checkpoint_steps = None
+
+    def __init__(self):
+        self.stats = RunnerStats(self.type)
+
+    def get_total_steps(self, task):
+        """
+        Returns the step at which the task is complete.
+        """
+        raise NotImplementedError
+
+    def run_step(self, task, step, logger):
+        """
+        Processes a single step of the task.
+        """
+        raise NotImplementedError
+
+    def finalize(self, task, step, logger):
+        """
+        Hook called once every step has been processed.
+        """
+        pass
+
+    def get_checkpoint(self, task, step):
+        return self.checkpoint_class(
+            task,
+            step=step,
+            interval=self.checkpoint_interval,
+            steps=self.checkpoint_steps,
+        )
+
+    def get_chunk_checkpoint(self, chunk):
+        return ChunkCheckpoint(
+            chunk,
+            interval=self.checkpoint_interval,
+            steps=self.checkpoint_steps,
+        )
+
+    def get_chunks(self, task):
+        """
+        Splits the task into `(start, end)` step ranges of at most `chunk_size` steps.
+
+        Returns:
+            list: The step ranges, empty when the runner does not support chunking.
+        """
+        if not self.chunk_size:
+            return []
+
+        total = self.get_total_steps(task)
+        return [(start, min(start + self.chunk_size, total)) for start in range(1, total, self.chunk_size)]
+
+    def run_steps(self, task, logger, start, end, checkpoint, control, condition=None):
+        """
+        Processes the steps in `[start, end)`, recording each one in the checkpoint.
+
+        - Polls the control flag between steps, raising `TaskInterrupted` when asked to stop.
+        - Feeds the stopping condition after each step, which raises `ConditionReached` once met.
+
+        Returns:
+            int: The step reached.
+        """
+        step = start
+        while step < end:
+            control.check()
+            self.run_step(task, step, logger)
+            step += 1
+            checkpoint.advance(step)
+            if condition is not None:
+                condition.check(step)
+        return step
+
+    def execute(self, task, logger, continue_mode=True, control=None, condition=None):
+        """
+        Runs the task to completion, keeping the throughput counters up to date.
+
+        - Stops cleanly, after flushing its checkpoint, when interrupted through the control flag.
+        - Stops the same way when its stopping condition is met, moving the task itself.
+
+        Args:
+            task (Task): The task to run.
+            logger (logging.Logger): The task's logger.
+            continue_mode (bool): Whether to resume from the task's current step.
+            control (TaskControl): The control flag to poll, None to run uninterrupted.
+            condition (ConditionEvaluator): The stopping condition to evaluate, None for none.
+
+        Returns:
+            str: The status the task ended in, FINISHED or the status it was interrupted with.
+        """
+        from apps.task_app.transitions import transition_task
+
+        control = control or TaskControl(None)
+        start = task.step if continue_mode else 1
+        started_at = time.monotonic()
+        checkpoint = None
+
+        self.stats.start()
+
+        try:
+            logger.info("")
+            logger.info("Executing Task...")
+            logger.info("")
+
+            total = self.get_total_steps(task)
+
+            if condition is not None:
+                condition.start(start)
+
+            with self.get_checkpoint(task, start) as checkpoint:
+                step = self.run_steps(task, logger, start, total, checkpoint, control, condition)
+
+                self.finalize(task, step, logger)
+
+            # Update task status to finished, unless it was moved or relaunched meanwhile, once the last step is flushed
+            if not transition_task(task, task.Status.FINISHED, where={'run_id': task.run_id}, finished_at=timezone.now()):
+                task.refresh_from_db(fields=['status'])
+        except ConditionReached as reached:
+            self.stats.record(checkpoint.step - start, time.monotonic() - started_at)
+
+            logger.info("")
+            logger.info(f"Stopping condition met at step {checkpoint.step}: {reached.reason}.")
+            logger.info("")
+
+            # Unless it was moved meanwhile (e.g. canceled), in which case that status stands
+            if not transition_task(task, reached.status, where={'run_id': task.run_id}, stopped_at=timezone.now()):
+                task.refresh_from_db(fields=['status'])
+            return task.status
+        except TaskInterrupted as interrupt:
+            self.stats.record(checkpoint.step - start, time.monotonic() - started_at)
+            control.acknowledge()
+
+            logger.info("")
+            logger.info(f"Task interrupted at step {checkpoint.step} ({interrupt.status}).")
+            logger.info("")
+            return interrupt.status
+        except BaseException:
+            steps = checkpoint.step - start if checkpoint else 0
+            self.stats.record(steps, time.monotonic() - started_at, failed=True)
+            raise
+
+        self.stats.record(checkpoint.step - start, time.monotonic() - started_at)
+
+        logger.info("")
+        logger.info("Done...")
+        logger.info("")
+
+        return task.status
+
+    def execute_chunk(self, chunk, logger, control=None):
+        """
+        Runs a single chunk of a task split across workers.
+
+        Args:
+            chunk (TaskChunk): The chunk to run, resumed from its own step.
+            logger (logging.Logger): The task's logger.
+            control (TaskControl): The control flag to poll, None to run uninterrupted.
+        """
+        control = control or TaskControl(None)
+        start = chunk.step
+        started_at = time.monotonic()
+        checkpoint = None
+
+        self.stats.start()
+
+        try:
+            with self.get_chunk_checkpoint(chunk) as checkpoint:
+                self.run_steps(chunk.task, logger, start, chunk.end, checkpoint, control)
+                checkpoint.flush(
+                    finished_at=timezone.now(),
+                    status=chunk.task.Status.FINISHED,
+                )
+        except TaskInterrupted as interrupt:
+            self.stats.record(checkpoint.step - start, time.monotonic() - started_at)
+            control.acknowledge()
+
+            logger.info(f"Chunk {chunk.index} interrupted at step {checkpoint.step} ({interrupt.status}).")
+            return
+        except BaseException:
+            steps = checkpoint.step - start if checkpoint else 0
+            self.stats.record(steps, time.monotonic() - started_at, failed=True)
+            raise
+
+        self.stats.record(checkpoint.step - start, time.monotonic() - started_at)
+
+
+class CountingTaskRunner(TaskRunner):
+    """
+    A test workload that simulates processing by counting up to `max_count`.
+
+    Attributes:
+        max_count (int): The count at which the task is complete.
+        delay (float): Seconds spent on each step.
+    """
+    max_count = 10000
+    delay = 1
+
+    def get_total_steps(self, task):
+        if self.max_count < 0:
+            raise Exception("Max Count cannot be less than 0")
+        return self.max_count
+
+    def run_step(self, task, step, logger):
+        logger.info(f"Counting at: {step}")
+        time.sleep(self.delay)
+
+    def finalize(self, task, step, logger):
+        # Log the final count
+        logger.info(f"Counting at: {step}")
+
+
+###
+# Built-in Runners
+##
+
+@register_runner('EMPTY')
+class EmptyTaskRunner(CountingTaskRunner):
+    max_count = 1
+
+
+@register_runner('SMALL')
+class SmallTaskRunner(CountingTaskRunner):
+    max_count = 5
+
+
+@register_runner('MEDIUM')
+class MediumTaskRunner(CountingTaskRunner):
+    max_count = 1000
+    resource_class = ResourceClass.LONG
+
+
+@register_runner('LARGE')
+class LargeTaskRunner(CountingTaskRunner):
+    max_count = 10000
+    resource_class = ResourceClass.LONG
+    chunk_size = 1000
+
+
+@register_runner('FAILURE')
+class FailureTaskRunner(CountingTaskRunner):
+    max_count = -1
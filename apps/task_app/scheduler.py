@@ -0,0 +1,135 @@
+###
+# General imports
+##
+
+## Default
+import logging
+from functools import partial
+
+## Django
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+
+## Celery
+from config.celery import app
+
+## Models
+from apps.task_app.models import Job, TimeCondition
+
+## Tasks
+from apps.task_app.tasks import _launch_job, _stop_job_task
+
+# Set up main logger
+main_logger = logging.getLogger('django')
+
+
+###
+# Scheduling
+##
+
+def next_fire_time(crontab, after=None):
+    """
+    Returns the first time a crontab fires after the given time.
+
+    Args:
+        crontab (CrontabSchedule): The schedule to evaluate, in its own timezone.
+        after (datetime): Reference time, now by default.
+
+    Returns:
+        datetime: The next fire time, timezone aware.
+    """
+    start, delta, _ = crontab.schedule.remaining_delta(after or timezone.now())
+    return start + delta
+
+
+def dispatch_due_conditions(now=None):
+    """
+    Fires every TimeCondition due by now, in batches of `TIME_CONDITION_BATCH_SIZE`.
+
+    - Conditions are picked through the `next_run_at` index, oldest first, so the table
+      itself is the schedule and each tick only reads what is due.
+    - Each batch is locked with `SELECT ... FOR UPDATE SKIP LOCKED` and moved to its next
+      fire time in the same transaction, so concurrent dispatchers never fire a condition
+      twice. Fire times missed while no dispatcher ran are skipped, not replayed.
+    - The jobs started and stopped by the batch are found with one query each, their
+      messages are published through one broker connection once the batch commits.
+    - Conditions never scheduled yet (e.g. created in bulk) are scheduled first.
+
+    Args:
+        now (datetime): Reference time, now by default.
+
+    Returns:
+        int: The number of conditions fired.
+    """
+    now = now or timezone.now()
+    batch_size = settings.TIME_CONDITION_BATCH_SIZE
+    content_type = ContentType.objects.get_for_model(TimeCondition)
+
+    _schedule_unscheduled(now)
+
+    fired = 0
+    while True:
+        with transaction.atomic():
+            due = list(
+                TimeCondition.objects.select_for_update(skip_locked=True)
+                .select_related('crontab')
+                .filter(next_run_at__lte=now)
+                .order_by('next_run_at')[:batch_size]
+            )
+            if not due:
+                break
+
+            for condition in due:
+                condition.next_run_at = next_fire_time(condition.crontab, now)
+            TimeCondition.objects.bulk_update(due, ['next_run_at'])
+
+            condition_ids = [condition.id for condition in due]
+            start_ids = list(Job.objects.filter(
+                enabled=True,
+                starting_condition_type=content_type,
+                starting_condition_id__in=condition_ids,
+            ).values_list('id', flat=True))
+            stop_ids = list(Job.objects.filter(
+                enabled=True,
+                stopping_condition_type=content_type,
+                stopping_condition_id__in=condition_ids,
+            ).values_list('id', flat=True))
+
+            # Bound now, the loop rebinds the lists before the callbacks of an outer transaction run
+            transaction.on_commit(partial(_publish, start_ids, stop_ids))
+
+        fired += len(due)
+        if len(due) < batch_size:
+            break
+
+    return fired
+
+
+###
+# Helper Functions
+##
+
+def _schedule_unscheduled(now):
+    batch_size = settings.TIME_CONDITION_BATCH_SIZE
+
+    while True:
+        conditions = list(TimeCondition.objects.select_related('crontab').filter(next_run_at=None)[:batch_size])
+        if not conditions:
+            return
+
+        for condition in conditions:
+            condition.next_run_at = next_fire_time(condition.crontab, now)
+        TimeCondition.objects.bulk_update(conditions, ['next_run_at'])
+
+
+def _publish(start_ids, stop_ids):
+    with app.producer_or_acquire() as producer:
+        for job_id in start_ids:
+            _launch_job.apply_async((job_id,), producer=producer)
+        for job_id in stop_ids:
+            _stop_job_task.apply_async((job_id,), producer=producer)
+
+    if start_ids or stop_ids:
+        main_logger.info(f'Time conditions fired: {len(start_ids)} jobs started, {len(stop_ids)} jobs stopped')
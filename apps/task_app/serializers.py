@@ -0,0 +1,114 @@
+from rest_framework import serializers
+from django_filters.constants import EMPTY_VALUES
+
+from django.conf import settings
+
+from apps.api.serializers import IdListInputSerializer
+from apps.task_app.models import Task, Job
+from apps.task_app.filters import TaskFilter
+from apps.task_app.transitions import BULK_OPERATIONS
+
+
+class TaskBulkActionSerializer(IdListInputSerializer):
+    """
+    Input of a bulk task action, applied either to a list of IDs or to the tasks
+    matching a filter (same fields as `TaskFilter`, e.g. {"status": "RUNNING"}).
+    """
+    action = serializers.ChoiceField(choices=sorted(BULK_OPERATIONS))
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    filters = serializers.DictField(child=serializers.CharField(), required=False)
+
+    def validate(self, data):
+        if ('ids' in data) == ('filters' in data):
+            raise serializers.ValidationError("Provide either 'ids' or 'filters'.")
+
+        if 'filters' in data:
+            # Unknown keys would be ignored by the filter set, applying the action to every task
+            unknown = sorted(set(data['filters']) - set(TaskFilter.base_filters))
+            if unknown:
+                raise serializers.ValidationError({'filters': f"Unknown filters: {', '.join(unknown)}."})
+
+            filterset = TaskFilter(data['filters'])
+            if not filterset.is_valid():
+                raise serializers.ValidationError({'filters': filterset.errors})
+
+            # Same for a filter set whose values are all empty
+            if all(value in EMPTY_VALUES for value in filterset.form.cleaned_data.values()):
+                raise serializers.ValidationError({'filters': "Provide at least one non-empty filter."})
+
+            data['queryset'] = filterset.qs
+
+        return data
+
+    def get_task_ids(self):
+        """
+        Returns the IDs of the tasks the action applies to.
+        """
+        if 'ids' in self.validated_data:
+            return self.validated_data['ids']
+        return list(self.validated_data['queryset'].values_list('id', flat=True))
+
+
+class TaskBulkActionResponseSerializer(serializers.Serializer):
+    action = serializers.CharField()
+    count = serializers.IntegerField()
+    ids = serializers.ListField(child=serializers.IntegerField())
+
+    @classmethod
+    def build_(cls, action, tasks):
+        return cls({
+            'action': action,
+            'count': len(tasks),
+            'ids': [task.id for task in tasks],
+        })
+
+
+class TaskSubmitItemSerializer(serializers.Serializer):
+    """
+    A task to submit, without `debug_mode`: debug tasks run inline, inside the submission's transaction.
+    """
+    type = serializers.ChoiceField(choices=Task.TaskType.choices)
+    job = serializers.IntegerField(required=False, allow_null=True)
+    queue = serializers.ChoiceField(choices=Task.Queue.choices, required=False, allow_null=True)
+    priority = serializers.ChoiceField(choices=Task.Priority.choices, required=False, allow_null=True)
+
+
+class TaskSubmitSerializer(serializers.Serializer):
+    """
+    Input of a bulk task submission, each item describing a task to create.
+    """
+    tasks = TaskSubmitItemSerializer(many=True, allow_empty=False, max_length=settings.TASK_SUBMIT_MAX_TASKS)
+
+    def validate_tasks(self, tasks):
+        # Check every referenced job in one query, instead of one per item
+        job_ids = {item['job'] for item in tasks if item.get('job') is not None}
+        missing = job_ids - set(Job.objects.filter(id__in=job_ids).values_list('id', flat=True))
+        if missing:
+            raise serializers.ValidationError(f"Jobs {', '.join(map(str, sorted(missing)))} do not exist.")
+        return tasks
+
+    def build_tasks(self):
+        """
+        Returns the unsaved Task instances to submit.
+        """
+        return [
+            Task(
+                type=item['type'],
+                job_id=item.get('job'),
+                queue=item.get('queue'),
+                priority=item.get('priority'),
+            )
+            for item in self.validated_data['tasks']
+        ]
+
+
+class TaskSubmitResponseSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    ids = serializers.ListField(child=serializers.IntegerField())
+
+    @classmethod
+    def build_(cls, tasks):
+        return cls({
+            'count': len(tasks),
+            'ids': [task.id for task in tasks],
+        })
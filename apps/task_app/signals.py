@@ -3,14 +3,39 @@
 ##
 
 ## Django Signals
+from django.db import transaction
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 ## Celery Signals
-from celery.signals import task_failure
+from celery.signals import task_failure, worker_init, worker_process_init, worker_process_shutdown
+
+## Django Utilities
+from django.utils import timezone
 
 ## Models
-from apps.task_app.models import Task, CeleryTask
+from apps.task_app.models import Task
+
+## Task IDs
+from apps.task_app.task_ids import resolve_task_id
+
+## Transitions
+from apps.task_app.transitions import transition, task_transitioned
+
+## Admission
+from apps.task_app.admission import ACTIVE_STATUSES, release_job_slot
+
+## Counters
+from apps.task_app.counters import record_created, record_deleted
+
+## Checkpoints
+from apps.task_app.checkpoint import flush_all_checkpoints, install_terminate_handler
+
+## Runners
+from apps.task_app.runners import load_runners
+
+## Dashboard
+from apps.task_app.dashboard import publish_task_deltas
 
 
 @receiver(post_save, sender=Task)
@@ -18,7 +43,8 @@ def post_create_task_handler(sender, instance, created, **kwargs):
     """
     Signal handler triggered after a Task instance is saved.
 
-    - If the instance is newly created, it will automatically launch the task.
+    - If the instance is newly created, it is counted in its job, then launched, and
+      shown on the dashboards once committed.
 
     Args:
         sender (Model): The model class that sent the signal (Task).
@@ -27,7 +53,9 @@ def post_create_task_handler(sender, instance, created, **kwargs):
         kwargs (dict): Additional keyword arguments.
     """
     if created:
+        record_created([instance])
         instance.launch()
+        transaction.on_commit(lambda: publish_task_deltas([instance]))
 
 
 @receiver(post_delete, sender=Task)
@@ -36,6 +64,7 @@ def post_delete_task_handler(sender, instance, **kwargs):
     Signal handler triggered after a Task instance is deleted.
 
     - This will automatically purge the task's logs and related data.
+    - The task is removed from its job's counters, and from the dashboards once committed.
 
     Args:
         sender (Model): The model class that sent the signal (Task).
@@ -43,6 +72,57 @@ def post_delete_task_handler(sender, instance, **kwargs):
         kwargs (dict): Additional keyword arguments.
     """
     instance.purge()
+    record_deleted(instance)
+    transaction.on_commit(lambda: publish_task_deltas([instance], deleted=True))
+
+
+@receiver(task_transitioned, sender=Task)
+def task_transitioned_handler(sender, task, status, was_active=False, **kwargs):
+    """
+    Signal handler triggered after a Task changes status.
+
+    - When a task of a job stops holding a concurrency slot, i.e. leaves STARTING/RUNNING,
+      the slot is handed to the next queued launch, see `release_job_slot`.
+
+    Args:
+        sender (Model): The model class that sent the signal (Task).
+        task (Task): The task that was moved.
+        status (str): The status the task was moved to.
+        was_active (bool): Whether the task was STARTING or RUNNING before.
+        kwargs (dict): Additional keyword arguments.
+    """
+    if task.job_id is not None and was_active and status not in ACTIVE_STATUSES:
+        release_job_slot(task.job_id)
+
+
+@worker_init.connect
+def worker_init_handler(**kwargs):
+    """
+    Signal handler triggered when a Celery worker starts, before its pool is forked.
+
+    - Resolves the task runner registry once, so child processes inherit it.
+    """
+    load_runners()
+
+
+@worker_process_init.connect
+def worker_process_init_handler(**kwargs):
+    """
+    Signal handler triggered when a Celery worker child process starts.
+
+    - Flushes buffered task progress before the child is terminated (e.g. by a revoke).
+    """
+    install_terminate_handler()
+
+
+@worker_process_shutdown.connect
+def worker_process_shutdown_handler(**kwargs):
+    """
+    Signal handler triggered when a Celery worker child process shuts down.
+
+    - Flushes the buffered progress of any task still running in this process.
+    """
+    flush_all_checkpoints()
 
 
 @task_failure.connect
@@ -51,6 +131,7 @@ def task_failure_handler(sender=None, task_id=None, exception=None, args=None, k
     Signal handler for Celery task failure events.
 
     - Sets the status of the Task to FAILED if the task fails during execution.
+    - The Task is resolved from the message headers, so no lookup is needed.
 
     Args:
         sender (Task): The task class that failed.
@@ -62,11 +143,12 @@ def task_failure_handler(sender=None, task_id=None, exception=None, args=None, k
         einfo (ExceptionInfo): Exception information.
         extra (dict): Additional keyword arguments.
     """
-    print(f'Failure: {task_id}')
-    if task_id:
-        task = Task.objects.get(celery_task_id=task_id)
-        task.status = Task.Status.FAILED
-        task.save()
+    task_app_task_id = resolve_task_id(sender.request) if sender else None
+
+    if task_app_task_id is None: # This might happen when Job is triggered
+        return
+
+    transition([task_app_task_id], Task.Status.FAILED, finished_at=timezone.now())
 
 
 from asgiref.sync import async_to_sync
@@ -93,22 +175,31 @@ async def send_chat_message(task_id, message):
 # Celery task success signal handler
 @task_success.connect
 def task_success_handler(sender, result, **kwargs):
-    
-    #celery_task_id = sender.request.id  
+    """
+    Signal handler for Celery task success events.
 
-    try:
-        task = CeleryTask.objects.get(celery_task_id=sender.request.id).task
-    except CeleryTask.DoesNotExist: # This might happen when Job is triggered
+    - Sends the final state of the Task to its WebSocket group.
+    - The state comes from the result of the Celery task itself, so no lookup is needed;
+      results without a Task state (e.g. Job tasks, chunks) are ignored.
+
+    Args:
+        sender (Task): The task class that succeeded.
+        result (dict): The value returned by the task.
+        kwargs (dict): Additional keyword arguments.
+    """
+    if not isinstance(result, dict) or 'task_id' not in result:
         return
 
+    finished_at = result.get('finished_at')
+
     # Send the message to the appropriate WebSocket group (task-specific group)
     channel_layer = get_channel_layer()
     
     async_to_sync(channel_layer.group_send)(
-            f"task_{task.id}",  # Room group name
+            f"task_{result['task_id']}",  # Room group name
             {
                 'type': 'celery_task_update',  # The name of the method in the consumer to call
-                'status': task.status,
-                'finished_at': task.finished_at.strftime('%d de %B de %Y às %H:%M')
+                'status': result['status'],
+                'finished_at': finished_at.strftime('%d de %B de %Y às %H:%M') if finished_at else None
             }
         )
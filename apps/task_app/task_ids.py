@@ -0,0 +1,106 @@
+###
+# General imports
+##
+
+## Default
+import threading
+from collections import OrderedDict
+
+## Django
+from django.conf import settings
+
+
+# Celery message header carrying the ID of the Task a Celery task runs for
+TASK_ID_HEADER = 'task_app_task_id'
+
+
+###
+# Celery ID -> Task ID Mapping
+##
+
+class TaskIdCache:
+    """
+    Small in-process LRU mapping Celery task IDs to Task IDs.
+
+    Only successful lookups are cached, so a Celery task whose `CeleryTask` row was not
+    committed yet is looked up again next time.
+
+    Attributes:
+        max_size (int): Maximum number of entries kept.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, celery_task_id):
+        with self._lock:
+            task_id = self._entries.get(celery_task_id)
+            if task_id is not None:
+                self._entries.move_to_end(celery_task_id)
+            return task_id
+
+    def set(self, celery_task_id, task_id):
+        with self._lock:
+            self._entries[celery_task_id] = task_id
+            self._entries.move_to_end(celery_task_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+task_id_cache = TaskIdCache(settings.TASK_ID_CACHE_SIZE)
+
+
+###
+# Helper Functions
+##
+
+def task_headers(task_id):
+    """
+    Returns the Celery message headers routing a Celery task to its Task.
+
+    Args:
+        task_id (int): ID of the Task.
+
+    Returns:
+        dict: The headers to pass to `apply_async`.
+    """
+    return {TASK_ID_HEADER: task_id}
+
+
+def resolve_task_id(request):
+    """
+    Resolves the Task a Celery task runs for.
+
+    - Reads the Task ID from the message headers, without any query.
+    - Falls back to the in-process LRU, then to a single indexed lookup on `CeleryTask`
+      for messages published without the header (e.g. tasks triggered by a Job).
+
+    Args:
+        request (celery.app.task.Context): The request of the Celery task.
+
+    Returns:
+        int: The ID of the Task, or None if the Celery task does not belong to one.
+    """
+    from apps.task_app.models import CeleryTask
+
+    task_id = getattr(request, TASK_ID_HEADER, None)
+    if task_id is None:
+        task_id = (getattr(request, 'headers', None) or {}).get(TASK_ID_HEADER)
+    if task_id is not None:
+        return task_id
+
+    celery_task_id = getattr(request, 'id', None)
+    if not celery_task_id:
+        return None
+
+    task_id = task_id_cache.get(celery_task_id)
+    if task_id is not None:
+        return task_id
+
+    task_id = CeleryTask.objects.filter(celery_task_id=celery_task_id).values_list('task_id', flat=True).first()
+    if task_id is not None:
+        task_id_cache.set(celery_task_id, task_id)
+
+    return task_id
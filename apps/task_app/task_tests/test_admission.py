@@ -0,0 +1,171 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task, Job
+from apps.user_app.models import User
+
+
+##
+#   Functions
+#
+
+from apps.task_app.admission import AdmissionDecision, admit_job_launch, get_admission_stats, release_job_slot
+from apps.task_app.transitions import transition
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Admission Control
+#
+##
+
+class JobAdmissionTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='admission@example.com', password='password123')
+        self.job = Job.objects.bulk_create([Job(
+            name='Admission Job',
+            type=Task.TaskType.SMALL,
+            created_by=self.user,
+            max_concurrency=2,
+        )])[0]
+
+    def _run_tasks(self, count):
+        Task.objects.bulk_create([Task(type=Task.TaskType.SMALL, job=self.job, status=Task.Status.RUNNING) for _ in range(count)])
+
+    def _admit(self):
+        with admit_job_launch(self.job) as decision:
+            return decision
+
+    def test_admits_until_limit(self):
+        """Test that launches are admitted while the job is under its limit, and skipped past it."""
+
+        print_prologue()
+
+        self._run_tasks(1)
+        self.assertEqual(self._admit(), AdmissionDecision.ADMITTED)
+
+        self._run_tasks(1)
+        self.assertEqual(self._admit(), AdmissionDecision.SKIPPED)
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.queued_launches, 0)
+
+        print("\n")
+
+    def test_queue_and_coalesce_policies(self):
+        """Test that QUEUE counts every rejected launch while COALESCE keeps at most one."""
+
+        print_prologue()
+
+        self._run_tasks(2)
+
+        Job.objects.filter(id=self.job.id).update(overflow_policy=Job.OverflowPolicy.QUEUE)
+        self.assertEqual(self._admit(), AdmissionDecision.QUEUED)
+        self.assertEqual(self._admit(), AdmissionDecision.QUEUED)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.queued_launches, 2)
+
+        Job.objects.filter(id=self.job.id).update(overflow_policy=Job.OverflowPolicy.COALESCE, queued_launches=0)
+        self.assertEqual(self._admit(), AdmissionDecision.QUEUED)
+        self.assertEqual(self._admit(), AdmissionDecision.COALESCED)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.queued_launches, 1)
+
+        stats = get_admission_stats()[self.job.id]
+        self.assertEqual(stats['active'], 2)
+        self.assertEqual(stats['queue_depth'], 1)
+        self.assertEqual(stats['queued'], 3)
+        self.assertEqual(stats['skipped'], 0)
+        self.assertEqual(stats['coalesced'], 1)
+
+        print("\n")
+
+    def test_release_sends_queued_launch(self):
+        """Test that a freed slot relaunches the job once per queued launch."""
+
+        print_prologue()
+
+        Job.objects.filter(id=self.job.id).update(queued_launches=1)
+
+        with patch('apps.task_app.tasks._launch_job.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertTrue(release_job_slot(self.job.id))
+                self.assertFalse(release_job_slot(self.job.id))
+
+        delay.assert_called_once_with(self.job.id)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.queued_launches, 0)
+
+        print("\n")
+
+    def test_only_active_tasks_release(self):
+        """Test that a slot is only released by a task leaving STARTING/RUNNING, not by moves between other statuses."""
+
+        print_prologue()
+
+        running, paused = Task.objects.bulk_create([
+            Task(type=Task.TaskType.SMALL, job=self.job, status=Task.Status.RUNNING),
+            Task(type=Task.TaskType.SMALL, job=self.job, status=Task.Status.PAUSED),
+        ])
+        Job.objects.filter(id=self.job.id).update(queued_launches=2)
+
+        with patch('apps.task_app.tasks._launch_job.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                transition([paused.id], Task.Status.CANCELED)
+            delay.assert_not_called()
+
+            with self.captureOnCommitCallbacks(execute=True):
+                transition([running.id], Task.Status.CANCELED)
+            delay.assert_called_once_with(self.job.id)
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.queued_launches, 1)
+
+        print("\n")
+
+    @override_settings(TASK_MAX_CONCURRENCY=1)
+    def test_release_drains_other_jobs_under_global_limit(self):
+        """Test that a slot freed under the global limit goes to another job's queued launch when the job has none."""
+
+        print_prologue()
+
+        other = Job.objects.bulk_create([Job(
+            name='Queued Job',
+            type=Task.TaskType.SMALL,
+            created_by=self.user,
+            overflow_policy=Job.OverflowPolicy.COALESCE,
+            queued_launches=1,
+        )])[0]
+
+        with patch('apps.task_app.tasks._launch_job.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertTrue(release_job_slot(self.job.id))
+
+        delay.assert_called_once_with(other.id)
+        other.refresh_from_db()
+        self.assertEqual(other.queued_launches, 0)
+
+        print("\n")
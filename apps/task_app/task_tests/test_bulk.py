@@ -0,0 +1,175 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.test import TestCase, RequestFactory
+
+##
+#   Extras
+#
+
+from unittest import mock
+from rest_framework.test import force_authenticate
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task, CeleryTask
+from apps.user_app.models import User
+
+
+##
+#   Functions
+#
+
+from apps.task_app.api_views import TaskBulkActionView, TaskSubmitView
+from apps.task_app.transitions import cancel_tasks, resume_tasks, submit_tasks
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Bulk Task Operations
+#
+##
+
+class TaskBulkOperationsTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = User.objects.create_superuser(email='bulk@example.com', password='password123')
+
+        self.tasks = Task.objects.bulk_create([
+            Task(type=Task.TaskType.SMALL, status=status)
+            for status in [Task.Status.RUNNING] * 3 + [Task.Status.PAUSED] * 2 + [Task.Status.FINISHED]
+        ])
+        self.task_ids = [task.id for task in self.tasks]
+
+    def post(self, data, view=TaskBulkActionView):
+        request = self.factory.post('/api/v1/task/bulk', data=data, content_type='application/json')
+        force_authenticate(request, user=self.user)
+        response = view.as_view()(request)
+        response.render()
+        return response
+
+    def test_cancel_by_ids(self):
+        """Test that canceling by IDs moves every unfinished task and skips the finished one."""
+
+        print_prologue()
+
+        canceled = cancel_tasks(self.task_ids)
+
+        self.assertEqual(len(canceled), 5)
+        self.assertEqual(Task.objects.filter(status=Task.Status.CANCELED).count(), 5)
+
+        print("\n")
+
+    def test_resume_launches_in_one_batch(self):
+        """Test that resuming creates every CeleryTask row at once and publishes one message per task."""
+
+        print_prologue()
+
+        with mock.patch('apps.task_app.outbox._launch_task') as launch_task:
+            with self.captureOnCommitCallbacks(execute=True):
+                resumed = resume_tasks(self.task_ids)
+
+        self.assertEqual(sorted(task.id for task in resumed), self.task_ids[3:5])
+        self.assertEqual(launch_task.apply_async.call_count, 2)
+        self.assertEqual(CeleryTask.objects.filter(task_id__in=self.task_ids[3:5]).count(), 2)
+
+        print("\n")
+
+    def test_api_pause_by_filter(self):
+        """Test that the bulk endpoint applies the action to the tasks matching a filter."""
+
+        print_prologue()
+
+        response = self.post({'action': 'pause', 'filters': {'status': Task.Status.RUNNING}})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(Task.objects.filter(status=Task.Status.PAUSED).count(), 5)
+
+        print("\n")
+
+    def test_api_rejects_ids_and_filters(self):
+        """Test that the bulk endpoint requires either IDs or a filter, not both."""
+
+        print_prologue()
+
+        response = self.post({'action': 'cancel', 'ids': self.task_ids, 'filters': {'status': Task.Status.RUNNING}})
+
+        self.assertEqual(response.status_code, 400)
+
+        print("\n")
+
+    def test_api_rejects_unknown_or_empty_filters(self):
+        """Test that the bulk endpoint refuses filters that would match every task."""
+
+        print_prologue()
+
+        for filters in ({'state': Task.Status.RUNNING}, {'status': ''}, {}):
+            response = self.post({'action': 'cancel', 'filters': filters})
+            self.assertEqual(response.status_code, 400)
+
+        self.assertFalse(Task.objects.filter(status=Task.Status.CANCELED).exists())
+
+        print("\n")
+
+    def test_submit_publishes_after_commit(self):
+        """Test that a bulk submission inserts every row and publishes only once committed."""
+
+        print_prologue()
+
+        with mock.patch('apps.task_app.outbox._launch_task') as launch_task:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                tasks = submit_tasks([Task(type=Task.TaskType.SMALL) for _ in range(20)])
+
+            self.assertEqual(launch_task.apply_async.call_count, 0)
+
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(len(tasks), 20)
+        self.assertEqual(launch_task.apply_async.call_count, 20)
+        self.assertEqual(CeleryTask.objects.filter(task__in=tasks).count(), 20)
+
+        print("\n")
+
+    def test_api_submit_rejects_unknown_job(self):
+        """Test that the submit endpoint validates the referenced jobs."""
+
+        print_prologue()
+
+        response = self.post({'tasks': [{'type': Task.TaskType.SMALL, 'job': 999999}]}, view=TaskSubmitView)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Task.objects.count(), len(self.tasks))
+
+        print("\n")
+
+    def test_api_submit_ignores_debug_mode(self):
+        """Test that the submit endpoint never creates debug tasks, which would run inside its transaction."""
+
+        print_prologue()
+
+        with mock.patch('apps.task_app.outbox._launch_task') as launch_task:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.post({'tasks': [{'type': Task.TaskType.SMALL, 'debug_mode': True}]}, view=TaskSubmitView)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(Task.objects.get(id=response.data['ids'][0]).debug_mode)
+        self.assertEqual(launch_task.apply_async.call_count, 1)
+
+        print("\n")
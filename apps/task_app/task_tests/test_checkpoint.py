@@ -0,0 +1,137 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.test import TestCase, override_settings
+
+##
+#   Extras
+#
+
+from unittest import mock
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task
+
+
+##
+#   Functions
+#
+
+from apps.task_app import checkpoint as checkpoint_module
+from apps.task_app.checkpoint import TaskCheckpoint, TaskTerminated, flush_all_checkpoints, request_terminate
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Task Checkpoint
+#
+##
+
+class TaskCheckpointTestCase(TestCase):
+    def setUp(self):
+        """Create a task without triggering the launch signal."""
+
+        self.task = Task.objects.bulk_create([Task(type=Task.TaskType.LARGE, status=Task.Status.RUNNING)])[0]
+
+    def test_steps_are_buffered_until_due(self):
+        """Test that advancing below the thresholds does not hit the database."""
+
+        print_prologue()
+
+        checkpoint = TaskCheckpoint(self.task, interval=3600, steps=10)
+
+        with self.assertNumQueries(0):
+            for step in range(2, 11):
+                checkpoint.advance(step)
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.step, 1)
+
+        print("\n")
+
+    def test_flush_when_step_interval_is_reached(self):
+        """Test that reaching the step interval persists the step in a single query."""
+
+        print_prologue()
+
+        checkpoint = TaskCheckpoint(self.task, interval=3600, steps=10)
+
+        with self.assertNumQueries(1):
+            for step in range(2, 12):
+                checkpoint.advance(step)
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.step, 11)
+
+        print("\n")
+
+    def test_flush_on_exit(self):
+        """Test that leaving the checkpoint persists the last step and extra fields."""
+
+        print_prologue()
+
+        with TaskCheckpoint(self.task, interval=3600, steps=1000) as checkpoint:
+            checkpoint.advance(42)
+            checkpoint.flush(status=Task.Status.FINISHED)
+            checkpoint.advance(43)
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.step, 43)
+        self.assertEqual(self.task.status, Task.Status.FINISHED)
+
+        print("\n")
+
+    def test_flush_all_checkpoints(self):
+        """Test that open checkpoints are flushed when the worker shuts down."""
+
+        print_prologue()
+
+        with TaskCheckpoint(self.task, interval=3600, steps=1000) as checkpoint:
+            checkpoint.advance(7)
+            flush_all_checkpoints()
+
+            self.task.refresh_from_db()
+            self.assertEqual(self.task.step, 7)
+
+        print("\n")
+
+    @override_settings(TASK_TERMINATE_GRACE=3600)
+    def test_terminate_flushes_at_next_step(self):
+        """Test that a terminate request makes the run stop at its next step, flushing before the process terminates."""
+
+        print_prologue()
+
+        deliver = mock.Mock()
+        self.addCleanup(setattr, checkpoint_module, '_terminate', None)
+
+        with self.assertRaises(TaskTerminated):
+            with TaskCheckpoint(self.task, interval=3600, steps=10) as checkpoint:
+                checkpoint.advance(2)
+                request_terminate(deliver)
+                self.addCleanup(checkpoint_module._terminate_timer.cancel)
+
+                # Only flagged, nothing runs from the signal handler itself
+                deliver.assert_not_called()
+                checkpoint.advance(3)
+
+        deliver.assert_called_once_with()
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.step, 3)
+
+        print("\n")
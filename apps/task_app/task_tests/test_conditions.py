@@ -0,0 +1,121 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from unittest.mock import patch
+
+from django.test import TestCase
+
+##
+#   Extras
+#
+
+import logging
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task, Job, MaxRecordsCondition
+from apps.user_app.models import User
+
+
+##
+#   Functions
+#
+
+from apps.task_app.runners import CountingTaskRunner, register_runner, get_runner, _registry
+from apps.task_app.conditions import ConditionReached, ThroughputEvaluator, get_stopping_evaluator
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Stopping Conditions
+#
+##
+
+class StoppingConditionTestCase(TestCase):
+    def setUp(self):
+        """Register a fast counting runner, and a job stopping after 3 records."""
+
+        @register_runner('TESTING')
+        class TestingTaskRunner(CountingTaskRunner):
+            max_count = 10
+            delay = 0
+
+        self.runner = get_runner('TESTING')
+        self.logger = logging.getLogger('task_tests')
+
+        user = User.objects.create_user(email='conditions@example.com', password='password123')
+        self.job = Job.objects.bulk_create([Job(
+            name='Conditions Job',
+            type='TESTING',
+            created_by=user,
+            stopping_condition=MaxRecordsCondition.objects.create(max_records=3),
+        )])[0]
+        self.task = Task.objects.bulk_create([Task(type='TESTING', job=self.job, status=Task.Status.RUNNING)])[0]
+
+    def tearDown(self):
+        _registry.pop('TESTING', None)
+
+    def test_max_records_stops_run(self):
+        """Test that a run stops itself once it processed max_records steps, without extra queries per step."""
+
+        print_prologue()
+
+        condition = get_stopping_evaluator(self.job)
+        self.assertEqual(condition.status, Task.Status.STOPPED)
+
+        # Checkpoint flush, transition and job counters only, whatever the number of steps
+        with self.assertNumQueries(3):
+            status = self.runner.execute(self.task, self.logger, continue_mode=False, condition=condition)
+
+        self.task.refresh_from_db()
+        self.assertEqual(status, Task.Status.STOPPED)
+        self.assertEqual(self.task.status, Task.Status.STOPPED)
+        self.assertEqual(self.task.step, 4)
+
+        print("\n")
+
+    def test_continue_mode_pauses(self):
+        """Test that in continue mode the condition pauses the task, so the job resumes it."""
+
+        print_prologue()
+
+        Job.objects.filter(id=self.job.id).update(continue_mode=True)
+        self.job.refresh_from_db()
+
+        self.assertEqual(get_stopping_evaluator(self.job).status, Task.Status.PAUSED)
+
+        print("\n")
+
+    def test_throughput_below_minimum(self):
+        """Test that the throughput condition only triggers once a window is slower than the minimum."""
+
+        print_prologue()
+
+        evaluator = ThroughputEvaluator(Task.Status.STOPPED, min_throughput=10, window=60)
+
+        with patch('apps.task_app.conditions.time.monotonic', return_value=0):
+            evaluator.start(1)
+        with patch('apps.task_app.conditions.time.monotonic', return_value=30):
+            evaluator.check(2)
+        with patch('apps.task_app.conditions.time.monotonic', return_value=60):
+            evaluator.check(1000)
+        with patch('apps.task_app.conditions.time.monotonic', return_value=120):
+            with self.assertRaises(ConditionReached):
+                evaluator.check(1100)
+
+        print("\n")
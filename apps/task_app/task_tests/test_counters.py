@@ -0,0 +1,134 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.apps import apps
+from django.test import TestCase
+
+##
+#   Extras
+#
+
+from importlib import import_module
+from unittest import mock
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task, Job
+from apps.user_app.models import User
+
+
+##
+#   Functions
+#
+
+from apps.task_app.transitions import submit_tasks, transition, cancel_tasks
+from apps.task_app.counters import repair_job_counters
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Job Counters
+#
+##
+
+class JobCountersTestCase(TestCase):
+    def setUp(self):
+        for target in ('apps.task_app.outbox._launch_task', 'apps.task_app.transitions._enforce_task_interrupt'):
+            patcher = mock.patch(target)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        user = User.objects.create_user(email='counters@example.com', password='password123')
+        self.job = Job.objects.bulk_create([Job(name='Counters Job', type=Task.TaskType.SMALL, created_by=user)])[0]
+
+    def assertCounters(self, running_count, total_tasks, last_task_status):
+        self.job.refresh_from_db()
+        self.assertEqual(
+            (self.job.running_count, self.job.total_tasks, self.job.last_task_status),
+            (running_count, total_tasks, last_task_status),
+        )
+
+    def test_transitions_keep_counters(self):
+        """Test that creating and moving tasks keeps the job counters in step."""
+
+        print_prologue()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first, second = submit_tasks([Task(type=Task.TaskType.SMALL, job=self.job) for _ in range(2)])
+        self.assertCounters(2, 2, Task.Status.STARTING)
+
+        transition([first.id], Task.Status.RUNNING)
+        transition([first.id], Task.Status.FINISHED)
+        self.assertCounters(1, 2, Task.Status.STARTING)
+        self.assertIsNotNone(self.job.last_run)
+
+        cancel_tasks([second.id])
+        self.assertCounters(0, 2, Task.Status.CANCELED)
+
+        Task.objects.get(id=second.id).delete()
+        self.assertCounters(0, 1, Task.Status.CANCELED)
+
+        print("\n")
+
+    def test_job_saves_keep_counters(self):
+        """Test that saving a job read before its counters changed does not write them back."""
+
+        print_prologue()
+
+        job = Job.objects.get(id=self.job.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            submit_tasks([Task(type=Task.TaskType.SMALL, job=self.job)])
+        Job.objects.filter(id=self.job.id).update(queued_launches=1)
+
+        job.pause()
+        self.assertCounters(1, 1, Task.Status.STARTING)
+        self.assertEqual(self.job.queued_launches, 1)
+        self.assertFalse(self.job.enabled)
+
+        print("\n")
+
+    def test_repair_recomputes_counters(self):
+        """Test that the repair recomputes the counters from the tasks."""
+
+        print_prologue()
+
+        Task.objects.bulk_create([
+            Task(type=Task.TaskType.SMALL, job=self.job, status=Task.Status.RUNNING),
+            Task(type=Task.TaskType.SMALL, job=self.job, status=Task.Status.PAUSED),
+        ])
+        self.assertCounters(0, 0, None)
+
+        self.assertEqual(repair_job_counters(), 1)
+        self.assertCounters(1, 2, Task.Status.PAUSED)
+
+        print("\n")
+
+    def test_migration_backfills_counters(self):
+        """Test that the migration adding the counters computes them for the existing jobs."""
+
+        print_prologue()
+
+        Task.objects.bulk_create([
+            Task(type=Task.TaskType.SMALL, job=self.job, status=Task.Status.RUNNING),
+            Task(type=Task.TaskType.SMALL, job=self.job, status=Task.Status.FINISHED),
+        ])
+
+        import_module('apps.task_app.migrations.0032_job_counters').backfill_job_counters(apps, None)
+        self.assertCounters(1, 2, Task.Status.FINISHED)
+
+        print("\n")
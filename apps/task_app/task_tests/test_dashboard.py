@@ -0,0 +1,118 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import TransactionTestCase, override_settings
+
+##
+#   Extras
+#
+
+from asgiref.sync import sync_to_async
+from channels.testing import WebsocketCommunicator
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task, Job
+from apps.user_app.models import User
+
+
+##
+#   Functions
+#
+
+from apps.task_app.dashboard import publish_task_deltas
+from apps.common.tests.functions import print_prologue
+from config.websocket.consumers import DashboardConsumer
+
+
+###
+#
+#       Dashboard
+#
+##
+
+@override_settings(
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    DASHBOARD_FRAME_INTERVAL=0.05,
+)
+class DashboardTestCase(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(email='dashboard@example.com', password='password123')
+        self.job = Job.objects.bulk_create([Job(name='Dashboard Job', type=Task.TaskType.SMALL, created_by=self.user)])[0]
+        self.followed, self.other = Task.objects.bulk_create([
+            Task(type=Task.TaskType.SMALL, job=self.job),
+            Task(type=Task.TaskType.SMALL, job=self.job),
+        ])
+
+    async def _connect(self, user):
+        communicator = WebsocketCommunicator(DashboardConsumer.as_asgi(), '/ws/dashboard/')
+        communicator.scope['user'] = user
+        connected, _ = await communicator.connect()
+        return communicator, connected
+
+    def _move(self, *statuses):
+        for status in statuses:
+            Task.objects.filter(id=self.followed.id).update(status=status)
+            Job.objects.filter(id=self.job.id).update(running_count=int(status == Task.Status.RUNNING))
+            publish_task_deltas(Task.objects.filter(job=self.job))
+
+    async def test_deltas_are_filtered_and_merged(self):
+        """Test that a client gets a snapshot, then one frame with the latest fields of the ids it follows only."""
+
+        print_prologue()
+
+        communicator, connected = await self._connect(self.user)
+        self.assertTrue(connected)
+
+        await communicator.send_json_to({'action': 'subscribe', 'tasks': [self.followed.id], 'jobs': [self.job.id]})
+        snapshot = await communicator.receive_json_from()
+        self.assertEqual(snapshot['type'], 'snapshot')
+        self.assertEqual(snapshot['tasks'][str(self.followed.id)]['status'], Task.Status.STARTING)
+        self.assertEqual(snapshot['jobs'][str(self.job.id)]['running_count'], 0)
+
+        # Two changes within a frame window are sent as one delta
+        await sync_to_async(self._move)(Task.Status.RUNNING, Task.Status.FINISHED)
+
+        frame = await communicator.receive_json_from()
+        self.assertEqual(frame['type'], 'deltas')
+        self.assertEqual(frame['seq'], 1)
+        self.assertEqual(list(frame['tasks']), [str(self.followed.id)])
+        self.assertEqual(frame['tasks'][str(self.followed.id)]['status'], Task.Status.FINISHED)
+        self.assertEqual(frame['jobs'][str(self.job.id)]['running_count'], 0)
+        self.assertTrue(await communicator.receive_nothing())
+
+        # Following the tasks of the job
+        await communicator.send_json_to({'action': 'subscribe', 'job_tasks': [self.job.id]})
+        await communicator.receive_json_from()
+        await sync_to_async(publish_task_deltas)([self.other], deleted=True)
+        frame = await communicator.receive_json_from()
+        self.assertEqual(frame['tasks'], {str(self.other.id): {'deleted': True}})
+
+        await communicator.disconnect()
+
+        print("\n")
+
+    async def test_anonymous_users_are_refused(self):
+        """Test that the dashboard refuses connections without an authenticated user."""
+
+        print_prologue()
+
+        communicator, connected = await self._connect(AnonymousUser())
+        self.assertFalse(connected)
+
+        print("\n")
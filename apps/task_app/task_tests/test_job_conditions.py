@@ -0,0 +1,89 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.test import TestCase
+from django.utils import timezone
+
+from django_celery_beat.models import CrontabSchedule
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task, Job, TimeCondition, MaxRecordsCondition
+from apps.user_app.models import User
+
+
+##
+#   Functions
+#
+
+from apps.task_app.counters import repair_job_counters
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Job Condition Loading
+#
+##
+
+class JobConditionLoadingTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='loading@example.com', password='password123')
+        self.crontab = CrontabSchedule.objects.create(minute='0', hour='*', day_of_week='*', day_of_month='*', month_of_year='*')
+
+    def _create_jobs(self, count):
+        offset = Job.objects.count()
+        jobs = Job.objects.bulk_create([
+            Job(
+                name=f'Loading Job {offset + index}',
+                type=Task.TaskType.SMALL,
+                created_by=self.user,
+                starting_condition=TimeCondition.objects.create(crontab=self.crontab),
+                stopping_condition=MaxRecordsCondition.objects.create(max_records=10),
+            )
+            for index in range(count)
+        ])
+        Task.objects.bulk_create([Task(type=Task.TaskType.SMALL, job=job, status=Task.Status.FINISHED, finished_at=timezone.now()) for job in jobs])
+        repair_job_counters([job.id for job in jobs])
+
+    def _render(self):
+        return [
+            (str(job.created_by), str(job.starting_condition), str(job.stopping_condition), job.last_run)
+            for job in Job.objects.with_conditions().order_by('-id')
+        ]
+
+    def test_list_queries_are_constant(self):
+        """Test that listing jobs with their creator, conditions and last run costs the same queries for any number of jobs."""
+
+        print_prologue()
+
+        self._create_jobs(2)
+
+        # The content types are cached for the process after the first load
+        self._render()
+
+        with self.assertNumQueries(3):
+            rows = self._render()
+        self.assertEqual(len(rows), 2)
+
+        self._create_jobs(8)
+        with self.assertNumQueries(3):
+            rows = self._render()
+        self.assertEqual(len(rows), 10)
+        self.assertTrue(all(row[1].endswith(str(self.crontab)) and row[3] for row in rows))
+
+        print("\n")
@@ -0,0 +1,211 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import TransactionTestCase, override_settings
+
+##
+#   Extras
+#
+
+import logging
+import os
+import shutil
+import tempfile
+
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task
+from apps.user_app.models import User
+
+
+##
+#   Functions
+#
+
+from apps.task_app.log_channels import ChannelLayerLogHandler
+from apps.task_app.log_files import SegmentedFileHandler
+from apps.common.tests.functions import print_prologue
+from config.websocket.consumers import TaskLogConsumer
+
+
+###
+#
+#       Log Channels
+#
+##
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class LogChannelsTestCase(TransactionTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.log_path = os.path.join(self.directory, 'info.log')
+        self.user = User.objects.create_superuser(email='logs@example.com', password='password123')
+
+    async def test_handler_publishes_lines_with_offsets(self):
+        """Test that logged lines are published in one batch, with the offsets they end at in the log file."""
+
+        print_prologue()
+
+        channel_layer = get_channel_layer()
+        channel = await channel_layer.new_channel()
+        await channel_layer.group_add('task_1', channel)
+
+        file_handler = SegmentedFileHandler(self.log_path)
+        channel_handler = ChannelLayerLogHandler('task_1', file_handler=file_handler)
+        logger = logging.getLogger('task_tests.channels')
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(file_handler)
+        logger.addHandler(channel_handler)
+
+        def log():
+            logger.info('first')
+            logger.info('second\nthird')
+            channel_handler.close()
+            file_handler.close()
+            logger.removeHandler(file_handler)
+            logger.removeHandler(channel_handler)
+
+        await sync_to_async(log)()
+
+        message = await channel_layer.receive(channel)
+        self.assertEqual(message['type'], 'log_lines')
+        self.assertEqual(message['lines'], [['first\n', 6], ['second\n', 13], ['third\n', 19]])
+        with open(self.log_path) as log_file:
+            self.assertEqual(log_file.read(), 'first\nsecond\nthird\n')
+
+        print("\n")
+
+    async def _connect(self, offset):
+        task = (await Task.objects.abulk_create([Task(type=Task.TaskType.SMALL, log_path=self.log_path)]))[0]
+
+        communicator = WebsocketCommunicator(TaskLogConsumer.as_asgi(), f'/ws/task/{task.id}/?offset={offset}')
+        communicator.scope['url_route'] = {'kwargs': {'task_id': task.id}}
+        communicator.scope['user'] = self.user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return task, communicator
+
+    async def test_anonymous_users_are_refused(self):
+        """Test that the log stream refuses connections without an authenticated user."""
+
+        print_prologue()
+
+        task = (await Task.objects.abulk_create([Task(type=Task.TaskType.SMALL, log_path=self.log_path)]))[0]
+
+        communicator = WebsocketCommunicator(TaskLogConsumer.as_asgi(), f'/ws/task/{task.id}/')
+        communicator.scope['url_route'] = {'kwargs': {'task_id': task.id}}
+        communicator.scope['user'] = AnonymousUser()
+        connected, _ = await communicator.connect()
+        self.assertFalse(connected)
+
+        print("\n")
+
+    @override_settings(LOG_FRAME_INTERVAL=0.01)
+    async def test_consumer_relays_lines_once(self):
+        """Test that the consumer sends the lines missed since the page offset, then relays published lines not sent yet."""
+
+        print_prologue()
+
+        with open(self.log_path, 'w') as log_file:
+            log_file.write('line 0\nline 1\n')
+        task, communicator = await self._connect(offset=7)
+        self.assertEqual(await communicator.receive_json_from(), {
+            'type': 'log_lines', 'seq': 1, 'offset': 14, 'lines': [['line 1\n', 14]], 'skipped': 0, 'truncated': False,
+        })
+
+        # Published lines already read from the file are skipped
+        await get_channel_layer().group_send(f'task_{task.id}', {
+            'type': 'log_lines',
+            'lines': [['line 1\n', 14], ['line 2\n', 21]],
+        })
+        self.assertEqual(await communicator.receive_json_from(), {
+            'type': 'log_lines', 'seq': 2, 'offset': 21, 'lines': [['line 2\n', 21]], 'skipped': 0, 'truncated': False,
+        })
+        self.assertTrue(await communicator.receive_nothing())
+
+        await communicator.disconnect()
+
+        print("\n")
+
+    @override_settings(LOG_FRAME_INTERVAL=0.2)
+    async def test_consumer_relays_batches_out_of_order(self):
+        """Test that batches published by several processes, e.g. the chunks of a task, are relayed in any offset order."""
+
+        print_prologue()
+
+        task, communicator = await self._connect(offset=0)
+
+        for lines in ([['chunk 2\n', 16]], [['chunk 1\n', 8]]):
+            await get_channel_layer().group_send(f'task_{task.id}', {'type': 'log_lines', 'lines': lines})
+
+        self.assertEqual(await communicator.receive_json_from(), {
+            'type': 'log_lines', 'seq': 1, 'offset': 16, 'lines': [['chunk 2\n', 16], ['chunk 1\n', 8]], 'skipped': 0, 'truncated': False,
+        })
+
+        await communicator.disconnect()
+
+        print("\n")
+
+    @override_settings(LOG_FRAME_INTERVAL=0.2, LOG_FRAME_BYTES=14, LOG_STREAM_MAX_PENDING_BYTES=21)
+    async def test_consumer_coalesces_and_drops_lines(self):
+        """Test that bursts are coalesced into frames, and the oldest lines dropped and counted past the pending limit."""
+
+        print_prologue()
+
+        task, communicator = await self._connect(offset=0)
+
+        for index in range(5):
+            await get_channel_layer().group_send(f'task_{task.id}', {
+                'type': 'log_lines',
+                'lines': [[f'line {index}\n', 7 * (index + 1)]],
+            })
+
+        self.assertEqual(await communicator.receive_json_from(), {
+            'type': 'log_lines', 'seq': 1, 'offset': 28, 'lines': [['line 2\n', 21], ['line 3\n', 28]], 'skipped': 2, 'truncated': False,
+        })
+        self.assertEqual(await communicator.receive_json_from(), {
+            'type': 'log_lines', 'seq': 2, 'offset': 35, 'lines': [['line 4\n', 35]], 'skipped': 0, 'truncated': False,
+        })
+
+        await communicator.disconnect()
+
+        print("\n")
+
+    @override_settings(LOG_FRAME_INTERVAL=0.01, LOG_RESUME_MAX_BYTES=20)
+    async def test_consumer_resume_is_bounded(self):
+        """Test that a client reconnecting far behind only gets the last lines replayed, flagged as truncated."""
+
+        print_prologue()
+
+        with open(self.log_path, 'w') as log_file:
+            log_file.write(''.join(f'line {index}\n' for index in range(5)))
+        _, communicator = await self._connect(offset=0)
+
+        self.assertEqual(await communicator.receive_json_from(), {
+            'type': 'log_lines', 'seq': 1, 'offset': 35, 'lines': [['line 3\n', 28], ['line 4\n', 35]], 'skipped': 0, 'truncated': True,
+        })
+
+        await communicator.disconnect()
+
+        print("\n")
@@ -0,0 +1,196 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.test import TestCase
+from django.urls import reverse
+
+##
+#   Extras
+#
+
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task
+from apps.user_app.models import User
+
+
+##
+#   Functions
+#
+
+from apps.task_app.log_files import read_tail, read_range, list_segments, purge_log_dir, LogFollower, SegmentedFileHandler
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Log Files
+#
+##
+
+class LogFilesTestCase(TestCase):
+    def setUp(self):
+        """Write a log of 1000 lines, the last one still being written."""
+
+        log_file = tempfile.NamedTemporaryFile('w', suffix='.log', delete=False)
+        log_file.write(''.join(f'line {index}\n' for index in range(1000)) + 'partial')
+        log_file.close()
+
+        self.log_path = log_file.name
+        self.addCleanup(os.remove, self.log_path)
+
+        with open(self.log_path, 'rb') as log_file:
+            self.content = log_file.read()
+
+    def test_tail_then_earlier_ranges(self):
+        """Test that the tail and the earlier ranges join into the whole log, without gaps nor duplicated lines."""
+
+        print_prologue()
+
+        tail = read_tail(self.log_path, lines=5)
+        self.assertEqual(tail.text, ''.join(f'line {index}\n' for index in range(995, 1000)))
+        self.assertEqual(tail.end, len(self.content) - len('partial'))
+
+        chunks = [tail.text]
+        before = tail.start
+        while before > 0:
+            chunk = read_range(self.log_path, before, max_bytes=100)
+            self.assertEqual(chunk.end, before)
+            self.assertTrue(chunk.text.startswith('line '))
+            chunks.insert(0, chunk.text)
+            before = chunk.start
+
+        self.assertEqual(''.join(chunks).encode(), self.content[:tail.end])
+        self.assertIsNone(read_tail(self.log_path + '.missing'))
+
+        print("\n")
+
+    def test_log_endpoint(self):
+        """Test that the log endpoint returns the lines before an offset, and refuses requests without one."""
+
+        print_prologue()
+
+        user = User.objects.create_superuser(email='logs@example.com', password='password123')
+        self.client.force_login(user)
+        task = Task.objects.bulk_create([Task(type=Task.TaskType.SMALL, log_path=self.log_path)])[0]
+
+        tail = read_tail(self.log_path, lines=5)
+        response = self.client.get(reverse('task_log', args=[task.id]), {'before': tail.start})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['end'], tail.start)
+        self.assertTrue(response.json()['text'].endswith('line 994\n'))
+
+        response = self.client.get(reverse('task_log', args=[task.id]))
+        self.assertEqual(response.status_code, 400)
+
+        print("\n")
+
+
+class RotatedLogFilesTestCase(TestCase):
+    def setUp(self):
+        """Log into a handler rolling over every 200 bytes."""
+
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.log_path = os.path.join(self.directory, 'info.log')
+
+        self.handler = SegmentedFileHandler(self.log_path, max_bytes=200)
+        self.addCleanup(self.handler.close)
+        self.logger = logging.getLogger('task_tests.rotation')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def _log(self, start, stop):
+        for index in range(start, stop):
+            self.logger.info(f'line {index}')
+        return ''.join(f'line {index}\n' for index in range(start, stop))
+
+    def test_read_and_follow_across_segments(self):
+        """Test that the log is read back and followed across compressed segments, with stable offsets."""
+
+        print_prologue()
+
+        follower = LogFollower(self.log_path, 0)
+        self.addCleanup(follower.close)
+        expected = self._log(0, 100)
+
+        segments = list_segments(self.log_path)
+        self.assertGreater(len(segments), 2)
+        self.assertTrue(all(segment.path.endswith('.gz') for segment in segments[:-1]))
+
+        # Walk back from the tail through every segment
+        tail = read_tail(self.log_path, lines=3)
+        chunks = [tail.text]
+        before = tail.start
+        while before > 0:
+            chunk = read_range(self.log_path, before, max_bytes=200)
+            chunks.insert(0, chunk.text)
+            before = chunk.start
+        self.assertEqual(''.join(chunks), expected)
+        self.assertEqual(tail.end, len(expected.encode()))
+
+        # Follow the lines logged since the follower opened the log, through several rollovers
+        lines = follower.read_lines()
+        expected += self._log(100, 140)
+        while True:
+            read = follower.read_lines()
+            if not read:
+                break
+            lines += read
+        self.assertEqual(''.join(line for line, _ in lines), expected)
+        self.assertEqual(lines[-1][1], len(expected.encode()))
+
+        print("\n")
+
+    def test_purge_compresses_idle_logs_and_removes_expired_ones(self):
+        """Test that the purge compresses logs no longer written, and removes files past the retention."""
+
+        print_prologue()
+
+        expected = self._log(0, 100)
+        self.handler.close()
+        self.logger.removeHandler(self.handler)
+
+        old_path = os.path.join(self.directory, 'old.log')
+        with open(old_path, 'w') as old_file:
+            old_file.write('old\n')
+
+        day = 60 * 60 * 24
+        os.utime(old_path, (time.time() - 40 * day, time.time() - 40 * day))
+        os.utime(self.log_path, (time.time() - 2 * day, time.time() - 2 * day))
+
+        self.assertEqual(purge_log_dir(self.directory, cutoff=time.time() - 30 * day), 1)
+        self.assertFalse(os.path.exists(old_path))
+
+        # The live file is compressed as the last segment, and still readable
+        self.assertFalse(os.path.exists(self.log_path))
+        self.assertTrue(all(segment.path.endswith('.gz') for segment in list_segments(self.log_path)))
+        self.assertEqual(read_tail(self.log_path, lines=2).text, 'line 98\nline 99\n')
+
+        purge_log_dir(self.directory, cutoff=time.time() + day)
+        self.assertFalse(os.path.exists(self.directory))
+        os.makedirs(self.directory)
+
+        print("\n")
@@ -0,0 +1,94 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.test import TestCase, override_settings
+
+##
+#   Extras
+#
+
+from unittest import mock
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task, TaskLaunch
+
+
+##
+#   Functions
+#
+
+from apps.task_app.outbox import enqueue_launches, dispatch_launches, sweep_launches
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Task Launch Outbox
+#
+##
+
+@override_settings(TASK_OUTBOX_BATCH_SIZE=2)
+class TaskLaunchOutboxTestCase(TestCase):
+    def setUp(self):
+        self.tasks = Task.objects.bulk_create([Task(type=Task.TaskType.SMALL) for _ in range(5)])
+
+        patcher = mock.patch('apps.task_app.outbox._launch_task')
+        self.launch_task = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_launches_are_published_after_commit(self):
+        """Test that launches are only published once the transaction commits, in batches."""
+
+        print_prologue()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_launches(self.tasks)
+            self.assertEqual(self.launch_task.apply_async.call_count, 0)
+
+        self.assertEqual(self.launch_task.apply_async.call_count, 5)
+        self.assertFalse(TaskLaunch.objects.filter(dispatched_at=None).exists())
+
+        print("\n")
+
+    def test_dispatched_launches_are_not_published_twice(self):
+        """Test that a launch already dispatched is skipped by later dispatches."""
+
+        print_prologue()
+
+        launches = enqueue_launches(self.tasks)
+
+        self.assertEqual(dispatch_launches([launch.id for launch in launches]), 5)
+        self.assertEqual(dispatch_launches(), 0)
+        self.assertEqual(self.launch_task.apply_async.call_count, 5)
+
+        print("\n")
+
+    @override_settings(TASK_OUTBOX_DISPATCH_ON_COMMIT=False, TASK_OUTBOX_MAX_RATE=1, TASK_OUTBOX_SWEEP_INTERVAL=3)
+    def test_sweeper_is_throttled(self):
+        """Test that the sweeper publishes at most the configured rate per sweep."""
+
+        print_prologue()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_launches(self.tasks)
+
+        self.assertEqual(sweep_launches(), 3)
+        self.assertEqual(sweep_launches(), 2)
+        self.assertEqual(sweep_launches(), 0)
+
+        print("\n")
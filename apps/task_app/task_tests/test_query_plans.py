@@ -0,0 +1,68 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Functions
+#
+
+from apps.task_app.query_plans import LIST_QUERIES, find_seq_scans
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Query Plans
+#
+##
+
+PLAN = """Limit  (cost=0.29..1.02 rows=10 width=120)
+  ->  Nested Loop  (cost=0.29..730.12 rows=10000 width=120)
+        ->  Parallel Seq Scan on task_app_task  (cost=0.00..180.00 rows=10000 width=100)
+        ->  Index Scan using task_app_job_pkey on task_app_job  (cost=0.29..0.31 rows=1 width=20)
+              Index Cond: (id = task_app_task.job_id)"""
+
+
+class QueryPlanTestCase(TestCase):
+    def test_seq_scans_are_found(self):
+        """Test that sequential scans are found in a plan, and only reported on the given tables."""
+
+        print_prologue()
+
+        self.assertEqual(find_seq_scans(PLAN), ['task_app_task'])
+        self.assertEqual(find_seq_scans(PLAN, {'task_app_task'}), ['task_app_task'])
+        self.assertEqual(find_seq_scans(PLAN, {'task_app_job'}), [])
+
+        print("\n")
+
+    def test_registered_queries_run(self):
+        """Test that every registered list query builds and runs, and that the command refuses other databases."""
+
+        print_prologue()
+
+        for name, build in LIST_QUERIES.items():
+            with self.subTest(name=name):
+                self.assertEqual(list(build()), [])
+
+        # List pages are checked as fetched from a cursor
+        self.assertIn('"task_app_task"."id" <', str(LIST_QUERIES['task_table']().query))
+
+        with self.assertRaises(CommandError):
+            call_command('check_query_plans')
+
+        print("\n")
@@ -0,0 +1,93 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.test import TestCase, override_settings
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task, Job
+from apps.user_app.models import User
+
+
+##
+#   Functions
+#
+
+from apps.task_app.routing import get_type_route, resolve_route, resolve_routes
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Task Routing
+#
+##
+
+class TaskRoutingTestCase(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email='routing@example.com', password='password123')
+        self.job = Job.objects.bulk_create([Job(
+            name='Routing Job',
+            type=Task.TaskType.LARGE,
+            created_by=user,
+            queue=Task.Queue.SHORT,
+            priority=Task.Priority.HIGH,
+        )])[0]
+
+    def test_type_route_follows_resource_class(self):
+        """Test that types are routed to the queue of their runner's resource class."""
+
+        print_prologue()
+
+        self.assertEqual(get_type_route(Task.TaskType.SMALL), (Task.Queue.SHORT, Task.Priority.NORMAL))
+        self.assertEqual(get_type_route(Task.TaskType.LARGE), (Task.Queue.LONG, Task.Priority.NORMAL))
+
+        with override_settings(TASK_TYPE_ROUTES={'SMALL': {'queue': Task.Queue.LONG, 'priority': Task.Priority.LOW}}):
+            self.assertEqual(get_type_route(Task.TaskType.SMALL), (Task.Queue.LONG, Task.Priority.LOW))
+
+        print("\n")
+
+    def test_task_overrides_job_overrides_type(self):
+        """Test that a task's own route wins over its job's, which wins over its type's."""
+
+        print_prologue()
+
+        task = Task(type=Task.TaskType.LARGE, job=self.job)
+        self.assertEqual(resolve_route(task, self.job), (Task.Queue.SHORT, Task.Priority.HIGH))
+
+        task.priority = Task.Priority.LOW
+        self.assertEqual(resolve_route(task, self.job), (Task.Queue.SHORT, Task.Priority.LOW))
+
+        print("\n")
+
+    def test_resolve_routes_loads_jobs_once(self):
+        """Test that routing many tasks loads their jobs in a single query."""
+
+        print_prologue()
+
+        tasks = Task.objects.bulk_create(
+            [Task(type=Task.TaskType.LARGE, job=self.job) for _ in range(5)]
+            + [Task(type=Task.TaskType.LARGE)]
+        )
+
+        with self.assertNumQueries(1):
+            routes = resolve_routes(tasks)
+
+        self.assertEqual(routes[tasks[0].id], (Task.Queue.SHORT, Task.Priority.HIGH))
+        self.assertEqual(routes[tasks[-1].id], (Task.Queue.LONG, Task.Priority.NORMAL))
+
+        print("\n")
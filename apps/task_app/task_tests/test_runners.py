@@ -0,0 +1,218 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.test import TestCase
+
+##
+#   Extras
+#
+
+import logging
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task, TaskChunk
+
+
+##
+#   Functions
+#
+
+from apps.task_app.runners import CountingTaskRunner, RunnerStats, register_runner, get_runner, get_runner_stats, _registry
+from apps.task_app.control import TaskControl, request_interrupt, get_unacknowledged
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Task Runners
+#
+##
+
+class TaskRunnerRegistryTestCase(TestCase):
+    def setUp(self):
+        """Register a fast counting runner for a dedicated task type."""
+
+        @register_runner('TESTING')
+        class TestingTaskRunner(CountingTaskRunner):
+            max_count = 5
+            delay = 0
+
+        self.runner = get_runner('TESTING')
+        self.runner.stats.reset()
+        self.logger = logging.getLogger('task_tests')
+        self.task = Task.objects.bulk_create([Task(type='TESTING', status=Task.Status.RUNNING)])[0]
+
+    def tearDown(self):
+        self.runner.stats.reset()
+        _registry.pop('TESTING', None)
+
+    def test_builtin_runners_are_registered(self):
+        """Test that every task type has a runner."""
+
+        print_prologue()
+
+        for task_type in Task.TaskType.values:
+            self.assertEqual(get_runner(task_type).type, task_type)
+
+        print("\n")
+
+    def test_unknown_type_raises(self):
+        """Test that looking up an unregistered type raises a LookupError."""
+
+        print_prologue()
+
+        with self.assertRaises(LookupError):
+            get_runner('UNKNOWN')
+
+        print("\n")
+
+    def test_execute_finishes_task_and_counts_steps(self):
+        """Test that a run finishes the task and updates the runner counters."""
+
+        print_prologue()
+
+        self.runner.execute(self.task, self.logger, continue_mode=False)
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, Task.Status.FINISHED)
+        self.assertEqual(self.task.step, 5)
+
+        stats = self.runner.stats.as_dict()
+        self.assertEqual(stats['started'], 1)
+        self.assertEqual(stats['finished'], 1)
+        self.assertEqual(stats['steps'], 4)
+
+        print("\n")
+
+    def test_stats_are_shared_between_processes(self):
+        """Test that counters recorded by one runner instance are read by another, as in another worker process."""
+
+        print_prologue()
+
+        self.runner.execute(self.task, self.logger, continue_mode=False)
+
+        stats = get_runner_stats()['TESTING']
+        self.assertEqual(RunnerStats('TESTING').as_dict(), stats)
+        self.assertEqual(stats['finished'], 1)
+        self.assertEqual(stats['steps'], 4)
+
+        print("\n")
+
+    def test_execute_keeps_concurrent_cancel(self):
+        """Test that a task canceled while finishing its last step stays canceled."""
+
+        print_prologue()
+
+        runner = get_runner('TESTING')
+        runner.finalize = lambda task, step, logger: Task.objects.filter(id=task.id).update(status=Task.Status.CANCELED)
+
+        self.assertEqual(runner.execute(self.task, self.logger, continue_mode=False), Task.Status.CANCELED)
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, Task.Status.CANCELED)
+        self.assertIsNone(self.task.finished_at)
+
+        print("\n")
+
+    def test_execute_leaves_relaunched_task_alone(self):
+        """Test that a run winding down after a restart neither flushes its step nor finishes the new run."""
+
+        print_prologue()
+
+        Task.objects.filter(id=self.task.id).update(run_id='previous')
+        self.task.refresh_from_db()
+
+        # Restarted and relaunched while the previous run finishes its last step
+        runner = get_runner('TESTING')
+        runner.finalize = lambda task, step, logger: Task.objects.filter(id=task.id).update(step=1, run_id='current')
+
+        self.assertEqual(runner.execute(self.task, self.logger, continue_mode=False), Task.Status.RUNNING)
+
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.status, self.task.step, self.task.run_id), (Task.Status.RUNNING, 1, 'current'))
+        self.assertIsNone(self.task.finished_at)
+
+        print("\n")
+
+    def test_execute_resumes_from_step(self):
+        """Test that continue mode resumes from the persisted step."""
+
+        print_prologue()
+
+        Task.objects.filter(id=self.task.id).update(step=3)
+        self.task.refresh_from_db()
+
+        self.runner.execute(self.task, self.logger, continue_mode=True)
+
+        self.assertEqual(self.runner.stats.steps, 2)
+
+        print("\n")
+
+    def test_get_chunks_splits_steps(self):
+        """Test that a chunked runner splits the steps into contiguous ranges."""
+
+        print_prologue()
+
+        self.runner.chunk_size = 2
+
+        self.assertEqual(self.runner.get_chunks(self.task), [(1, 3), (3, 5)])
+
+        print("\n")
+
+    def test_execute_chunk_aggregates_progress(self):
+        """Test that chunks add their progress to the parent task."""
+
+        print_prologue()
+
+        self.runner.chunk_size = 2
+        chunks = TaskChunk.objects.bulk_create([
+            TaskChunk(task=self.task, index=index, start=start, end=end, step=start)
+            for index, (start, end) in enumerate(self.runner.get_chunks(self.task))
+        ])
+
+        for chunk in chunks:
+            self.runner.execute_chunk(chunk, self.logger)
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.step, 5)
+        self.assertFalse(self.task.chunks.exclude(status=Task.Status.FINISHED).exists())
+
+        print("\n")
+
+    def test_execute_stops_when_interrupted(self):
+        """Test that an interrupted run stops between steps, flushes and acknowledges."""
+
+        print_prologue()
+
+        class InterruptedTaskRunner(CountingTaskRunner):
+            max_count = 10
+            delay = 0
+
+            def run_step(self, task, step, logger):
+                if step == 3:
+                    request_interrupt(['celery-task'], Task.Status.PAUSED)
+
+        control = TaskControl('celery-task', poll_interval=0)
+        InterruptedTaskRunner().execute(self.task, self.logger, continue_mode=False, control=control)
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.step, 4)
+        self.assertEqual(self.task.status, Task.Status.RUNNING)
+        self.assertEqual(get_unacknowledged(['celery-task']), [])
+
+        print("\n")
@@ -0,0 +1,143 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from django_celery_beat.models import CrontabSchedule
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task, Job, TimeCondition
+from apps.user_app.models import User
+
+
+##
+#   Functions
+#
+
+from apps.task_app.scheduler import next_fire_time, dispatch_due_conditions
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Time Condition Scheduler
+#
+##
+
+class TimeConditionSchedulerTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='scheduler@example.com', password='password123')
+        self.crontab = CrontabSchedule.objects.create(minute='30', hour='*', day_of_week='*', day_of_month='*', month_of_year='*')
+        self.now = datetime(2024, 1, 1, 10, 45, tzinfo=dt_timezone.utc)
+
+    def _job(self, name, starting=None, stopping=None, enabled=True):
+        return Job.objects.bulk_create([Job(
+            name=name,
+            type=Task.TaskType.SMALL,
+            created_by=self.user,
+            enabled=enabled,
+            starting_condition=starting,
+            stopping_condition=stopping,
+        )])[0]
+
+    def test_next_fire_time(self):
+        """Test that the next fire time is the first crontab match after the reference time."""
+
+        print_prologue()
+
+        self.assertEqual(next_fire_time(self.crontab, self.now), datetime(2024, 1, 1, 11, 30, tzinfo=dt_timezone.utc))
+
+        condition = TimeCondition.objects.create(crontab=self.crontab)
+        self.assertIsNotNone(condition.next_run_at)
+
+        print("\n")
+
+    def test_dispatch_fires_due_conditions(self):
+        """Test that due conditions start and stop their enabled jobs, and are moved to their next fire time."""
+
+        print_prologue()
+
+        due = self.now - timedelta(minutes=15)
+        start = TimeCondition.objects.create(crontab=self.crontab, next_run_at=due)
+        stop = TimeCondition.objects.create(crontab=self.crontab, next_run_at=due)
+        disabled = TimeCondition.objects.create(crontab=self.crontab, next_run_at=due)
+        later = TimeCondition.objects.create(crontab=self.crontab, next_run_at=self.now + timedelta(minutes=45))
+
+        started = self._job('Started Job', starting=start)
+        stopped = self._job('Stopped Job', stopping=stop)
+        self._job('Disabled Job', starting=disabled, enabled=False)
+        self._job('Later Job', starting=later)
+
+        with patch('apps.task_app.scheduler._launch_job.apply_async') as launch, \
+                patch('apps.task_app.scheduler._stop_job_task.apply_async') as stop_job:
+            with self.captureOnCommitCallbacks(execute=True):
+                fired = dispatch_due_conditions(self.now)
+
+        self.assertEqual(fired, 3)
+        self.assertEqual([call.args[0] for call in launch.call_args_list], [(started.id,)])
+        self.assertEqual([call.args[0] for call in stop_job.call_args_list], [(stopped.id,)])
+
+        next_run_at = datetime(2024, 1, 1, 11, 30, tzinfo=dt_timezone.utc)
+        self.assertEqual(
+            set(TimeCondition.objects.filter(id__in=[start.id, stop.id, disabled.id]).values_list('next_run_at', flat=True)),
+            {next_run_at},
+        )
+
+        print("\n")
+
+    @override_settings(TIME_CONDITION_BATCH_SIZE=2)
+    def test_dispatch_publishes_every_batch(self):
+        """Test that each batch publishes its own jobs once, when the batches commit together."""
+
+        print_prologue()
+
+        jobs = [
+            self._job(f'Batch Job {index}', starting=TimeCondition.objects.create(
+                crontab=self.crontab, next_run_at=self.now - timedelta(minutes=15 - index),
+            ))
+            for index in range(5)
+        ]
+
+        with patch('apps.task_app.scheduler._launch_job.apply_async') as launch:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(dispatch_due_conditions(self.now), 5)
+
+        self.assertEqual([call.args[0] for call in launch.call_args_list], [(job.id,) for job in jobs])
+
+        print("\n")
+
+    def test_dispatch_schedules_unscheduled_conditions(self):
+        """Test that conditions without a fire time are scheduled, not fired."""
+
+        print_prologue()
+
+        condition = TimeCondition.objects.bulk_create([TimeCondition(crontab=self.crontab)])[0]
+        self._job('Unscheduled Job', starting=condition)
+
+        with patch('apps.task_app.scheduler._launch_job.apply_async') as launch:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(dispatch_due_conditions(self.now), 0)
+
+        launch.assert_not_called()
+        condition.refresh_from_db()
+        self.assertEqual(condition.next_run_at, datetime(2024, 1, 1, 11, 30, tzinfo=dt_timezone.utc))
+
+        print("\n")
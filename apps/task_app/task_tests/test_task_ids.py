@@ -0,0 +1,109 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.test import TestCase
+
+##
+#   Extras
+#
+
+from types import SimpleNamespace
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task, CeleryTask
+
+
+##
+#   Functions
+#
+
+from apps.task_app.task_ids import TaskIdCache, TASK_ID_HEADER, resolve_task_id
+from apps.task_app.signals import task_failure_handler
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Task IDs
+#
+##
+
+class TaskIdMappingTestCase(TestCase):
+    def setUp(self):
+        self.task = Task.objects.bulk_create([Task(type=Task.TaskType.SMALL, status=Task.Status.RUNNING)])[0]
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test that the cache keeps only the most recently used entries."""
+
+        print_prologue()
+
+        cache = TaskIdCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+        print("\n")
+
+    def test_resolve_from_headers_without_queries(self):
+        """Test that the Task ID is read from the message headers without any query."""
+
+        print_prologue()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_task_id(SimpleNamespace(id='x', **{TASK_ID_HEADER: self.task.id})), self.task.id)
+            self.assertEqual(resolve_task_id(SimpleNamespace(id='x', headers={TASK_ID_HEADER: self.task.id})), self.task.id)
+
+        print("\n")
+
+    def test_resolve_falls_back_to_lookup_once(self):
+        """Test that a message without headers is looked up once, then served from the cache."""
+
+        print_prologue()
+
+        CeleryTask.objects.create(task=self.task, celery_task_id='celery-task-lookup')
+        request = SimpleNamespace(id='celery-task-lookup', headers=None)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(resolve_task_id(request), self.task.id)
+            self.assertEqual(resolve_task_id(request), self.task.id)
+
+        with self.assertNumQueries(1):
+            self.assertIsNone(resolve_task_id(SimpleNamespace(id='celery-task-unknown', headers=None)))
+
+        print("\n")
+
+    def test_failure_handler_updates_task_in_one_query(self):
+        """Test that a failed Celery task marks its Task as FAILED with a single UPDATE."""
+
+        print_prologue()
+
+        sender = SimpleNamespace(request=SimpleNamespace(id='celery-task-failed', headers={TASK_ID_HEADER: self.task.id}))
+
+        with self.assertNumQueries(1):
+            task_failure_handler(sender=sender, task_id='celery-task-failed')
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, Task.Status.FAILED)
+        self.assertIsNotNone(self.task.finished_at)
+
+        print("\n")
@@ -0,0 +1,111 @@
+###
+#       General imports
+##
+
+
+##
+#   Default
+#
+
+from django.test import TestCase
+
+
+###
+#       App specific imports
+##
+
+
+##
+#   Models
+#
+
+from apps.task_app.models import Task
+
+
+##
+#   Functions
+#
+
+from apps.task_app.transitions import InvalidTransition, transition, transition_task, task_transitioned
+from apps.common.tests.functions import print_prologue
+
+
+###
+#
+#       Task Transitions
+#
+##
+
+class TaskTransitionTestCase(TestCase):
+    def setUp(self):
+        self.tasks = Task.objects.bulk_create([
+            Task(type=Task.TaskType.SMALL, status=Task.Status.RUNNING),
+            Task(type=Task.TaskType.SMALL, status=Task.Status.RUNNING),
+            Task(type=Task.TaskType.SMALL, status=Task.Status.PAUSED),
+            Task(type=Task.TaskType.SMALL, status=Task.Status.FINISHED),
+        ])
+        self.task_ids = [task.id for task in self.tasks]
+
+        self.events = []
+        task_transitioned.connect(self.record_event)
+
+    def tearDown(self):
+        task_transitioned.disconnect(self.record_event)
+
+    def record_event(self, sender, task, status, **kwargs):
+        self.events.append((task.id, status))
+
+    def test_transition_moves_allowed_tasks_in_one_query(self):
+        """Test that a bulk transition moves only the allowed tasks, in a single statement."""
+
+        print_prologue()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):
+                canceled = transition(self.task_ids, Task.Status.CANCELED)
+
+        self.assertEqual(sorted(task.id for task in canceled), self.task_ids[:3])
+        self.assertTrue(all(task.status == Task.Status.CANCELED for task in canceled))
+        self.assertEqual(Task.objects.get(id=self.task_ids[3]).status, Task.Status.FINISHED)
+        self.assertEqual(sorted(self.events), [(task_id, Task.Status.CANCELED) for task_id in self.task_ids[:3]])
+
+        print("\n")
+
+    def test_transition_task_updates_instance(self):
+        """Test that a single task transition writes the extra fields back on the instance."""
+
+        print_prologue()
+
+        task = self.tasks[0]
+
+        self.assertTrue(transition_task(task, Task.Status.FINISHED, step=5))
+        self.assertEqual(task.status, Task.Status.FINISHED)
+        self.assertEqual(task.step, 5)
+
+        task.refresh_from_db()
+        self.assertEqual(task.step, 5)
+
+        print("\n")
+
+    def test_concurrent_transitions_do_not_overwrite(self):
+        """Test that a transition from a stale instance is rejected instead of overwriting."""
+
+        print_prologue()
+
+        stale = Task.objects.get(id=self.task_ids[0])
+
+        self.assertTrue(transition_task(self.tasks[0], Task.Status.PAUSED))
+        self.assertFalse(transition_task(stale, Task.Status.STOPPED))
+        self.assertEqual(Task.objects.get(id=self.task_ids[0]).status, Task.Status.PAUSED)
+
+        print("\n")
+
+    def test_invalid_transition_raises(self):
+        """Test that sources outside of the transition graph are rejected."""
+
+        print_prologue()
+
+        with self.assertRaises(InvalidTransition):
+            transition(self.task_ids, Task.Status.RUNNING, sources=[Task.Status.FINISHED])
+
+        print("\n")
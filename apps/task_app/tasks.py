@@ -7,9 +7,11 @@
 
 ## Celery App
 from config.celery import app
+from celery import chord
+from celery.utils import uuid
+from celery.worker.control import inspect_command
 
 ## Standard Libraries
-import time
 import logging
 
 ### App-specific imports
@@ -17,6 +19,15 @@
 ## Functions
 from apps.task_app.functions import configure_task_logging, configure_job_logging
 
+## Runners
+from apps.task_app.runners import get_runner, get_runner_stats
+
+## Control
+from apps.task_app.control import TaskControl, get_unacknowledged
+
+## Task IDs
+from apps.task_app.task_ids import task_headers, task_id_cache
+
 # Set up main logger
 main_logger = logging.getLogger('django')
 
@@ -33,11 +44,15 @@ def _launch_job(job_id):
     - If a job has no associated tasks, it will create a new one.
     - If the last task is paused, it resumes that task.
     - If the last task is finished, it creates a new task.
+    - Either way, the launch goes through admission control first: once the job has
+      `max_concurrency` tasks STARTING or RUNNING, it is queued, skipped or coalesced
+      according to the job's `overflow_policy`.
     
     Args:
         job_id (int): ID of the Job to initialize.
     """
     from apps.task_app.models import Job, Task
+    from apps.task_app.admission import AdmissionDecision, admit_job_launch
 
     try:
         job = Job.objects.get(id=job_id)
@@ -48,9 +63,9 @@ def _launch_job(job_id):
     if not job.enabled:
         return
 
-    # Configure job-specific logging
+    # Configure job-specific logging, without writing back the counters read with the job
     job_logger, job.log_path = configure_job_logging(job)
-    job.save()
+    job.save(update_fields=['log_path', 'updated_at'])
 
     # Determine the status of the last task
     job_logger.info(f'')
@@ -62,26 +77,35 @@ def _launch_job(job_id):
     current_task = job.tasks.order_by('-created_at').first()
     job_logger.info(f'Checking for existing tasks...')
     
+    resume = False
     if job.continue_mode:
         if current_task is None:
             job_logger.info(f'No existing task. Creating new task.')
         elif current_task.status == Task.Status.FINISHED:
             job_logger.info(f'Task {current_task.id} has finished. Creating new task.')
         elif current_task.status == Task.Status.PAUSED:
-            job_logger.info(f'Task {current_task.id} has been resumed.')
-            current_task.resume()
-            return
+            resume = True
         else:
             job_logger.info(f'Job {job_id} was not started due to Task {current_task.id} with status {current_task.status}.')
             return
     else:
         job_logger.info(f'Creating new task.')
 
-    task = Task.objects.create(
-        type=job.type,
-        job=job,
-    )
-    task.save()
+    # The launch only goes ahead while the job, and all jobs together, are under their concurrency limits
+    with admit_job_launch(job) as decision:
+        if decision != AdmissionDecision.ADMITTED:
+            job_logger.info(f'Job {job_id} launch {decision.label.lower()}, concurrency limit reached.')
+            return
+
+        if resume:
+            job_logger.info(f'Task {current_task.id} has been resumed.')
+            current_task.resume()
+            return
+
+        task = Task.objects.create(
+            type=job.type,
+            job=job,
+        )
     
     # You dont need to call the launch method here, the signal will do it for you
     job_logger.info(f'')
@@ -102,9 +126,9 @@ def _stop_job_task(job_id):
     if not job.enabled:
         return
 
-    # Configure job-specific logging
+    # Configure job-specific logging, without writing back the counters read with the job
     job_logger, job.log_path = configure_job_logging(job)
-    job.save()
+    job.save(update_fields=['log_path', 'updated_at'])
 
     # Get the current task
     current_task = job.tasks.order_by('-created_at').first()
@@ -139,31 +163,33 @@ def _launch_task(task_id, continue_mode=True):
 
     - Configures logging and updates task status to RUNNING.
     - Initiates a test task with varying counts based on task type.
+    - Evaluates the job's count or throughput stopping condition while running; split
+      tasks are not evaluated, their chunks run apart from each other.
 
     Args:
         task_id (int): ID of the Task to launch.
+
+    Returns:
+        dict: The task's state once the run returns, used by the `task_success` handler
+            to notify the WebSocket without querying the Task again.
     """
     from apps.task_app.models import Task
+    from apps.task_app.transitions import transition_task
+    from apps.task_app.conditions import get_stopping_evaluator
 
-    task = Task.objects.get(id=task_id)
+    task = Task.objects.select_related('job').get(id=task_id)
 
     logger, log_info_path = configure_task_logging(task)
-    task.log_path = log_info_path
-    task.status = Task.Status.RUNNING
-    task.save()
-
-    # Determine task behavior based on task type
-    match task.type:
-        case Task.TaskType.SMALL:
-            max_count = 5
-        case Task.TaskType.MEDIUM:
-            max_count = 1000
-        case Task.TaskType.LARGE:
-            max_count = 10000
-        case Task.TaskType.EMPTY:
-            max_count = 1
-        case Task.TaskType.FAILURE:
-            max_count = -1
+
+    # Skip the run if the task was canceled (or relaunched) while waiting in the queue
+    if not transition_task(
+        task, Task.Status.RUNNING, log_path=log_info_path, started_at=timezone.now(), run_id=_launch_task.request.id,
+    ):
+        logger.info(f'Task {task.id} is {task.status}, skipping run.')
+        return
+
+    # Resolve the runner registered for the task type
+    runner = get_runner(task.type)
             
     logger.info("")
     if continue_mode:
@@ -171,56 +197,248 @@ def _launch_task(task_id, continue_mode=True):
     else:
         logger.info(f'Starting {task.type} Task')
     
-    test_task(logger, task, max_count, continue_mode)
+    # Split the task across workers when its runner supports it
+    if runner.chunk_size and not task.debug_mode:
+        _launch_task_chunks(task, runner, logger, continue_mode)
+        return _task_state(task)
+    
+    # The job's stopping condition, if the task can evaluate it, is resolved once for the whole run
+    task.status = runner.execute(
+        task,
+        logger,
+        continue_mode,
+        control=TaskControl(_launch_task.request.id),
+        condition=get_stopping_evaluator(task.job),
+    )
+
+    return _task_state(task)
+
+
+@app.task
+def _run_task_chunk(chunk_id):
+    """
+    Runs a single chunk of a task split across workers.
+
+    - Skips the chunk if the task stopped running in the meantime (paused, stopped or canceled).
+    - Marks the chunk and its task as FAILED if the chunk raises.
+
+    Args:
+        chunk_id (int): ID of the TaskChunk to run.
+    """
+    from apps.task_app.models import Task, TaskChunk
+    from apps.task_app.transitions import transition
+
+    chunk = TaskChunk.objects.select_related('task').get(id=chunk_id)
+    task = chunk.task
+
+    if task.status != Task.Status.RUNNING:
+        return
+
+    logger, _ = configure_task_logging(task)
+    logger.info(f'Running chunk {chunk.index} from step {chunk.step} to {chunk.end}')
+
+    chunk.status = Task.Status.RUNNING
+    TaskChunk.objects.filter(id=chunk.id).update(status=chunk.status)
+
+    try:
+        get_runner(task.type).execute_chunk(chunk, logger, control=TaskControl(_run_task_chunk.request.id))
+    except Exception:
+        TaskChunk.objects.filter(id=chunk.id).update(status=Task.Status.FAILED)
+        transition([task.id], Task.Status.FAILED, where={'run_id': task.run_id}, finished_at=timezone.now())
+        raise
+
+
+@app.task
+def _finish_chunked_task(task_id, run_id=None):
+    """
+    Chord callback, fired once every chunk of a task split across workers has finished.
+
+    Args:
+        task_id (int): ID of the Task to finish.
+        run_id (str): The run the chunks belong to, a restarted task is left to its new run.
+
+    Returns:
+        dict: The task's final state, see `_launch_task`.
+    """
+    from apps.task_app.models import Task
+    from apps.task_app.transitions import transition_task
+
+    task = Task.objects.get(id=task_id)
+
+    if task.status != Task.Status.RUNNING or task.run_id != run_id:
+        return
+
+    logger, _ = configure_task_logging(task)
+    runner = get_runner(task.type)
+    total = runner.get_total_steps(task)
+
+    runner.finalize(task, total, logger)
+
+    # Update task status to finished, unless it was paused or canceled meanwhile
+    if not transition_task(task, Task.Status.FINISHED, where={'run_id': run_id}, step=total, finished_at=timezone.now()):
+        return
+
+    logger.info("")
+    logger.info("Done...")
+    logger.info("")
+
+    return _task_state(task)
+
+
+@app.task
+def _enforce_task_interrupt(celery_task_ids):
+    """
+    Fallback for cooperative interrupts, revoking the Celery tasks that did not stop in time.
+
+    - Scheduled `TASK_CONTROL_TIMEOUT` seconds after an interrupt is requested.
+    - Only the tasks that did not acknowledge the interrupt are terminated.
+
+    Args:
+        celery_task_ids (list): IDs of the interrupted Celery tasks.
+    """
+    pending = get_unacknowledged(celery_task_ids)
+
+    if pending:
+        main_logger.warning(f'Terminating {len(pending)} Celery tasks that did not stop in time')
+        app.control.revoke(pending, terminate=True)
+
+
+@app.task
+def _dispatch_task_launches():
+    """
+    Sweeper of the task launch outbox, run periodically by Celery Beat.
+
+    - Publishes the launches that were not dispatched on commit (broker errors,
+      throttling), and forgets the old dispatched ones.
+    """
+    from apps.task_app.outbox import sweep_launches
+
+    dispatched = sweep_launches()
+
+    if dispatched:
+        main_logger.info(f'Dispatched {dispatched} pending task launches')
+
+
+@app.task
+def _dispatch_time_conditions():
+    """
+    Dispatcher of the jobs' time conditions, run periodically by Celery Beat.
+
+    - Starts and stops the jobs whose TimeCondition is due, see `scheduler`.
+    """
+    from apps.task_app.scheduler import dispatch_due_conditions
+
+    dispatch_due_conditions()
+
+
+@app.task
+def _purge_logs():
+    """
+    Log retention, run periodically by Celery Beat.
+
+    - Compresses the logs no longer written and removes the expired ones, see `log_retention`.
+    """
+    from apps.task_app.log_retention import purge_logs
+
+    removed = purge_logs()
+
+    if removed:
+        main_logger.info(f'Purged {removed} expired log files')
+
+
+@app.task
+def _delete_log_dirs(paths):
+    """
+    Removes deleted log directories out of the request path, see `delete_task_logs`.
+    """
+    from apps.task_app.log_retention import delete_log_dirs
+
+    delete_log_dirs(paths)
 
 
 ###
 # Helper Functions
 ##
 
-def test_task(logger, task, max_count=10000, continue_mode=True):
+def _task_state(task):
+    """
+    Returns the state of a task reported in the result of its Celery tasks.
+
+    Args:
+        task (Task): The task, as last updated in this process.
+
+    Returns:
+        dict: The task's ID, status and finish time.
+    """
+    return {
+        'task_id': task.id,
+        'status': task.status,
+        'finished_at': task.finished_at,
+    }
+
+
+def _launch_task_chunks(task, runner, logger, continue_mode=True):
     """
-    A helper function to simulate task processing by counting to a max value.
+    Splits a task into step ranges and runs them as a Celery chord.
 
-    - Logs each count increment and the task start/completion.
-    - If max_count < 0, raises an exception to simulate a failure.
+    - On a fresh start, the chunks are (re)created from the runner's step ranges.
+    - On resume, only the unfinished chunks are launched, each from its own step.
+    - The chord callback finishes the task once every chunk is done.
 
     Args:
-        logger (logging.Logger): The logger to use for logging task events.
-        task (Task): The task instance associated with the counting.
-        max_count (int): The maximum count for the test task. Defaults to 10000.
-    
-    Raises:
-        Exception: If max_count is less than 0.
+        task (Task): The task to split.
+        runner (TaskRunner): The runner of the task.
+        logger (logging.Logger): The task's logger.
+        continue_mode (bool): Whether to resume the existing chunks.
     """
-    logger.info("")
-    logger.info("Executing Task...")
-    logger.info("")
-    
-    if max_count < 0:
-        raise Exception("Max Count cannot be less than 0")
+    from apps.task_app.models import Task, TaskChunk, CeleryTask
+    from apps.task_app.routing import resolve_route
 
-    counter = task.step if continue_mode else 1
+    if not continue_mode or not task.chunks.exists():
+        task.chunks.all().delete()
+        TaskChunk.objects.bulk_create([
+            TaskChunk(task=task, index=index, start=start, end=end, step=start)
+            for index, (start, end) in enumerate(runner.get_chunks(task))
+        ])
+        Task.objects.filter(id=task.id).update(step=1)
 
-    while counter < max_count:
-        logger.info(f"Counting at: {counter}")
-        time.sleep(1)
-        
-        counter += 1
-        
-        # Save state to avoid losing the counter value in case of failure or pause
-        task.step = counter
-        task.save()
-    
-    # Log the final count
-    logger.info(f"Counting at: {counter}")
+    chunks = list(task.chunks.exclude(status=Task.Status.FINISHED))
+
+    # Assign the Celery IDs upfront so every chunk can be revoked individually
+    for chunk in chunks:
+        chunk.celery_task_id = uuid()
+    TaskChunk.objects.bulk_update(chunks, ['celery_task_id'])
 
-    # Update task status to finished
-    task.finished_at = timezone.now()
-    task.status = task.Status.FINISHED
-    task.save()
-    
     logger.info("")
-    logger.info("Done...")
+    logger.info(f"Executing Task in {len(chunks)} chunks...")
     logger.info("")
 
+    # Chunks follow the route of their task
+    queue, priority = resolve_route(task, task.job)
+    options = {'headers': task_headers(task.id), 'queue': queue, 'priority': priority}
+
+    callback = _finish_chunked_task.si(task.id, task.run_id).set(**options)
+    if chunks:
+        result = chord(
+            _run_task_chunk.si(chunk.id).set(task_id=chunk.celery_task_id, **options) for chunk in chunks
+        )(callback)
+    else:
+        result = callback.apply_async()
+
+    CeleryTask.objects.create(task=task, celery_task_id=result.id)
+    task_id_cache.set(result.id, task.id)
+
+
+###
+# Worker Commands
+##
+
+@inspect_command()
+def runner_stats(state):
+    """
+    Returns the throughput counters of the task runners, as recorded by every worker process.
+
+    Usage:
+        celery -A config.celery inspect runner_stats
+    """
+    return get_runner_stats()
@@ -0,0 +1,386 @@
+###
+# General imports
+##
+
+## Django
+from django.conf import settings
+from django.db import connection, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+## Models
+from apps.task_app.models import Task, CeleryTask, TaskChunk
+
+## Tasks
+from apps.task_app.tasks import _launch_task, _enforce_task_interrupt
+
+## Functions
+from apps.task_app.functions import delete_task_logs
+
+## Outbox
+from apps.task_app.outbox import enqueue_launches
+
+## Control
+from apps.task_app.control import request_interrupt
+
+## Admission
+from apps.task_app.admission import ACTIVE_STATUSES
+
+## Counters
+from apps.task_app.counters import record_created, record_transitions
+
+## Dashboard
+from apps.task_app.dashboard import publish_task_deltas
+
+
+# Statuses a task may move to, each with the statuses it may move from
+TRANSITIONS = {
+    Task.Status.STARTING: set(Task.Status.values),
+    Task.Status.RUNNING: {Task.Status.STARTING},
+    Task.Status.PAUSED: {Task.Status.RUNNING},
+    Task.Status.STOPPED: {Task.Status.RUNNING},
+    Task.Status.CANCELED: {Task.Status.STARTING, Task.Status.RUNNING, Task.Status.PAUSED, Task.Status.STOPPED},
+    Task.Status.FINISHED: {Task.Status.RUNNING},
+    Task.Status.FAILED: {Task.Status.STARTING, Task.Status.RUNNING},
+}
+
+# Maximum tasks moved by a single UPDATE statement
+TRANSITION_BATCH_SIZE = 1000
+
+# Sent once per task moved, after the transaction commits, with `task`, `status` and `was_active`
+task_transitioned = Signal()
+
+
+###
+# Exceptions
+##
+
+class InvalidTransition(ValueError):
+    """
+    Raised when asked for a transition outside of the `TRANSITIONS` graph.
+    """
+    pass
+
+
+###
+# Transitions
+##
+
+def transition(task_ids, status, sources=None, interrupt=False, where=None, **fields):
+    """
+    Moves tasks to a new status, with conditional UPDATEs of up to `TRANSITION_BATCH_SIZE` tasks.
+
+    - Only the tasks currently in one of the allowed source statuses are moved, the
+      check and the write happen in the same statement, so concurrent transitions
+      (e.g. a stopping condition racing a user pause) cannot overwrite each other.
+    - The updated rows are returned by the statement itself (`RETURNING`), along with the
+      status each task moved from, no extra query is needed to read them back.
+    - The counters of the tasks' jobs are updated in the same transaction, see `counters`.
+    - `task_transitioned` is sent for every task moved, once the transaction commits, and
+      the new states are published to the dashboard groups.
+
+    Args:
+        task_ids (list): IDs of the tasks to move.
+        status (str): The target `Task.Status`.
+        sources (list): Restricts the source statuses further, must be part of the graph.
+        interrupt (bool): Whether to interrupt the Celery tasks of the moved tasks.
+        where (dict): Task fields the tasks must also have to be moved, e.g. `{'run_id': ...}`.
+        fields (dict): Additional Task fields to set in the same statement.
+
+    Returns:
+        list: The moved tasks, as updated.
+
+    Raises:
+        InvalidTransition: If the target status, or one of the sources, is not in the graph.
+
+    Usage:
+        paused = transition(task_ids, Task.Status.PAUSED, interrupt=True, stopped_at=timezone.now())
+    """
+    allowed = TRANSITIONS.get(status)
+    if allowed is None:
+        raise InvalidTransition(f'Unknown task status {status}')
+
+    if sources is not None:
+        if not set(sources) <= allowed:
+            raise InvalidTransition(f'Tasks cannot move from {", ".join(sorted(set(sources) - allowed))} to {status}')
+        allowed = set(sources)
+
+    task_ids = list(dict.fromkeys(task_ids))
+    values = {'status': status, 'updated_at': timezone.now(), **fields}
+
+    tasks, active_ids = [], set()
+    with transaction.atomic(savepoint=False):
+        for offset in range(0, len(task_ids), TRANSITION_BATCH_SIZE):
+            batch = task_ids[offset:offset + TRANSITION_BATCH_SIZE]
+
+            # The job counters need to know which tasks were STARTING/RUNNING before
+            moves = [
+                (task, task.previous_status in ACTIVE_STATUSES)
+                for task in _update_returning(batch, allowed, values, where or {})
+            ]
+
+            record_transitions(moves, status, fields)
+            tasks += [task for task, _ in moves]
+            active_ids.update(task.id for task, was_active in moves if was_active)
+
+    if tasks and interrupt:
+        interrupt_tasks([task.id for task in tasks], status)
+
+    if tasks:
+        transaction.on_commit(lambda: _send_transitioned(tasks, status, active_ids))
+
+    return tasks
+
+
+def transition_task(task, status, sources=None, interrupt=False, where=None, **fields):
+    """
+    Moves a single task to a new status, see `transition`.
+
+    - On success, the instance is updated in place with the values written.
+
+    Args:
+        task (Task): The task to move.
+        status (str): The target `Task.Status`.
+        sources (list): Restricts the source statuses further.
+        interrupt (bool): Whether to interrupt the Celery task of the task.
+        where (dict): Task fields the task must also have to be moved.
+        fields (dict): Additional Task fields to set in the same statement.
+
+    Returns:
+        bool: Whether the task was moved.
+    """
+    updated = transition([task.id], status, sources=sources, interrupt=interrupt, where=where, **fields)
+
+    if not updated:
+        return False
+
+    for name in ['status', 'updated_at', *fields]:
+        setattr(task, name, getattr(updated[0], name))
+
+    return True
+
+
+def interrupt_tasks(task_ids, status=None):
+    """
+    Stops the Celery tasks of the given tasks, along with any unfinished chunk.
+
+    - Raises the cooperative interrupt flags of every Celery task at once, running
+      tasks stop at their next step and flush their checkpoint.
+    - Celery tasks that did not stop within `TASK_CONTROL_TIMEOUT` seconds are then
+      revoked with terminate=True, by a single delayed Celery task.
+
+    Args:
+        task_ids (list): IDs of the tasks to interrupt.
+        status (str): The status the tasks are moving to, for logging purposes.
+    """
+    celery_task_ids = list(
+        TaskChunk.objects.filter(task_id__in=task_ids)
+        .exclude(status=Task.Status.FINISHED)
+        .exclude(celery_task_id=None)
+        .values_list('celery_task_id', flat=True)
+    )
+
+    # Only the last Celery task of each task can still be running
+    last_celery_task_ids = {}
+    for task_id, celery_task_id in (
+        CeleryTask.objects.filter(task_id__in=task_ids).order_by('id').values_list('task_id', 'celery_task_id')
+    ):
+        last_celery_task_ids[task_id] = celery_task_id
+    celery_task_ids += [celery_task_id for celery_task_id in last_celery_task_ids.values() if celery_task_id]
+
+    if celery_task_ids:
+        request_interrupt(celery_task_ids, status)
+        _enforce_task_interrupt.apply_async(
+            args=[celery_task_ids],
+            countdown=settings.TASK_CONTROL_TIMEOUT,
+        )
+
+
+def launch_tasks(tasks, continue_mode=False):
+    """
+    Sends tasks to the Celery workers, debug mode tasks are run inline instead.
+
+    - The launches go through the outbox: they are recorded in the current transaction
+      and only published once it commits, see `apps.task_app.outbox`.
+
+    Args:
+        tasks (list): The tasks to launch, already moved to STARTING.
+        continue_mode (bool): Whether the tasks resume from their current step.
+    """
+    enqueue_launches([task for task in tasks if not task.debug_mode], continue_mode)
+
+    for task in tasks:
+        if task.debug_mode:
+            _launch_task(task.id, continue_mode)
+
+
+def submit_tasks(tasks):
+    """
+    Creates and launches many tasks at once.
+
+    - Task rows and their launches are inserted with `bulk_create`, in one transaction,
+      which also skips the per-row `post_save` launch.
+    - The launch messages are published in batches after the commit, see `launch_tasks`,
+      along with the new tasks' dashboard deltas.
+
+    Args:
+        tasks (list): Unsaved Task instances.
+
+    Returns:
+        list: The created tasks.
+
+    Usage:
+        submit_tasks([Task(type=Task.TaskType.SMALL, job=job) for _ in range(10000)])
+    """
+    for task in tasks:
+        task.status = Task.Status.STARTING
+
+    with transaction.atomic():
+        tasks = Task.objects.bulk_create(tasks, batch_size=TRANSITION_BATCH_SIZE)
+        record_created(tasks)
+        launch_tasks(tasks)
+        transaction.on_commit(lambda: publish_task_deltas(tasks))
+
+    return tasks
+
+
+###
+# Bulk Operations
+##
+
+def pause_tasks(task_ids):
+    """
+    Pauses the running tasks among `task_ids`.
+
+    Returns:
+        list: The paused tasks.
+    """
+    return transition(task_ids, Task.Status.PAUSED, interrupt=True, stopped_at=timezone.now())
+
+
+def stop_tasks(task_ids):
+    """
+    Stops the running tasks among `task_ids`.
+
+    Returns:
+        list: The stopped tasks.
+    """
+    return transition(task_ids, Task.Status.STOPPED, interrupt=True, stopped_at=timezone.now())
+
+
+def cancel_tasks(task_ids):
+    """
+    Cancels the tasks among `task_ids` that have not ended yet.
+
+    Returns:
+        list: The canceled tasks.
+    """
+    return transition(task_ids, Task.Status.CANCELED, interrupt=True, finished_at=timezone.now())
+
+
+def resume_tasks(task_ids):
+    """
+    Resumes the paused or stopped tasks among `task_ids` from their current step.
+
+    Returns:
+        list: The resumed tasks.
+    """
+    tasks = transition(task_ids, Task.Status.STARTING, sources=[Task.Status.PAUSED, Task.Status.STOPPED])
+    launch_tasks(tasks, continue_mode=True)
+    return tasks
+
+
+def restart_tasks(task_ids):
+    """
+    Restarts the tasks in `task_ids` from their first step, whatever their status.
+
+    - Running tasks are interrupted first, their logs are purged.
+    - Their run is cleared, so the previous run winding down can no longer write its
+      checkpoints nor its final status over the new one.
+
+    Returns:
+        list: The restarted tasks.
+    """
+    running_ids = list(
+        Task.objects.filter(id__in=task_ids, status=Task.Status.RUNNING).values_list('id', flat=True)
+    )
+    if running_ids:
+        interrupt_tasks(running_ids, Task.Status.STARTING)
+
+    tasks = transition(
+        task_ids,
+        Task.Status.STARTING,
+        step=1,
+        started_at=timezone.now(),
+        finished_at=None,
+        run_id=None,
+    )
+
+    delete_task_logs(*tasks)
+
+    launch_tasks(tasks)
+    return tasks
+
+
+# Bulk operations by name, as exposed by the API and the admin
+BULK_OPERATIONS = {
+    'pause': pause_tasks,
+    'cancel': cancel_tasks,
+    'resume': resume_tasks,
+    'restart': restart_tasks,
+}
+
+
+###
+# Helper Functions
+##
+
+def _update_returning(task_ids, sources, fields, where):
+    """
+    Runs `UPDATE ... WHERE id IN (...) AND status IN (...) RETURNING *` on the tasks, also
+    matching the `where` fields (None as IS NULL).
+
+    - The matching rows are first selected (and locked, where supported) by a CTE, which
+      keeps the statuses they had before the update for the `RETURNING` clause.
+
+    Returns:
+        list: The updated tasks, each with the status it moved from as `previous_status`.
+    """
+    meta = Task._meta
+    quote = connection.ops.quote_name
+    table, pk, status = quote(meta.db_table), quote(meta.pk.column), quote(meta.get_field('status').column)
+
+    assignments, params = [], []
+    for name, value in fields.items():
+        field = meta.get_field(name)
+        assignments.append(f'{quote(field.column)} = %s')
+        params.append(field.get_db_prep_save(value, connection))
+
+    conditions, condition_params = [], []
+    for name, value in where.items():
+        column = quote(meta.get_field(name).column)
+        if value is None:
+            conditions.append(f' AND {column} IS NULL')
+        else:
+            conditions.append(f' AND {column} = %s')
+            condition_params.append(meta.get_field(name).get_db_prep_value(value, connection))
+
+    lock = ' FOR UPDATE' if connection.features.has_select_for_update else ''
+    sql = (
+        f'WITH old AS MATERIALIZED ('
+        f'SELECT {pk}, {status} FROM {table} '
+        f'WHERE {pk} IN ({", ".join(["%s"] * len(task_ids))}) '
+        f'AND {status} IN ({", ".join(["%s"] * len(sources))}){"".join(conditions)}{lock}'
+        f') '
+        f'UPDATE {table} SET {", ".join(assignments)} '
+        f'WHERE {pk} IN (SELECT {pk} FROM old) '
+        f'RETURNING *, (SELECT old.{status} FROM old WHERE old.{pk} = {table}.{pk}) AS previous_status'
+    )
+
+    return list(Task.objects.raw(sql, list(task_ids) + sorted(sources) + condition_params + params))
+
+
+def _send_transitioned(tasks, status, active_ids):
+    publish_task_deltas(tasks)
+    for task in tasks:
+        task_transitioned.send(sender=Task, task=task, status=status, was_active=task.id in active_ids)
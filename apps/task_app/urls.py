@@ -12,8 +12,8 @@
 #   Views 
 #
 
-from apps.task_app.views import JobTableView, JobCreateView , JobDetailView, job_delete, job_pause, job_resume\
-    , TaskTableView, TaskDetailView, TaskCreateView, TaskEditView, task_delete, task_restart, task_cancel, task_pause, task_resume
+from apps.task_app.views import JobTableView, JobCreateView , JobDetailView, job_delete, job_pause, job_resume, job_log\
+    , TaskTableView, TaskDetailView, TaskCreateView, TaskEditView, task_delete, task_restart, task_cancel, task_pause, task_resume, task_log
 
 
 ###
@@ -34,6 +34,7 @@
     path("job/<int:id>/resume", job_resume, name="job_resume"),
     path("job/<int:id>/pause", job_pause, name="job_pause"),
     path("job/<int:id>/delete", job_delete, name="job_delete"),
+    path("job/<int:id>/log", job_log, name="job_log"),
     
     
     ###
@@ -49,5 +50,6 @@
     path("task/<int:id>/pause", task_pause, name="task_pause"),
     path("task/<int:id>/resume", task_resume, name="task_resume"),
     path("task/<int:id>/delete", task_delete, name="task_delete"),
+    path("task/<int:id>/log", task_log, name="task_log"),
 
 ]
@@ -20,10 +20,10 @@
 from django.views.decorators.http import require_GET, require_POST
 from django.views import View
 from django.urls import reverse
-from django.core.paginator import Paginator
 from django.views.generic import TemplateView
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.core.exceptions import PermissionDenied
+from django.http import Http404, JsonResponse, HttpResponseBadRequest
 
 ##
 #   Api Swagger
@@ -35,8 +35,6 @@
 #
 
 
-from os import path
-
 ###
 #       App specific imports
 ##
@@ -57,7 +55,7 @@
 #   Forms
 #
 
-from apps.task_app.forms import  TaskForm, JobForm, TimeConditionForm, TaskEditForm
+from apps.task_app.forms import  TaskForm, JobForm, TimeConditionForm, MaxRecordsConditionForm, ThroughputConditionForm, TaskEditForm
 
 
 ##
@@ -70,6 +68,10 @@
 #   Functions
 #
 
+from apps.common.pagination import CursorPaginator
+from apps.common.counting import AdaptiveCount
+from apps.task_app.log_files import read_tail, read_range
+
 
 ##
 #   Contants
@@ -109,6 +111,7 @@ class JobTableView(PermissionRequiredMixin, TemplateView):
     template_name = "task_app/job/table.html"
     permission_required = "task_app.can_view_jobs"
     page_size = 10
+    count_strategy = AdaptiveCount("job_table")
 
     def get_context_data(self, **kwargs):
         """
@@ -122,17 +125,18 @@ def get_context_data(self, **kwargs):
         Returns:
             dict: Context containing:
                 - filter: Filtered queryset of jobs.
-                - page_obj: Paginator object with job records.
+                - page_obj: Cursor page of job records.
                 - can_create_job: Boolean indicating if user can create jobs.
                 - can_edit_job: Boolean indicating if user can edit jobs.
                 - can_view_job: Boolean indicating if user can view jobs.
                 - can_delete_job: Boolean indicating if user can delete jobs.
+                - WEBSOCKET_HOST: WebSocket host of the live updates.
         """
         # Initialize template layout
         context = TemplateLayout.init(self, super().get_context_data(**kwargs))
 
-        # Retrieve and order all jobs
-        records = Job.objects.all().order_by("-id")
+        # Retrieve and order all jobs, with their conditions loaded for the whole page
+        records = Job.objects.with_conditions().order_by("-id")
         
         # Apply filtering based on request parameters
         filter = JobFilter(self.request.GET, queryset=records)
@@ -140,9 +144,8 @@ def get_context_data(self, **kwargs):
         
         # Implement pagination
         page_size = int(self.request.GET.get("page_size", self.page_size))
-        paginator = Paginator(filtered_records, page_size) 
-        page_number = self.request.GET.get("page")
-        page_obj = paginator.get_page(page_number)
+        paginator = CursorPaginator(filtered_records, page_size, count=self.count_strategy, params=self.request.GET)
+        page_obj = paginator.get_page(self.request.GET.get("cursor"))
 
         # Add create job permission check
         context.update(
@@ -161,6 +164,7 @@ def get_context_data(self, **kwargs):
                 "can_delete_job": self.request.user.has_perm(
                     "task_app.can_delete_job"
                 ),
+                "WEBSOCKET_HOST": WEBSOCKET_HOST,
             }
         )
         
@@ -189,7 +193,7 @@ class JobDetailView(PermissionRequiredMixin, TemplateView):
     Returns:
         dict: Context dictionary containing:
             - record: Job object retrieved from database.
-            - log: Content of the job's log file (if exists).
+            - log: Last lines of the job's log file, with their byte offsets (if exists).
             - WEBSOCKET_HOST: WebSocket host configuration.
             - Additional template layout context data.
     """
@@ -197,26 +201,27 @@ class JobDetailView(PermissionRequiredMixin, TemplateView):
     template_name = "task_app/job/detail.html"
     permission_required = "task_app.can_view_job"
     page_size = 10
+    count_strategy = AdaptiveCount("job_tasks")
 
     def get_context_data(self, **kwargs):
         """
         Prepares and returns the context data for template rendering.
         - Initializes template layout.
         - Retrieves the job by ID.
-        - Reads the job's log file if it exists.
+        - Reads the last lines of the job's log file if it exists.
         - Adds WebSocket host configuration.
 
         Returns:
             dict: Context dictionary containing:
                 - record: Job object retrieved from database.
-                - log: Content of the job's log file (if exists).
+                - log: Last lines of the job's log file, with their byte offsets (if exists).
                 - WEBSOCKET_HOST: WebSocket host configuration.
         """
         # Initialize template layout
         context = TemplateLayout.init(self, super().get_context_data(**kwargs))
         
-        # Retrieve the Job by ID
-        context["record"] = Job.objects.get(id=kwargs["id"])
+        # Retrieve the Job by ID, along with its conditions
+        context["record"] = Job.objects.with_conditions().get(id=kwargs["id"])
 
         # Retrieve the Job's Tasks
         records = context["record"].tasks.all().order_by("-started_at")
@@ -227,15 +232,13 @@ def get_context_data(self, **kwargs):
         
         # Implement pagination
         page_size = int(self.request.GET.get("page_size", self.page_size))
-        paginator = Paginator(filtered_records, page_size)
-        page_number = self.request.GET.get("page")
-        page_obj = paginator.get_page(page_number)
+        params = self.request.GET.copy()
+        params["job"] = kwargs["id"]  # Cached counts are per job
+        paginator = CursorPaginator(filtered_records, page_size, count=self.count_strategy, params=params)
+        page_obj = paginator.get_page(self.request.GET.get("cursor"))
         
-        # Read the job's log file if it exists
-        log_path = context["record"].log_path
-        if log_path and path.isfile(log_path):
-            with open(log_path, "r") as log_file:
-                context["log"] = log_file.read()
+        # Read the last lines of the job's log file if it exists, earlier ones are fetched on demand
+        context["log"] = read_tail(context["record"].log_path)
                 
         # Create context
         context.update(
@@ -294,6 +297,8 @@ def get_context_data(self, **kwargs):
                 - form: JobForm instance.
                 - starting_condition_time_form: TimeConditionForm instance for starting condition.
                 - stopping_condition_time_form: TimeConditionForm instance for stopping condition.
+                - stopping_condition_max_records_form: MaxRecordsConditionForm instance for stopping condition.
+                - stopping_condition_throughput_form: ThroughputConditionForm instance for stopping condition.
         """
         context = TemplateLayout.init(self, super().get_context_data(**kwargs))
         context["form"] = JobForm()
@@ -303,12 +308,18 @@ def get_context_data(self, **kwargs):
         context["stopping_condition_time_form"] = TimeConditionForm(
             prefix="stopping_condition_time_form"
         )
+        context["stopping_condition_max_records_form"] = MaxRecordsConditionForm(
+            prefix="stopping_condition_max_records_form"
+        )
+        context["stopping_condition_throughput_form"] = ThroughputConditionForm(
+            prefix="stopping_condition_throughput_form"
+        )
         return context
 
     def post(self, request, *args, **kwargs):
         """
         Handles form submission for creating a new job.
-        - Validates and saves the job form and time condition forms.
+        - Validates and saves the job form and the forms of its condition types.
         - Redirects to job detail view on success, or re-renders form with errors.
 
         Args:
@@ -325,6 +336,18 @@ def post(self, request, *args, **kwargs):
         stopping_time_condition_form = TimeConditionForm(
             request.POST, prefix="stopping_condition_time_form"
         )
+        stopping_max_records_condition_form = MaxRecordsConditionForm(
+            request.POST, prefix="stopping_condition_max_records_form"
+        )
+        stopping_throughput_condition_form = ThroughputConditionForm(
+            request.POST, prefix="stopping_condition_throughput_form"
+        )
+        condition_forms = {
+            "starting_condition_time_form": starting_time_condition_form,
+            "stopping_condition_time_form": stopping_time_condition_form,
+            "stopping_condition_max_records_form": stopping_max_records_condition_form,
+            "stopping_condition_throughput_form": stopping_throughput_condition_form,
+        }
         
         if job_form.is_valid():
             starting_condition_form = None
@@ -338,44 +361,29 @@ def post(self, request, *args, **kwargs):
                     else:
                         # Collect all errors if any form is invalid
                         context = self.get_context_data()
-                        context.update(
-                            {
-                                "form": job_form,
-                                "starting_condition_time_form": starting_time_condition_form,
-                                "stopping_condition_time_form": stopping_time_condition_form,
-                            }
-                        ) 
+                        context.update({"form": job_form, **condition_forms}) 
                         return self.render_to_response(context)
 
-            # Save the stopping time condition
+            # Save the stopping condition, with the form of its type
             if job_form.instance.stopping_condition_type:
-                if job_form.instance.stopping_condition_type.name == "time condition":
-                    if stopping_time_condition_form.is_valid():
-                        stopping_condition_form = stopping_time_condition_form
-                    else:
-                        # Collect all errors if any form is invalid
-                        context = self.get_context_data()
-                        context.update(
-                            {
-                                "form": job_form,
-                                "starting_condition_time_form": starting_time_condition_form,
-                                "stopping_condition_time_form": stopping_time_condition_form,
-                            }
-                        ) 
-                        return self.render_to_response(context)
+                stopping_condition_form = {
+                    "time condition": stopping_time_condition_form,
+                    "max records condition": stopping_max_records_condition_form,
+                    "throughput condition": stopping_throughput_condition_form,
+                }.get(job_form.instance.stopping_condition_type.name)
+
+                if stopping_condition_form and not stopping_condition_form.is_valid():
+                    # Collect all errors if any form is invalid
+                    context = self.get_context_data()
+                    context.update({"form": job_form, **condition_forms}) 
+                    return self.render_to_response(context)
 
             job = job_form.save(starting_condition_form, stopping_condition_form, request.user)
             return redirect(reverse("job_detail", args=[job.id]))
 
         # Create context
         context = self.get_context_data()
-        context.update(
-            {
-                "form": job_form,
-                "starting_condition_time_form": starting_time_condition_form,
-                "stopping_condition_time_form": stopping_time_condition_form,
-            }
-        )        
+        context.update({"form": job_form, **condition_forms})        
         return self.render_to_response(context)
 
 ###
@@ -465,6 +473,30 @@ def job_delete(request, id):
     return redirect("jobs")
 
 
+@login_required
+@require_GET
+def job_log(request, id):
+    """
+    Return the lines of a job's log file ending at a byte offset, so the detail page loads earlier lines on demand.
+
+    Args:
+        request (HttpRequest): The HTTP request object, `before` being the offset the lines end at.
+        id (int): The ID of the job.
+
+    Returns:
+        JsonResponse: The `text` of the lines, with their `start` and `end` byte offsets.
+
+    Raises:
+        PermissionDenied: If the user doesn't have 'can_view_job' permission.
+        Http404: If the job or its log file doesn't exist.
+    """
+    if not request.user.has_perm("task_app.can_view_job"):
+        raise PermissionDenied
+
+    instance = get_object_or_404(Job, id=id)
+    return _log_range_response(request, instance.log_path)
+
+
 ###
 #
 #   Tasks
@@ -493,13 +525,14 @@ class TaskTableView(PermissionRequiredMixin, TemplateView):
     Returns:
         dict: Context containing:
             - filter: Filtered queryset of tasks
-            - page_obj: Paginator object with task records
+            - page_obj: Cursor page of task records
             - can_create_task: Boolean indicating if user can create tasks
     """
 
     template_name = "task_app/task/table.html"
     permission_required = "task_app.can_view_tasks"
     page_size = 10
+    count_strategy = AdaptiveCount('task_table')
 
     def get_context_data(self, **kwargs):
         """
@@ -513,8 +546,9 @@ def get_context_data(self, **kwargs):
         Returns:
             dict: Context containing:
                 - filter: Filtered queryset of tasks
-                - page_obj: Paginator object with task records
+                - page_obj: Cursor page of task records
                 - can_create_task: Boolean indicating if user can create tasks
+                - WEBSOCKET_HOST: WebSocket host of the live updates
         """
         # Initialize template layout
         context = TemplateLayout.init(self, super().get_context_data(**kwargs))
@@ -528,9 +562,8 @@ def get_context_data(self, **kwargs):
         
         # Implement pagination
         page_size = int(self.request.GET.get('page_size', self.page_size))
-        paginator = Paginator(filtered_records, page_size)
-        page_number = self.request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        paginator = CursorPaginator(filtered_records, page_size, count=self.count_strategy, params=self.request.GET)
+        page_obj = paginator.get_page(self.request.GET.get('cursor'))
         
         # Add create task permission check
         context.update(
@@ -549,6 +582,7 @@ def get_context_data(self, **kwargs):
                 "can_delete_task": self.request.user.has_perm(
                     "task_app.can_delete_task"
                 ),
+                "WEBSOCKET_HOST": WEBSOCKET_HOST,
             }
         )
         
@@ -576,7 +610,7 @@ class TaskDetailView(PermissionRequiredMixin,TemplateView):
     Returns:
         dict: Context dictionary containing:
             - task: Task object retrieved from database
-            - log: Content of the task's log file (if exists)
+            - log: Last lines of the task's log file, with their byte offsets (if exists)
             - WEBSOCKET_HOST: WebSocket host configuration
             - Additional template layout context data
     """
@@ -589,13 +623,13 @@ def get_context_data(self, **kwargs):
         Prepares and returns the context data for template rendering.
         - Initializes template layout
         - Retrieves the task by ID
-        - Reads the task's log file if it exists
+        - Reads the last lines of the task's log file if it exists
         - Adds WebSocket host configuration
 
         Returns:
             dict: Context dictionary containing:
                 - task: Task object retrieved from database
-                - log: Content of the task's log file (if exists)
+                - log: Last lines of the task's log file, with their byte offsets (if exists)
                 - WEBSOCKET_HOST: WebSocket host configuration
         """
         # Initialize template layout
@@ -604,11 +638,8 @@ def get_context_data(self, **kwargs):
         # Retrieve the task by ID
         context["task"] = Task.objects.get(id=kwargs["id"])
 
-        # Read the task's log file if it exists
-        log_path = context["task"].log_path
-        if log_path and path.isfile(log_path):
-            with open(log_path, "r") as log_file:
-                context["log"] = log_file.read()
+        # Read the last lines of the task's log file if it exists, earlier ones are fetched on demand
+        context["log"] = read_tail(context["task"].log_path)
         
         # Create context
         context.update(
@@ -872,4 +903,47 @@ def task_resume(request, id):
 
     instance = get_object_or_404(Task, id=id)
     instance.resume()
-    return redirect(reverse("task_detail", args=[instance.id]))
\ No newline at end of file
+    return redirect(reverse("task_detail", args=[instance.id]))
+
+
+@login_required
+@require_GET
+def task_log(request, id):
+    """
+    Return the lines of a task's log file ending at a byte offset, so the detail page loads earlier lines on demand.
+
+    Args:
+        request (HttpRequest): The HTTP request object, `before` being the offset the lines end at.
+        id (int): The ID of the task.
+
+    Returns:
+        JsonResponse: The `text` of the lines, with their `start` and `end` byte offsets.
+
+    Raises:
+        PermissionDenied: If the user doesn't have 'can_view_task' permission.
+        Http404: If the task or its log file doesn't exist.
+    """
+    if not request.user.has_perm("task_app.can_view_task"):
+        raise PermissionDenied
+
+    instance = get_object_or_404(Task, id=id)
+    return _log_range_response(request, instance.log_path)
+
+
+###
+#
+#   Helper Functions
+#
+##
+
+def _log_range_response(request, log_path):
+    try:
+        before = int(request.GET["before"])
+    except (KeyError, ValueError):
+        return HttpResponseBadRequest("A numeric 'before' offset is required")
+
+    chunk = read_range(log_path, before)
+    if chunk is None:
+        raise Http404("Log file not found")
+
+    return JsonResponse(chunk._asdict())
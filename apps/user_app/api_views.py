@@ -37,7 +37,8 @@
 #   Extras
 #
 
-from django.core.paginator import Paginator
+from apps.common.pagination import CursorPaginator, InvalidCursor
+from apps.common.counting import AdaptiveCount
 
 
 
@@ -287,6 +288,7 @@ def post(self, request, *args, **kwargs):
 class UserListView(APIView):
 
     permission_classes = [IsAuthenticated]
+    count_strategy = AdaptiveCount('user_list')
     
     @swagger_auto_schema(
         tags=['User'],
@@ -301,11 +303,11 @@ class UserListView(APIView):
                 default=""
             ),
             openapi.Parameter(
-                'page',
+                'cursor',
                 openapi.IN_QUERY,
-                description="The page number to retrieve.",
-                type=openapi.TYPE_INTEGER,
-                default=1
+                description="The cursor of the page to retrieve, as given in the next_page and previous_page links. The first page by default, 'last' for the last page.",
+                type=openapi.TYPE_STRING,
+                default=""
             ),
             openapi.Parameter(
                 'page_size',
@@ -321,7 +323,7 @@ class UserListView(APIView):
                 schema=ListResponseSerializer
             ),
             400: openapi.Response(
-                description='Bad request. The provided page does not exist or other parameter issues.',
+                description='Bad request. The provided cursor is invalid or other parameter issues.',
                 schema=ErrorResponseSerializer
             ),
         }
@@ -332,17 +334,17 @@ def get(self, request):
 
         Search criteria:
             - string: A string to search for in users' first name, last name, or email address. Defaults to an empty string.
-            - page: The page number to retrieve. Defaults to 1.
+            - cursor: The cursor of the page to retrieve, from the metadata links. Defaults to the first page.
             - page_size: The number of users per page. Must be one of [5, 10, 20, 40]. Defaults to 5.
 
         Returns:
             Response: A JSON response containing the paginated list of users and metadata.
-                The metadata includes information about the current page, page size, total pages, and total users.
+                The metadata includes the page size, the estimated total of users, and the links to the next and previous pages.
         """
         
         # Get query parameters
         string_to_search = request.query_params.get('string', '')
-        page = int(request.query_params.get('page', 1))
+        cursor = request.query_params.get('cursor')
         page_size = int(request.query_params.get('page_size', 5))
                 
         # Build base query
@@ -357,17 +359,17 @@ def get(self, request):
             )
         
         # Paginate the results
-        paginator = Paginator(query, page_size)
+        paginator = CursorPaginator(query, page_size, count=self.count_strategy, params=request.query_params)
 
         
         # Get the requested page
         try:
-            records_page = paginator.page(page)
-        except Exception:
-            return Response(ErrorResponseSerializer.from_dict({"exception":"Page does not exist."}).data, status=status.HTTP_400_BAD_REQUEST)
+            records_page = paginator.page(cursor)
+        except InvalidCursor:
+            return Response(ErrorResponseSerializer.from_dict({"exception":"Invalid cursor."}).data, status=status.HTTP_400_BAD_REQUEST)
         
         return Response(
-            ListResponseSerializer.build_(request,page,paginator,serializer = UserSimpleSerializer(records_page, many=True),endpoint_name="user_list").data,
+            ListResponseSerializer.build_cursor(request,records_page,serializer = UserSimpleSerializer(records_page, many=True)).data,
             status=status.HTTP_200_OK)
     
     
@@ -19,7 +19,6 @@
 from django.views.decorators.http import require_GET, require_POST
 from django.views import View
 from django.urls import reverse
-from django.core.paginator import Paginator
 from django.views.generic import TemplateView
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
@@ -87,6 +86,9 @@
 #   Functions
 #
 
+from apps.common.pagination import CursorPaginator
+from apps.common.counting import AdaptiveCount
+
 
 ##
 #   Contants
@@ -409,6 +411,7 @@ class UserTableView(LoginRequiredMixin, TemplateView):
     template_name = 'user_app/user/table.html'
     permission_required = "user_app.can_view_users"
     page_size = 10
+    count_strategy = AdaptiveCount('user_table')
 
     def get_context_data(self, **kwargs):
         """
@@ -422,7 +425,7 @@ def get_context_data(self, **kwargs):
         Returns:
             dict: Context containing:
                 - filter: Filtered queryset of users.
-                - page_obj: Paginator object with user records.
+                - page_obj: Cursor page of user records.
                 - can_view_user: Boolean indicating if user can view users.
                 - can_invite_user: Boolean indicating if user can invite users.
                 - can_edit_user: Boolean indicating if user can edit users.
@@ -441,9 +444,8 @@ def get_context_data(self, **kwargs):
     
         # Implement pagination
         page_size = int(self.request.GET.get('page_size', self.page_size))
-        paginator = Paginator(filtered_records, page_size)
-        page_number = self.request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        paginator = CursorPaginator(filtered_records, page_size, count=self.count_strategy, params=self.request.GET)
+        page_obj = paginator.get_page(self.request.GET.get('cursor'))
         
         # Add user permissions to the context
         context.update(
@@ -15,6 +15,8 @@
 from pathlib import Path
 from datetime import timedelta
 
+from kombu import Queue
+
 from dotenv import load_dotenv
 
 from .template import  THEME_LAYOUT_DIR, THEME_VARIABLES
@@ -231,6 +233,34 @@
 JOBS_LOG_DIR = BASE_DIR / "apps/task_app/logs/jobs"
 TASKS_LOG_DIR = BASE_DIR / "apps/task_app/logs/tasks"
 
+# Log viewer: lines rendered with the page, and bytes fetched per "load earlier"
+LOG_TAIL_LINES = int(os.environ.get("LOG_TAIL_LINES", 200))
+LOG_RANGE_BYTES = int(os.environ.get("LOG_RANGE_BYTES", 64 * 1024))
+
+# Log lines are published to the WebSocket groups every N seconds, or once N bytes are buffered
+LOG_PUBLISH_INTERVAL = float(os.environ.get("LOG_PUBLISH_INTERVAL", 0.5))
+LOG_PUBLISH_BATCH_BYTES = int(os.environ.get("LOG_PUBLISH_BATCH_BYTES", 32 * 1024))
+
+# Log streams send a frame of at most N bytes every N seconds, dropping the oldest lines past N bytes waiting
+LOG_FRAME_INTERVAL = float(os.environ.get("LOG_FRAME_INTERVAL", 0.25))
+LOG_FRAME_BYTES = int(os.environ.get("LOG_FRAME_BYTES", 64 * 1024))
+LOG_STREAM_MAX_PENDING_BYTES = int(os.environ.get("LOG_STREAM_MAX_PENDING_BYTES", 256 * 1024))
+
+# Bytes of the log replayed to a client resuming from an offset, only the last lines being sent past it
+LOG_RESUME_MAX_BYTES = int(os.environ.get("LOG_RESUME_MAX_BYTES", 1024 * 1024))
+
+# Dashboard WebSocket: one frame of merged deltas every N seconds, up to N tasks and jobs followed per connection
+DASHBOARD_FRAME_INTERVAL = float(os.environ.get("DASHBOARD_FRAME_INTERVAL", 1))
+DASHBOARD_MAX_SUBSCRIPTIONS = int(os.environ.get("DASHBOARD_MAX_SUBSCRIPTIONS", 1000))
+
+# Logs roll over into gzip segments past N bytes, and are compressed once not written for N seconds
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_IDLE_SECONDS = int(os.environ.get("LOG_IDLE_SECONDS", 60 * 60 * 24))
+
+# Days logs are kept, unless their job sets its own `log_retention_days`, purged every N seconds
+LOG_RETENTION_DAYS = int(os.environ.get("LOG_RETENTION_DAYS", 30))
+LOG_PURGE_INTERVAL = int(os.environ.get("LOG_PURGE_INTERVAL", 60 * 60))
+
 # Django logging configuration
 LOGGING = {
     "version": 1,
@@ -278,6 +308,7 @@
 CELERY_BROKER_HOST = os.environ.get("RABBITMQ_BROKER_HOST", "0.0.0.0")
 
 CELERY_BROKER_URL = "redis://redis:6379/0"
+CELERY_RESULT_BACKEND = "redis://redis:6379/0"  # Required by chords, used to split large tasks
 #CELERY_BROKER_URL = f"pyamqp://{CELERY_BROKER_HOST}:5672"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
@@ -289,6 +320,25 @@
 
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 
+# Tasks are routed to a queue per resource class, each consumed by its own worker pool
+# (see docker-compose.yaml), everything else goes to the default queue
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_QUEUES = (
+    Queue("default"),
+    Queue("tasks_short"),
+    Queue("tasks_long"),
+)
+
+# Priorities within a queue, lower values are consumed first on Redis
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
+
+# Workers only reserve the message they are about to run, so priorities apply
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
 """from celery.schedules import crontab
 CELERY_BEAT_SCHEDULE = {
     "run-etl-every-night": {
@@ -299,6 +349,89 @@
 
 
 
+# Tasks
+# ------------------------------------------------------------------------------
+
+# A running task's step is persisted every N seconds or N steps, whichever comes first
+TASK_CHECKPOINT_INTERVAL = int(os.environ.get("TASK_CHECKPOINT_INTERVAL", 5))
+TASK_CHECKPOINT_STEPS = int(os.environ.get("TASK_CHECKPOINT_STEPS", 100))
+
+# A terminated worker child gets N seconds for its running task to reach a step and flush its checkpoint
+TASK_TERMINATE_GRACE = int(os.environ.get("TASK_TERMINATE_GRACE", 10))
+
+# Running tasks poll their control flag every N seconds to pause/cancel cooperatively,
+# those still running N seconds after being asked to stop are revoked with terminate=True
+TASK_CONTROL_POLL_INTERVAL = float(os.environ.get("TASK_CONTROL_POLL_INTERVAL", 1))
+TASK_CONTROL_TIMEOUT = int(os.environ.get("TASK_CONTROL_TIMEOUT", 30))
+TASK_CONTROL_KEY_TIMEOUT = 60 * 60
+
+# Workers map Celery task IDs to Task IDs through an in-process LRU of this size
+TASK_ID_CACHE_SIZE = int(os.environ.get("TASK_ID_CACHE_SIZE", 4096))
+
+# Maximum tasks created by a single bulk submission
+TASK_SUBMIT_MAX_TASKS = int(os.environ.get("TASK_SUBMIT_MAX_TASKS", 10000))
+
+# Task launches go through an outbox, published after commit in batches of N. Launches
+# that were not published right away are swept every N seconds, at most N per second
+# (0 for no limit). Disable the on-commit dispatch to only launch at the sweeper's rate.
+TASK_OUTBOX_BATCH_SIZE = int(os.environ.get("TASK_OUTBOX_BATCH_SIZE", 500))
+TASK_OUTBOX_SWEEP_INTERVAL = int(os.environ.get("TASK_OUTBOX_SWEEP_INTERVAL", 10))
+TASK_OUTBOX_MAX_RATE = int(os.environ.get("TASK_OUTBOX_MAX_RATE", 0))
+TASK_OUTBOX_DISPATCH_ON_COMMIT = os.environ.get("TASK_OUTBOX_DISPATCH_ON_COMMIT", "True") == "True"
+TASK_OUTBOX_RETENTION = 60 * 60 * 24
+
+# Time conditions are fired by a single dispatcher every N seconds, N conditions per batch
+TIME_CONDITION_INTERVAL = int(os.environ.get("TIME_CONDITION_INTERVAL", 5))
+TIME_CONDITION_BATCH_SIZE = int(os.environ.get("TIME_CONDITION_BATCH_SIZE", 1000))
+
+CELERY_BEAT_SCHEDULE = {
+    "dispatch-task-launches": {
+        "task": "apps.task_app.tasks._dispatch_task_launches",
+        "schedule": TASK_OUTBOX_SWEEP_INTERVAL,
+    },
+    "dispatch-time-conditions": {
+        "task": "apps.task_app.tasks._dispatch_time_conditions",
+        "schedule": TIME_CONDITION_INTERVAL,
+    },
+    "purge-logs": {
+        "task": "apps.task_app.tasks._purge_logs",
+        "schedule": LOG_PURGE_INTERVAL,
+    },
+}
+
+# Queue and priority of each task type, e.g. {"LARGE": {"queue": "tasks_long", "priority": 6}},
+# types without a route are sent to the queue of their runner's resource class.
+# Jobs and tasks can override both.
+TASK_TYPE_ROUTES = {}
+
+# Maximum tasks of all jobs STARTING or RUNNING at once, 0 for no limit.
+# Each job may also set its own `max_concurrency`.
+TASK_MAX_CONCURRENCY = int(os.environ.get("TASK_MAX_CONCURRENCY", 0))
+
+# Modules registering task runners, resolved once when a worker starts
+TASK_RUNNER_MODULES = [
+    "apps.task_app.runners",
+]
+
+
+
+# Cache
+# ------------------------------------------------------------------------------
+
+# Shared between web and worker processes, used as the task control channel
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://redis:6379/1",
+    },
+}
+
+# List counts: exact below N rows in the table, estimated or cached for N seconds above
+COUNT_EXACT_THRESHOLD = int(os.environ.get("COUNT_EXACT_THRESHOLD", 10000))
+COUNT_CACHE_TIMEOUT = int(os.environ.get("COUNT_CACHE_TIMEOUT", 30))
+
+
+
 # Channels
 # ------------------------------------------------------------------------------
 
@@ -6,6 +6,7 @@
 import os
 import asyncio
 import json
+from collections import deque
 
 ## URL Parsing
 from urllib.parse import parse_qs
@@ -20,6 +21,15 @@
 ## Models
 from apps.task_app.models import Task, Job
 
+## Logs
+from apps.task_app.log_files import read_lines_after
+
+## Dashboard
+from apps.task_app.dashboard import JOB_GROUP, TASK_GROUP, TASK_FIELDS, JOB_FIELDS, get_delta
+
+## Django
+from django.conf import settings
+
 import os
 import json
 import asyncio
@@ -28,14 +38,143 @@
 from apps.task_app.models import Task
 
 
-class TaskLogConsumer(AsyncJsonWebsocketConsumer):
+class LogStreamConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Base of the consumers streaming a log to a connected client, in coalesced frames.
+
+    - Lines are sent as `log_lines` frames, at most one every `LOG_FRAME_INTERVAL` seconds
+      and of `LOG_FRAME_BYTES`, so bursts cost a frame, not a frame per line.
+    - Lines waiting to be sent are bounded by `LOG_STREAM_MAX_PENDING_BYTES`, the oldest
+      being dropped beyond, and counted in the `skipped` of the next frame.
+
+    Resuming:
+        Frames carry a `seq` number, consecutive on a connection, and the `offset` of the log
+        their last line ends at. A client reconnects with `?offset=<offset>` and the lines written
+        since are replayed from the log file, up to `LOG_RESUME_MAX_BYTES`. Past it, only the
+        last lines are replayed and the first frame is `truncated`.
+
+    Attributes:
+        log_file_path (str): Path to the log file.
+        log_offset (int): Offset of the log the replay ended at, published lines up to it being already sent.
+        log_buffer (deque): The `(line, offset)` pairs waiting to be sent.
+        log_skipped (int): Lines dropped since the last frame.
+        log_truncated (bool): Whether the replay left out lines, reported by the next frame.
+        log_seq (int): Number of the last frame sent.
+    """
+
+    async def has_permission(self, permission):
+        """
+        Returns whether the connected user is authenticated and holds the permission.
+        """
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            return False
+        return await database_sync_to_async(user.has_perm)(permission)
+
+    def get_offset(self):
+        """
+        Returns the byte offset of the log given in the `offset` query parameter, None if there is none.
+        """
+        values = parse_qs(self.scope['query_string'].decode()).get('offset')
+        try:
+            return int(values[0]) if values else None
+        except ValueError:
+            return None
+
+    async def start_log_stream(self, log_file_path):
+        """
+        Starts sending frames, beginning with the lines written since the client's offset (page
+        rendered, or last frame before a reconnect), read from the log file when this node has it.
+        """
+        self.log_file_path = log_file_path
+        self.log_offset = self.get_offset()
+        self.log_sent_offset = self.log_offset
+        self.log_buffer = deque()
+        self.log_buffer_bytes = 0
+        self.log_skipped = 0
+        self.log_truncated = False
+        self.log_seq = 0
+        self.log_pending = asyncio.Event()
+        self.log_sender = asyncio.create_task(self.send_log_frames())
+
+        if self.log_offset is None or not self.log_file_path or not os.path.isfile(self.log_file_path):
+            return
+
+        lines = await asyncio.get_running_loop().run_in_executor(
+            None, read_lines_after, self.log_file_path, self.log_offset, settings.LOG_RESUME_MAX_BYTES
+        )
+        if lines:
+            first_line, first_end = lines[0]
+            self.log_truncated = first_end - len(first_line.encode()) > self.log_offset
+        await self.log_lines({"lines": lines})
+
+        # Fixed from now on: chunks of a task publish from several processes, their batches out of offset order
+        if lines:
+            self.log_offset = lines[-1][1]
+
+    def stop_log_stream(self):
+        if getattr(self, 'log_sender', None):
+            self.log_sender.cancel()
+
+    async def log_lines(self, event):
+        """
+        Queues the lines published by the logger, skipping those already sent by the replay, and
+        dropping the oldest ones when the client does not keep up.
+        """
+        for line, offset in event["lines"]:
+            if offset is not None and self.log_offset is not None and offset <= self.log_offset:
+                continue
+            self.log_buffer.append((line, offset))
+            self.log_buffer_bytes += len(line)
+
+        while self.log_buffer_bytes > settings.LOG_STREAM_MAX_PENDING_BYTES:
+            line, _ = self.log_buffer.popleft()
+            self.log_buffer_bytes -= len(line)
+            self.log_skipped += 1
+
+        if self.log_buffer or self.log_skipped or self.log_truncated:
+            self.log_pending.set()
+
+    async def send_log_frames(self):
+        """
+        Sends the queued lines as frames, each window coalescing the lines received meanwhile.
+        """
+        while True:
+            await self.log_pending.wait()
+            await asyncio.sleep(settings.LOG_FRAME_INTERVAL)
+
+            lines, size = [], 0
+            while self.log_buffer and (not lines or size + len(self.log_buffer[0][0]) <= settings.LOG_FRAME_BYTES):
+                line, offset = self.log_buffer.popleft()
+                lines.append([line, offset])
+                size += len(line)
+            self.log_buffer_bytes -= size
+            skipped, self.log_skipped = self.log_skipped, 0
+            truncated, self.log_truncated = self.log_truncated, False
+            if not self.log_buffer:
+                self.log_pending.clear()
+
+            offsets = [offset for _, offset in lines if offset is not None]
+            if offsets:
+                self.log_sent_offset = max(offsets + [self.log_sent_offset or 0])
+            self.log_seq += 1
+
+            await self.send_json({
+                "type": "log_lines",
+                "seq": self.log_seq,
+                "offset": self.log_sent_offset,
+                "lines": lines,
+                "skipped": skipped,
+                "truncated": truncated,
+            })
+
+
+class TaskLogConsumer(LogStreamConsumer):
     """
     WebSocket consumer for streaming log data from a task to a connected client.
 
     Attributes:
         task_group_name (str): Group name for the WebSocket channel associated with a task.
-        log_file_path (str): Path to the log file of the task.
-        log_file (file): File object for the task's log file.
     """
 
     async def get_task(self, task_id):
@@ -63,69 +202,44 @@ async def celery_task_update(self, event):
 
     async def connect(self):
         """
-        Handles the WebSocket connection by associating the client with a task's log stream.
+        Handles the WebSocket connection by associating the client with a task's log stream,
+        for authenticated users allowed to view the task.
         """
-        task_id = self.scope['url_route']['kwargs']['task_id']
-        
-
+        if not await self.has_permission('task_app.can_view_task'):
+            await self.close()
+            return
 
+        task_id = self.scope['url_route']['kwargs']['task_id']
         task = await self.get_task(task_id)
         if task is None:
             await self.close()
             return
 
         self.task_group_name = f"task_{task.id}"
-        self.log_file_path = task.log_path
 
-        if self.log_file_path and os.path.isfile(self.log_file_path):
-            
-            print(f"Connecting to channel {self.task_group_name}...")
-            await self.channel_layer.group_add(self.task_group_name, self.channel_name)
-            
-            await self.accept()
+        print(f"Connecting to channel {self.task_group_name}...")
+        await self.channel_layer.group_add(self.task_group_name, self.channel_name)
 
-            self.log_file = open(self.log_file_path, 'r')
-            self.log_file.seek(0, os.SEEK_END)
+        await self.accept()
 
-            asyncio.create_task(self.stream_log_data())
-        else:
-            await self.close()
-
-    async def stream_log_data(self):
-        """
-        Periodically checks for new lines in the log file and sends them to the client.
-        """
-        try:
-            while True:
-                line = self.log_file.readline()
-                if line:
-                    await self.send_json({
-                        "type": "log_line",
-                        "line": line
-                    })
-                else:
-                    await asyncio.sleep(1)
-        except Exception as e:
-            print(f"Error in stream_log_data: {e}")
-            await self.close()
+        # Continue from the offset the page was rendered at, so no line is missed or sent twice
+        await self.start_log_stream(task.log_path)
 
     async def disconnect(self, close_code):
         """
-        Handles the WebSocket disconnection by closing the log file if open.
+        Handles the WebSocket disconnection by stopping the log stream and leaving the task's group.
         """
-        if hasattr(self, 'log_file') and self.log_file:
-            self.log_file.close()
-
-        await self.channel_layer.group_discard(self.task_group_name, self.channel_name)
+        self.stop_log_stream()
+        if hasattr(self, 'task_group_name'):
+            await self.channel_layer.group_discard(self.task_group_name, self.channel_name)
 
 
-class JobLogConsumer(AsyncJsonWebsocketConsumer):
+class JobLogConsumer(LogStreamConsumer):
     """
     WebSocket consumer for streaming log data from a job to a connected client.
 
     Attributes:
-        log_file_path (str): Path to the log file of the job.
-        log_file (file): File object for the job's log file.
+        job_group_name (str): Group name for the WebSocket channel associated with a job.
     """
 
     async def get_job(self, job_id):
@@ -146,45 +260,197 @@ async def get_job(self, job_id):
 
     async def connect(self):
         """
-        Handles the WebSocket connection by associating the client with a job's log stream.
+        Handles the WebSocket connection by associating the client with a job's log stream,
+        for authenticated users allowed to view the job.
         """
+        if not await self.has_permission('task_app.can_view_job'):
+            await self.close()
+            return
+
         job_id = self.scope['url_route']['kwargs']['job_id']
         job = await self.get_job(job_id)
         if job is None:
             await self.close()
             return
 
-        self.log_file_path = job.log_path
+        self.job_group_name = f"job_{job.id}"
 
-        if self.log_file_path and os.path.isfile(self.log_file_path):
-            await self.accept()
-            self.log_file = open(self.log_file_path, 'r')
-            self.log_file.seek(0, os.SEEK_END)
-            asyncio.create_task(self.stream_log_data())
-        else:
-            await self.close()
+        await self.channel_layer.group_add(self.job_group_name, self.channel_name)
+        await self.accept()
 
-    async def stream_log_data(self):
+        # Continue from the offset the page was rendered at, so no line is missed or sent twice
+        await self.start_log_stream(job.log_path)
+
+    async def disconnect(self, close_code):
         """
-        Periodically checks for new lines in the log file and sends them to the client.
+        Handles the WebSocket disconnection by stopping the log stream and leaving the job's group.
         """
-        try:
-            while True:
-                line = self.log_file.readline()
-                if line:
-                    await self.send_json({
-                        "type": "log_line",
-                        "line": line
-                    })
-                else:
-                    await asyncio.sleep(1)
-        except Exception as e:
-            print(f"Error in stream_log_data: {e}")
+        self.stop_log_stream()
+        if hasattr(self, 'job_group_name'):
+            await self.channel_layer.group_discard(self.job_group_name, self.channel_name)
+
+
+class DashboardConsumer(AsyncJsonWebsocketConsumer):
+    """
+    WebSocket consumer streaming the status and progress of many tasks and jobs over one connection.
+
+    Protocol:
+        The client sends `{"action": "subscribe" | "unsubscribe", "tasks": [ids], "jobs": [ids],
+        "job_tasks": [ids]}`, `job_tasks` following every task of the jobs, new ones included.
+        On subscribe the server answers with a `snapshot` of the current states of the tasks
+        and jobs, then sends `deltas` frames of the fields that changed, keyed by id:
+
+            {"type": "deltas", "seq": 1, "tasks": {"12": {"status": "RUNNING"}}, "jobs": {}}
+
+    - Deltas are aggregated server side, at most one frame every `DASHBOARD_FRAME_INTERVAL`
+      seconds holding the latest fields of each id, however many changes happened meanwhile.
+    - A connection follows up to `DASHBOARD_MAX_SUBSCRIPTIONS` ids.
+
+    Attributes:
+        task_ids (set): IDs of the tasks followed on their own.
+        task_jobs (dict): Job ID of each task followed, None for tasks without a job.
+        job_ids (set): IDs of the jobs followed.
+        job_task_ids (set): IDs of the jobs whose tasks are followed.
+        groups (set): The dashboard groups joined.
+        seq (int): Number of the last frame sent.
+    """
+
+    async def connect(self):
+        """
+        Accepts authenticated users, and starts sending frames.
+        """
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
             await self.close()
+            return
+
+        self.can_view_tasks = await database_sync_to_async(user.has_perm)('task_app.can_view_tasks')
+        self.can_view_jobs = await database_sync_to_async(user.has_perm)('task_app.can_view_jobs')
+
+        self.task_ids = set()
+        self.task_jobs = {}
+        self.job_ids = set()
+        self.job_task_ids = set()
+        self.groups = set()
+        self.seq = 0
+        self.pending_tasks = {}
+        self.pending_jobs = {}
+        self.pending = asyncio.Event()
+        self.sender = asyncio.create_task(self.send_deltas())
+
+        await self.accept()
+
+    async def receive_json(self, content, **kwargs):
+        """
+        Handles the subscribe and unsubscribe requests of the client.
+        """
+        action = content.get("action")
+        task_ids = self.parse_ids(content.get("tasks")) if self.can_view_tasks else set()
+        job_ids = self.parse_ids(content.get("jobs")) if self.can_view_jobs else set()
+        job_task_ids = self.parse_ids(content.get("job_tasks")) if self.can_view_tasks else set()
+
+        if action == "subscribe":
+            subscriptions = len(self.task_ids | task_ids) + len(self.job_ids | job_ids) + len(self.job_task_ids | job_task_ids)
+            if subscriptions > settings.DASHBOARD_MAX_SUBSCRIPTIONS:
+                await self.send_json({"type": "error", "message": f"At most {settings.DASHBOARD_MAX_SUBSCRIPTIONS} subscriptions"})
+                return
+            await self.subscribe(task_ids, job_ids, job_task_ids)
+        elif action == "unsubscribe":
+            self.task_ids -= task_ids
+            self.job_ids -= job_ids
+            self.job_task_ids -= job_task_ids
+            for task_id in task_ids:
+                self.task_jobs.pop(task_id, None)
+            await self.update_groups()
+        else:
+            await self.send_json({"type": "error", "message": f"Unknown action {action}"})
+
+    async def subscribe(self, task_ids, job_ids, job_task_ids):
+        """
+        Follows tasks, jobs and the tasks of jobs, sending the current states of the tasks and jobs followed.
+        """
+        snapshot = {"type": "snapshot", "tasks": {}, "jobs": {}}
+
+        async for task in Task.objects.filter(id__in=task_ids).only('id', 'job', *TASK_FIELDS):
+            self.task_jobs[task.id] = task.job_id
+            self.task_ids.add(task.id)
+            snapshot["tasks"][str(task.id)] = get_delta(task, TASK_FIELDS)
+
+        async for job in Job.objects.filter(id__in=job_ids).only('id', *JOB_FIELDS):
+            self.job_ids.add(job.id)
+            snapshot["jobs"][str(job.id)] = get_delta(job, JOB_FIELDS)
+
+        async for job_id in Job.objects.filter(id__in=job_task_ids).values_list('id', flat=True):
+            self.job_task_ids.add(job_id)
+
+        # Joined before the snapshot is sent, deltas racing it are sent right after
+        await self.update_groups()
+        await self.send_json(snapshot)
+
+    async def update_groups(self):
+        """
+        Joins the groups of the tasks and jobs followed, and leaves the others.
+        """
+        groups = {JOB_GROUP.format(job_id) for job_id in self.job_ids | self.job_task_ids}
+        for task_id in self.task_ids:
+            job_id = self.task_jobs.get(task_id)
+            groups.add(TASK_GROUP.format(task_id) if job_id is None else JOB_GROUP.format(job_id))
+
+        for group in groups - self.groups:
+            await self.channel_layer.group_add(group, self.channel_name)
+        for group in self.groups - groups:
+            await self.channel_layer.group_discard(group, self.channel_name)
+        self.groups = groups
+
+    async def dashboard_deltas(self, event):
+        """
+        Merges the deltas of the tasks and jobs followed into the next frame.
+        """
+        job_tasks_followed = event["job"] in self.job_task_ids
+        for task_id, delta in event["tasks"].items():
+            if job_tasks_followed or int(task_id) in self.task_ids:
+                self.pending_tasks.setdefault(task_id, {}).update(delta)
+
+        for job_id, delta in event["jobs"].items():
+            if int(job_id) in self.job_ids:
+                self.pending_jobs.setdefault(job_id, {}).update(delta)
+
+        if self.pending_tasks or self.pending_jobs:
+            self.pending.set()
+
+    async def send_deltas(self):
+        """
+        Sends the merged deltas, at most one frame every `DASHBOARD_FRAME_INTERVAL` seconds.
+        """
+        while True:
+            await self.pending.wait()
+            await asyncio.sleep(settings.DASHBOARD_FRAME_INTERVAL)
+
+            tasks, self.pending_tasks = self.pending_tasks, {}
+            jobs, self.pending_jobs = self.pending_jobs, {}
+            self.pending.clear()
+            self.seq += 1
+
+            await self.send_json({
+                "type": "deltas",
+                "seq": self.seq,
+                "tasks": tasks,
+                "jobs": jobs,
+            })
 
     async def disconnect(self, close_code):
         """
-        Handles the WebSocket disconnection by closing the log file if open.
+        Handles the WebSocket disconnection by stopping the frames and leaving every group.
+        """
+        if getattr(self, 'sender', None):
+            self.sender.cancel()
+        for group in getattr(self, 'groups', ()):
+            await self.channel_layer.group_discard(group, self.channel_name)
+
+    def parse_ids(self, values):
+        """
+        Returns the valid IDs of a list sent by the client.
         """
-        if hasattr(self, 'log_file') and self.log_file:
-            self.log_file.close()
+        if not isinstance(values, list):
+            return set()
+        return {value for value in values if isinstance(value, int) and not isinstance(value, bool)}
@@ -1,8 +1,9 @@
-from config.websocket.consumers import TaskLogConsumer, JobLogConsumer
+from config.websocket.consumers import TaskLogConsumer, JobLogConsumer, DashboardConsumer
 
 from django.urls import path
 
 websocket_urlpatterns = [
     path('ws/task/<int:task_id>/', TaskLogConsumer.as_asgi()),  
     path('ws/job/<int:job_id>/', JobLogConsumer.as_asgi()),
+    path('ws/dashboard/', DashboardConsumer.as_asgi()),
 ]
\ No newline at end of file